@@ -0,0 +1,367 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: All-pairs (or many-source) shortest paths for a DirectedGraph,
+#              computed with one Dijkstra run per source spread over a pool
+#              of worker processes. The graph is written once in the binary
+#              format of graph_file.py and every worker memory maps the same
+#              file, so the graph is shared read-only through the page cache
+#              instead of being pickled or copied into each process.
+#              Small dense graphs can instead use a blocked Floyd-Warshall
+#              on a NumPy distance matrix (NumPy is optional).
+
+import mmap
+import multiprocessing
+import os
+import tempfile
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from d_graph import DirectedGraph
+from csr_graph import CSRDirectedGraph
+
+# Row layout of an out file: float64 distances, inf for unreachable
+ROW_TYPECODE = 'd'
+
+# Floyd-Warshall is only considered up to this many vertices, since its
+# V x V matrices must fit in memory
+DENSE_VERTEX_LIMIT = 5000
+
+# Measured cost of one vectorized min-plus cell update relative to one
+# edge (or vertex) step of the pure Python Dijkstra's Algorithm, used to
+# choose a method in all_pairs_dense()
+FLOYD_WARSHALL_COST = 1 / 150
+
+# State of a worker process, set by _init_worker()
+_worker_graph = None
+_worker_out = None
+
+
+def iter_shortest_path_rows(graph: DirectedGraph, sources=None, workers=None,
+                            batch_size=None, tmp_dir=None):
+    """
+    Yields (src, distances) for each source in order, where distances is
+    the same list as graph.dijkstra(src). sources defaults to every vertex
+    and workers to the number of CPUs. Rows are streamed back as batches of
+    sources finish, so only a few batches are held in memory at once.
+    """
+    sources = list(range(graph.v_count)) if sources is None else list(sources)
+    workers = _worker_count(workers, len(sources))
+
+    # Small jobs are not worth starting processes for
+    if workers == 1:
+        for src in sources:
+            yield src, graph.dijkstra(src)
+        return
+
+    batches = _batches(sources, workers, batch_size)
+    with SharedGraph(graph, tmp_dir) as path, \
+            _pool(workers, path, None) as pool:
+        for batch, rows in zip(batches, pool.imap(_run_batch, batches)):
+            yield from zip(batch[1], rows)
+
+
+def all_pairs_shortest_paths(graph: DirectedGraph, sources=None, workers=None,
+                             out=None, batch_size=None, tmp_dir=None):
+    """
+    Returns a list of graph.dijkstra(src) for each source (every vertex by
+    default), computed by a pool of workers processes.
+
+    If out is a file path the rows are instead written by the workers
+    straight into that file as a row-major float64 matrix of len(sources)
+    rows by v_count columns, with inf for unreachable vertices, and None
+    is returned. The file can be opened with mmap, or numpy.memmap, to
+    read the matrix without loading it.
+    """
+    if out is None:
+        return [row for _, row in iter_shortest_path_rows(
+            graph, sources, workers, batch_size, tmp_dir)]
+
+    sources = list(range(graph.v_count)) if sources is None else list(sources)
+    row_bytes = array(ROW_TYPECODE).itemsize * graph.v_count
+
+    # Size the output file so each worker can map it and write its rows
+    with open(out, 'wb') as file:
+        file.truncate(row_bytes * len(sources))
+
+    workers = _worker_count(workers, len(sources))
+    if workers == 1:
+        with open(out, 'r+b') as file:
+            for row, src in enumerate(sources):
+                file.seek(row * row_bytes)
+                file.write(array(ROW_TYPECODE, graph.dijkstra(src)).tobytes())
+        return None
+
+    batches = _batches(sources, workers, batch_size)
+    with SharedGraph(graph, tmp_dir) as path, \
+            _pool(workers, path, out) as pool:
+        for _ in pool.imap_unordered(_run_batch, batches):
+            pass
+    return None
+
+
+def all_pairs_dense(graph: DirectedGraph, next_hops=False, method='auto',
+                    block_size=64, workers=None):
+    """
+    Returns (distances, hops) for every pair of vertices as NumPy arrays.
+    distances[src, dst] is the float64 shortest path distance (inf if
+    unreachable). If next_hops is True, hops[src, dst] is the vertex after
+    src on a shortest path to dst (-1 if none, see dense_path()),
+    otherwise hops is None.
+
+    method is 'floyd_warshall', 'dijkstra' (one run per source on workers
+    processes) or 'auto', which estimates the cost of both from the number
+    of vertices and edges and picks the cheaper one. Floyd-Warshall costs
+    O(V^3) vectorized cell updates whatever the density, while repeated
+    Dijkstra costs O(V * E log V) interpreted steps, so the former wins on
+    small graphs unless they are very sparse.
+    """
+    if np is None:
+        raise ImportError("all_pairs_dense requires numpy")
+
+    if method == 'auto':
+        method = _choose_method(graph)
+
+    if method == 'floyd_warshall':
+        return floyd_warshall(graph, next_hops, block_size)
+    if method == 'dijkstra':
+        return _dijkstra_matrix(graph, next_hops, workers)
+    raise ValueError(f"unknown method {method!r}")
+
+
+def floyd_warshall(graph: DirectedGraph, next_hops=False, block_size=64):
+    """
+    Runs a blocked Floyd-Warshall on the graph and returns (distances, hops)
+    like all_pairs_dense(). Pivots are taken block_size at a time; each
+    block of rows is updated with every pivot of the block while it is
+    still in cache, the pivot rows themselves first.
+    """
+    if np is None:
+        raise ImportError("floyd_warshall requires numpy")
+
+    n = graph.v_count
+    distances = _weight_matrix(graph)
+    hops = None
+    if next_hops:
+        hops = np.where(np.isfinite(distances), np.arange(n), -1)
+        np.fill_diagonal(hops, np.arange(n))
+
+    for pivot_start in range(0, n, block_size):
+        pivots = range(pivot_start, min(pivot_start + block_size, n))
+
+        # The pivot rows go first so the other blocks see their final
+        # values for this round
+        row_starts = [pivot_start] + [start for start in range(0, n, block_size)
+                                      if start != pivot_start]
+        for row_start in row_starts:
+            rows = slice(row_start, min(row_start + block_size, n))
+            block = distances[rows]
+            hop_block = hops[rows] if next_hops else None
+
+            for k in pivots:
+                candidates = block[:, k, None] + distances[k]
+                if next_hops:
+                    improved = candidates < block
+                    np.copyto(hop_block, hop_block[:, k, None], where=improved)
+                    np.copyto(block, candidates, where=improved)
+                else:
+                    np.minimum(block, candidates, out=block)
+
+    if next_hops:
+        hops[~np.isfinite(distances)] = -1
+    return distances, hops
+
+
+def dense_path(hops, src: int, dst: int) -> []:
+    """
+    Returns the list of vertices on a shortest path from src to dst read
+    from a next-hop matrix, or an empty list if dst is unreachable
+    """
+    if hops[src, dst] < 0:
+        return []
+
+    path = [src]
+    while path[-1] != dst:
+        path.append(int(hops[path[-1], dst]))
+    return path
+
+
+class SharedGraph:
+    """
+    Context manager that writes a graph to a temporary graph file, for
+    worker processes to memory map, and removes it on exit. Entering it
+    returns the path of the file. The file is put in tmp_dir, by default
+    /dev/shm if it exists so it never touches disk.
+    """
+
+    def __init__(self, graph, tmp_dir=None):
+        """
+        Remember the graph to share; nothing is written until entered
+        """
+        self.graph = graph
+        self.tmp_dir = tmp_dir
+        self.path = None
+
+    def __enter__(self):
+        """
+        Writes the graph file and returns its path
+        """
+        tmp_dir = self.tmp_dir
+        if tmp_dir is None and os.path.isdir('/dev/shm'):
+            tmp_dir = '/dev/shm'
+
+        handle, self.path = tempfile.mkstemp(suffix='.graph', dir=tmp_dir)
+        os.close(handle)
+        self.graph.save(self.path)
+        return self.path
+
+    def __exit__(self, *exc_info):
+        """
+        Removes the graph file
+        """
+        os.remove(self.path)
+
+
+# ---------------------------------------------------------------------- #
+
+def _weight_matrix(graph: DirectedGraph):
+    """
+    Returns the float64 matrix of edge weights with inf for missing edges
+    and 0 on the diagonal
+    """
+    n = graph.v_count
+    adj_matrix = getattr(graph, 'adj_matrix', None)
+
+    # Vectorized backends already hold the matrix
+    if isinstance(adj_matrix, np.ndarray):
+        matrix = adj_matrix.astype(np.float64)
+        matrix[matrix == 0] = np.inf
+    else:
+        matrix = np.full((n, n), np.inf)
+        edges = graph.get_edges()
+        if len(edges) > 0:
+            srcs, dsts, weights = zip(*edges)
+            matrix[list(srcs), list(dsts)] = weights
+
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+def _choose_method(graph: DirectedGraph) -> str:
+    """
+    Returns 'floyd_warshall' or 'dijkstra', whichever is estimated to be
+    cheaper for the size and density of the graph
+    """
+    n = graph.v_count
+    if n > DENSE_VERTEX_LIMIT:
+        return 'dijkstra'
+
+    edge_count = sum(graph._out_degree(v) for v in range(n))
+    dijkstra_cost = n * (edge_count + n)
+    floyd_cost = n ** 3 * FLOYD_WARSHALL_COST
+    return 'floyd_warshall' if floyd_cost <= dijkstra_cost else 'dijkstra'
+
+
+def _dijkstra_matrix(graph: DirectedGraph, next_hops: bool, workers):
+    """
+    Returns (distances, hops) like all_pairs_dense() from one Dijkstra run
+    per source
+    """
+    n = graph.v_count
+    if not next_hops:
+        rows = all_pairs_shortest_paths(graph, workers=workers)
+        return np.array(rows, dtype=np.float64).reshape(n, n), None
+
+    distances = np.full((n, n), np.inf)
+    hops = np.full((n, n), -1, dtype=np.int64)
+    for src in range(n):
+        dists, parents = graph.shortest_path_tree(src)
+        distances[src] = dists
+
+        # Visiting in distance order sets each parent before its children
+        reached = sorted((dist, v) for v, dist in enumerate(dists) if dist != float('inf'))
+        for _, v in reached:
+            if v == src or parents[v] == src:
+                hops[src, v] = v
+            else:
+                hops[src, v] = hops[src, parents[v]]
+
+    return distances, hops
+
+
+def _pool(workers: int, graph_path, out_path):
+    """
+    Returns a process pool whose workers map the graph file, and the
+    output file if there is one
+    """
+    return multiprocessing.Pool(workers, _init_worker, (graph_path, out_path))
+
+
+def _worker_count(workers, n_sources: int) -> int:
+    """
+    Returns the number of processes to use for n_sources sources
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, n_sources))
+
+
+def _batches(sources: [], workers: int, batch_size=None) -> []:
+    """
+    Splits sources into (first row, [sources]) batches. By default each
+    worker gets about eight batches, which balances uneven Dijkstra run
+    times while keeping the per-batch overhead small.
+    """
+    if batch_size is None:
+        batch_size = max(1, len(sources) // (workers * 8))
+    return [(start, sources[start:start + batch_size])
+            for start in range(0, len(sources), batch_size)]
+
+
+def _init_worker(graph_path, out_path) -> None:
+    """
+    Maps the shared graph file, and the output file if there is one, once
+    per worker process
+    """
+    global _worker_graph, _worker_out
+    _worker_graph = CSRDirectedGraph.load(graph_path, mmap=True)
+
+    if out_path is not None:
+        with open(out_path, 'r+b') as file:
+            _worker_out = mmap.mmap(file.fileno(), 0)
+
+
+def _run_batch(batch):
+    """
+    Runs Dijkstra's Algorithm from each source of a batch. The rows are
+    written to the output file if there is one, otherwise returned.
+    """
+    first_row, sources = batch
+    rows = [_worker_graph.dijkstra(src) for src in sources]
+    if _worker_out is None:
+        return rows
+
+    row_bytes = array(ROW_TYPECODE).itemsize * _worker_graph.v_count
+    for row, distances in enumerate(rows, first_row):
+        _worker_out[row * row_bytes:(row + 1) * row_bytes] = \
+            array(ROW_TYPECODE, distances).tobytes()
+    return None
+
+
+if __name__ == '__main__':
+
+    print("\nAll-pairs shortest paths example")
+    print("--------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    for row in all_pairs_shortest_paths(g, workers=2):
+        print(row)
+
+    if np is not None:
+        distances, hops = all_pairs_dense(g, next_hops=True, method='floyd_warshall')
+        print(distances)
+        print('path 0 -> 2', dense_path(hops, 0, 2))
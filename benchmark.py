@@ -0,0 +1,436 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Timing benchmarks for the graph implementations. Run this file
+#              directly to print a table of results, or with --suite to run
+#              the method suite on synthetic graphs and save it as JSON for
+#              comparison with a later run (see --help).
+
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+from math import isqrt
+
+from d_graph import DirectedGraph
+from csr_graph import CSRDirectedGraph
+from ud_graph import UndirectedGraph
+from interned_graph import InternedUndirectedGraph
+
+# Dense adjacency matrices above this many cells are skipped, since they
+# would not fit in memory
+DENSE_CELL_LIMIT = 25_000_000
+
+# Number of vertices of each suite scale
+SCALES = {'small': 1_000, 'medium': 10_000, 'large': 100_000}
+
+# Classes run by the suite
+DIRECTED_CLASSES = (DirectedGraph, CSRDirectedGraph)
+UNDIRECTED_CLASSES = (UndirectedGraph, InternedUndirectedGraph)
+
+
+def random_directed_edges(n_vertices, avg_degree=3, seed=0):
+    """
+    Returns a list of random (src, dst, weight) edges with roughly
+    avg_degree outgoing edges per vertex
+    """
+    rng = random.Random(seed)
+    edges = []
+    for src in range(n_vertices):
+        for _ in range(avg_degree):
+            dst = rng.randrange(n_vertices)
+            if dst != src:
+                edges.append((src, dst, rng.randint(1, 100)))
+    return edges
+
+
+def random_undirected_edges(n_vertices, avg_degree=3, seed=0):
+    """
+    Returns a list of random (u, v) edges between string vertices with
+    roughly avg_degree edges per vertex
+    """
+    rng = random.Random(seed)
+    edges = []
+    for u in range(n_vertices):
+        for _ in range(avg_degree // 2 + 1):
+            edges.append((str(u), str(rng.randrange(n_vertices))))
+    return edges
+
+
+def erdos_renyi_edges(n_vertices, avg_degree=4, seed=0):
+    """
+    Returns random (src, dst, weight) edges of a G(n, m) Erdos-Renyi graph
+    with n_vertices * avg_degree edges between uniformly chosen vertices
+    """
+    rng = random.Random(seed)
+    edges = []
+    while len(edges) < n_vertices * avg_degree:
+        src, dst = rng.randrange(n_vertices), rng.randrange(n_vertices)
+        if src != dst:
+            edges.append((src, dst, rng.randint(1, 100)))
+    return edges
+
+
+def power_law_edges(n_vertices, edges_per_vertex=2, seed=0):
+    """
+    Returns random (src, dst, weight) edges of a Barabasi-Albert graph,
+    where each new vertex links to edges_per_vertex existing vertices
+    chosen in proportion to their degree, so degrees follow a power law.
+    Each edge points either way with equal chance.
+    """
+    rng = random.Random(seed)
+    edges = []
+    endpoints = []  # Each vertex appears once per incident edge
+
+    for v in range(1, n_vertices):
+        targets = {rng.choice(endpoints) if endpoints else 0
+                   for _ in range(min(v, edges_per_vertex))}
+        for u in targets:
+            src, dst = (v, u) if rng.random() < 0.5 else (u, v)
+            edges.append((src, dst, rng.randint(1, 100)))
+            endpoints += (u, v)
+    return edges
+
+
+def grid_edges(n_vertices, removed=0.1, seed=0):
+    """
+    Returns (src, dst, weight) edges of a road-like square grid of about
+    n_vertices vertices. Neighbouring vertices are joined both ways by
+    streets of random length, and a fraction of the streets are removed.
+    """
+    rng = random.Random(seed)
+    side = max(1, isqrt(n_vertices))
+    edges = []
+    for row in range(side):
+        for col in range(side):
+            v = row * side + col
+            for u in ((v + 1) if col + 1 < side else None,
+                      (v + side) if row + 1 < side else None):
+                if u is not None and rng.random() >= removed:
+                    weight = rng.randint(1, 100)
+                    edges += ((v, u, weight), (u, v, weight))
+    return edges
+
+
+def dag_edges(n_vertices, avg_degree=4, seed=0):
+    """
+    Returns random (src, dst, weight) edges of a directed acyclic graph,
+    where every edge goes from a lower to a higher numbered vertex
+    """
+    rng = random.Random(seed)
+    edges = []
+    for _ in range(n_vertices * avg_degree):
+        src, dst = rng.randrange(n_vertices), rng.randrange(n_vertices)
+        if src != dst:
+            edges.append((min(src, dst), max(src, dst), rng.randint(1, 100)))
+    return edges
+
+
+# Synthetic graph generators run by the suite
+GENERATORS = {'erdos_renyi': erdos_renyi_edges,
+              'power_law': power_law_edges,
+              'grid': grid_edges,
+              'dag': dag_edges}
+
+
+def undirected_edges(edges):
+    """
+    Returns the (u, v) string vertex edges of an undirected graph with the
+    same shape as the given (src, dst, weight) edges
+    """
+    return [(str(src), str(dst)) for src, dst, _ in edges]
+
+
+def time_call(func, *args, **kwargs):
+    """
+    Returns the number of seconds taken by a single call of func
+    """
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def bench_construction(sizes=(1_000, 10_000, 100_000)):
+    """
+    Compares building each directed graph class through start_edges with
+    the bulk from_edges() constructor. Returns a list of result rows.
+    """
+    results = []
+    for n_vertices in sizes:
+        edges = random_directed_edges(n_vertices)
+
+        for cls in (DirectedGraph, CSRDirectedGraph):
+            if cls is DirectedGraph and n_vertices ** 2 > DENSE_CELL_LIMIT:
+                results.append((cls.__name__, n_vertices, None, None))
+                continue
+
+            start_edges = time_call(cls, edges)
+            from_edges = time_call(cls.from_edges, edges, n_vertices=n_vertices)
+            results.append((cls.__name__, n_vertices, start_edges, from_edges))
+
+    return results
+
+
+def bench_undirected_traversals(sizes=(25_000, 50_000, 100_000, 200_000)):
+    """
+    Times the UndirectedGraph traversals on random graphs of growing size.
+    Each row also reports microseconds per vertex plus edge, which should
+    stay roughly flat if the traversals scale linearly.
+    """
+    results = []
+    for n_vertices in sizes:
+        graph = UndirectedGraph(random_undirected_edges(n_vertices))
+        size = n_vertices + sum(len(adj) for adj in graph.adj_list.values()) // 2
+        start = next(iter(graph.adj_list))
+
+        # The constructor keeps the components up to date, so force a
+        # rebuild to time the union-find rather than the cached count
+        graph._uf_stale = True
+
+        for name, func, args in (('dfs', graph.dfs, (start,)),
+                                 ('bfs', graph.bfs, (start,)),
+                                 ('components', graph.count_connected_components, ())):
+            seconds = time_call(func, *args)
+            results.append((name, n_vertices, seconds, seconds / size * 1e6))
+
+    return results
+
+
+def measure(func, *args, setup=None, repeat=3):
+    """
+    Returns (seconds, peak_bytes) for calling func(*args), or
+    func(*setup()) when setup is given, in which case only func is
+    measured. seconds is the best of repeat untraced calls, and peak_bytes
+    is the peak memory allocated during one more call run under
+    tracemalloc, which would distort the timing.
+    """
+    seconds = float('inf')
+    for _ in range(repeat):
+        call_args = setup() if setup is not None else args
+        start = time.perf_counter()
+        func(*call_args)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    call_args = setup() if setup is not None else args
+    tracemalloc.start()
+    try:
+        func(*call_args)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return seconds, peak_bytes
+
+
+def _directed_methods(cls, edges, n_vertices, batch):
+    """
+    Returns (method, func, setup) for each benchmarked DirectedGraph method.
+    Methods that change the graph get a fresh copy from setup.
+    """
+    graph = cls.from_edges(edges, n_vertices=n_vertices)
+
+    def empty():
+        return cls.from_edges([], n_vertices=n_vertices), edges
+
+    def add_vertices(fresh):
+        for _ in range(batch):
+            fresh.add_vertex()
+
+    def add_edges(fresh, edge_list):
+        for src, dst, weight in edge_list:
+            fresh.add_edge(src, dst, weight)
+
+    return [('add_vertex', add_vertices, lambda: (cls.from_edges(edges, n_vertices=n_vertices),)),
+            ('add_edge', add_edges, empty),
+            ('get_edges', graph.get_edges, None),
+            ('dfs', lambda: graph.dfs(0), None),
+            ('bfs', lambda: graph.bfs(0), None),
+            ('has_cycle', graph.has_cycle, None),
+            ('dijkstra', lambda: graph.dijkstra(0), None)]
+
+
+def _undirected_methods(cls, edges, n_vertices, batch):
+    """
+    Returns (method, func, setup) for each benchmarked UndirectedGraph
+    method. Methods that change the graph get a fresh copy from setup.
+    """
+    graph = cls(edges)
+    vertices = sorted(graph.get_vertices())
+    doomed = random.Random(0).sample(vertices, min(batch, len(vertices)))
+
+    def add_vertices(fresh):
+        for v in range(n_vertices, n_vertices + batch):
+            fresh.add_vertex(str(v))
+
+    def add_edges(fresh, edge_list):
+        for u, v in edge_list:
+            fresh.add_edge(u, v)
+
+    def remove_vertices(fresh):
+        for v in doomed:
+            fresh.remove_vertex(v)
+
+    def stale_components():
+        # Force a union-find rebuild, or only the cached count is timed
+        graph._uf_stale = True
+        return ()
+
+    return [('add_vertex', add_vertices, lambda: (cls(edges),)),
+            ('add_edge', add_edges, lambda: (cls(), edges)),
+            ('remove_vertex', remove_vertices, lambda: (cls(edges),)),
+            ('get_edges', graph.get_edges, None),
+            ('dfs', lambda: graph.dfs('0'), None),
+            ('bfs', lambda: graph.bfs('0'), None),
+            ('has_cycle', graph.has_cycle, stale_components),
+            ('count_connected_components', graph.count_connected_components, stale_components)]
+
+
+def run_suite(scales=('small', 'medium'), generators=None, repeat=3, batch=1000, seed=0):
+    """
+    Runs every benchmarked method of every suite class on each synthetic
+    graph at each scale. Returns a list of result dicts with the graph
+    ('generator', 'class', 'vertices', 'edges'), the 'method', and the best
+    'seconds' and 'peak_bytes' from measure(). Dense classes whose matrix
+    would exceed DENSE_CELL_LIMIT get None for both. Mutating methods
+    change batch vertices at a time, or insert every edge for add_edge.
+    """
+    results = []
+    for scale in scales:
+        n_vertices = SCALES[scale]
+        for name in (generators or GENERATORS):
+            edges = GENERATORS[name](n_vertices, seed=seed)
+            n_graph = 1 + max(max(src, dst) for src, dst, _ in edges)
+
+            suites = [(cls, _directed_methods, edges) for cls in DIRECTED_CLASSES]
+            suites += [(cls, _undirected_methods, undirected_edges(edges))
+                       for cls in UNDIRECTED_CLASSES]
+
+            for cls, methods, graph_edges in suites:
+                row = {'generator': name, 'scale': scale, 'class': cls.__name__,
+                       'vertices': n_graph, 'edges': len(graph_edges)}
+
+                # Check if a dense matrix would be too large
+                if cls is DirectedGraph and n_graph ** 2 > DENSE_CELL_LIMIT:
+                    results += [dict(row, method=method, seconds=None, peak_bytes=None)
+                                for method in ('add_vertex', 'add_edge', 'get_edges', 'dfs',
+                                               'bfs', 'has_cycle', 'dijkstra')]
+                    continue
+
+                for method, func, setup in methods(cls, graph_edges, n_graph, batch):
+                    seconds, peak_bytes = measure(func, setup=setup, repeat=repeat)
+                    results.append(dict(row, method=method, seconds=seconds,
+                                        peak_bytes=peak_bytes))
+
+    return results
+
+
+def save_results(results, path, **metadata) -> None:
+    """
+    Writes suite results to path as JSON, with the Python version, platform
+    and time of the run plus any extra metadata
+    """
+    document = {'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'metadata': metadata,
+                'results': results}
+    with open(path, 'w') as file:
+        json.dump(document, file, indent=1)
+
+
+def load_results(path) -> []:
+    """
+    Returns the results saved by save_results()
+    """
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def compare_results(baseline, current, tolerance=0.25, min_seconds=0.001) -> []:
+    """
+    Returns the regressions of current against baseline, two lists of
+    suite results: one dict per measurement that is more than tolerance
+    (as a fraction) slower or larger than its baseline, with the
+    'seconds_ratio' and 'memory_ratio'. Times under min_seconds in both
+    runs are too noisy to compare and only their memory is checked.
+    """
+    def key(result):
+        return result['generator'], result['scale'], result['class'], result['method']
+
+    before = {key(result): result for result in baseline}
+    regressions = []
+    for result in current:
+        old = before.get(key(result))
+        if old is None or old['seconds'] is None or result['seconds'] is None:
+            continue
+
+        seconds_ratio = result['seconds'] / max(old['seconds'], 1e-9)
+        memory_ratio = result['peak_bytes'] / max(old['peak_bytes'], 1)
+        timed = max(old['seconds'], result['seconds']) >= min_seconds
+
+        if (timed and seconds_ratio > 1 + tolerance) or memory_ratio > 1 + tolerance:
+            regressions.append(dict(result, seconds_ratio=seconds_ratio,
+                                    memory_ratio=memory_ratio))
+    return regressions
+
+
+def print_table(title, header, rows, width=20):
+    """
+    Prints result rows as a table of columns width characters wide. Times
+    of None are shown as skipped.
+    """
+    print(f"\n{title}")
+    print('-' * len(title))
+    print(''.join('{:>{}}'.format(name, width) for name in header))
+    for row in rows:
+        cells = []
+        for cell in row:
+            if cell is None:
+                cells.append('{:>{}}'.format('skipped', width))
+            elif isinstance(cell, float):
+                cells.append('{:>{}.4f}'.format(cell, width))
+            else:
+                cells.append('{:>{}}'.format(cell, width))
+        print(''.join(cells))
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Graph benchmarks')
+    parser.add_argument('--suite', action='store_true',
+                        help='run the method suite on synthetic graphs')
+    parser.add_argument('--scales', nargs='+', choices=SCALES, default=['small', 'medium'])
+    parser.add_argument('--generators', nargs='+', choices=GENERATORS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', help='save the suite results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='report regressions against a saved JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    if not args.suite:
+        print_table("Construction: start_edges vs from_edges()",
+                    ('class', 'vertices', 'start_edges (s)', 'from_edges (s)'),
+                    bench_construction())
+
+        print_table("UndirectedGraph traversal scaling",
+                    ('method', 'vertices', 'seconds', 'us per V+E'),
+                    bench_undirected_traversals())
+    else:
+        suite = run_suite(args.scales, args.generators, args.repeat)
+        print_table("Method suite",
+                    ('generator', 'class', 'vertices', 'method', 'seconds', 'peak KiB'),
+                    [(r['generator'], r['class'], r['vertices'], r['method'], r['seconds'],
+                      None if r['peak_bytes'] is None else r['peak_bytes'] // 1024)
+                     for r in suite], width=28)
+
+        if args.out:
+            save_results(suite, args.out, scales=args.scales, repeat=args.repeat)
+        if args.compare:
+            regressions = compare_results(load_results(args.compare), suite, args.tolerance)
+            print_table(f"Regressions against {args.compare}",
+                        ('generator', 'class', 'method', 'time ratio', 'memory ratio'),
+                        [(r['generator'], r['class'], r['method'], r['seconds_ratio'],
+                          r['memory_ratio']) for r in regressions], width=28)
@@ -0,0 +1,392 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Snapshot isolation for both graph classes, for one writer
+#              thread and any number of reader threads. The writer edits a
+#              copy-on-write version of the adjacency rows and publishes an
+#              immutable snapshot after each edit or batch of edits. Readers
+#              run queries on a snapshot without taking any lock, and never
+#              see a half applied edit.
+
+import threading
+from contextlib import contextmanager
+
+from d_graph import DirectedGraph
+from ud_graph import UndirectedGraph
+
+
+def _read_only(*args, **kwargs):
+    """
+    Replaces every mutating method of a snapshot
+    """
+    raise TypeError("graph snapshots are read-only")
+
+
+class _Publisher:
+    """
+    Writer side shared by both concurrent graph classes
+    - every public edit runs inside batch(), which holds the writer lock
+      and publishes a new snapshot when the outermost batch ends
+    - after a publish the rows belong to the snapshot, so the next edit
+      of a row (or of the row table) copies it first
+    """
+
+    def _init_publisher(self) -> None:
+        """
+        Sets up the writer lock and copy-on-write bookkeeping
+        """
+        self._write_lock = threading.RLock()
+        self._batch_depth = 0
+        self._owns_table = True  # The row table is not in any snapshot
+        self._owned = set()      # Rows copied since the last publish
+        self._snapshot = None
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups edits so they become visible to readers together, in a
+        single snapshot, when the block ends. Only one thread at a time
+        can be inside a batch.
+        """
+        with self._write_lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.publish()
+
+    def snapshot(self):
+        """
+        Returns the most recently published snapshot. It never changes, so
+        it can be queried from any thread without locking.
+        """
+        return self._snapshot
+
+    def publish(self) -> None:
+        """
+        Makes the current state visible to readers as a new snapshot
+        """
+        with self._write_lock:
+            snapshot = self._make_snapshot()
+            self._owns_table = False
+            self._owned = set()
+            self._snapshot = snapshot  # Readers switch over atomically
+
+
+class DirectedSnapshot(DirectedGraph):
+    """
+    Immutable DirectedGraph published by ConcurrentDirectedGraph
+    - supports every read-only method of DirectedGraph
+    - adding or removing vertices or edges raises TypeError
+    - version is the version of the writer when it was published
+    """
+
+    def __init__(self, v_count: int, succ: [], pred: [], version: int):
+        """
+        Wrap rows of {vertex: weight} dicts that will not change again
+        """
+        self.v_count = v_count
+        self.adj_matrix = None
+        self._succ = succ
+        self._pred = pred
+        self.version = version
+        self._observers = []
+
+    def __str__(self):
+        """
+        Return content of the graph in the same form as DirectedGraph
+        """
+        return self._matrix_string()
+
+    _append_vertex = _store_edge = _bulk_load = _read_only
+
+    def _edge_weight(self, src: int, dst: int):
+        """
+        Returns the weight of the edge from src to dst, or 0 if there is no
+        such edge
+        """
+        return self._succ[src].get(dst, 0)
+
+
+class ConcurrentDirectedGraph(_Publisher, DirectedGraph):
+    """
+    Class to implement a DirectedGraph with snapshot isolation
+    - same rules and public API as DirectedGraph, for the writer thread
+    - edges are kept only in the successor and predecessor dict rows;
+      the dense adjacency matrix is not used
+    - snapshot() returns an immutable DirectedSnapshot for reader threads
+    - each edit outside a batch() publishes a snapshot, which makes the
+      next edit copy the row table in O(V); edit in batches when many
+      edits are made at once
+    """
+
+    def __init__(self, start_edges=None):
+        """
+        Store graph info as copy-on-write rows and publish the first snapshot
+        """
+        self._init_publisher()
+        with self.batch():
+            super().__init__(start_edges)
+            self.adj_matrix = None
+
+    def __str__(self):
+        """
+        Return content of the graph in the same form as DirectedGraph
+        """
+        return self._matrix_string()
+
+    def add_vertex(self) -> int:
+        """
+        Adds a single vertex to the graph and publishes it
+        """
+        with self.batch():
+            return super().add_vertex()
+
+    def add_edge(self, src: int, dst: int, weight=1) -> None:
+        """
+        Adds or updates an edge like DirectedGraph.add_edge() and publishes
+        the change
+        """
+        with self.batch():
+            super().add_edge(src, dst, weight)
+
+    def add_edges(self, edges) -> None:
+        """
+        Adds edges like DirectedGraph.add_edges() as a single batch
+        """
+        with self.batch():
+            super().add_edges(edges)
+
+    def remove_edge(self, src: int, dst: int) -> None:
+        """
+        Removes an edge like DirectedGraph.remove_edge() and publishes the
+        change
+        """
+        with self.batch():
+            super().remove_edge(src, dst)
+
+    def _make_snapshot(self) -> DirectedSnapshot:
+        """
+        Returns a snapshot sharing the current rows
+        """
+        return DirectedSnapshot(self.v_count, self._succ, self._pred, self.version)
+
+    # ------------------------------------------------------------------ #
+    # Storage primitives used by DirectedGraph
+
+    def _own_table(self) -> None:
+        """
+        Copies the row tables if the last snapshot shares them
+        """
+        if not self._owns_table:
+            self._succ = list(self._succ)
+            self._pred = list(self._pred)
+            self._owns_table = True
+
+    def _append_vertex(self) -> None:
+        """
+        Adds empty rows for vertex number v_count
+        """
+        self._own_table()
+        self._succ.append({})
+        self._pred.append({})
+        self._owned.add(('succ', self.v_count))
+        self._owned.add(('pred', self.v_count))
+
+    def _bulk_load(self, n_vertices: int, edges) -> None:
+        """
+        Replaces the contents of an empty graph with n_vertices vertices and
+        the given edges, as one batch
+        """
+        with self.batch():
+            self._succ = [{} for _ in range(n_vertices)]
+            self._pred = [{} for _ in range(n_vertices)]
+            self._owns_table = True
+            self._owned = {(side, v) for side in ('succ', 'pred') for v in range(n_vertices)}
+            self.v_count = n_vertices
+
+            for src, dst, weight in edges:
+                self.add_edge(src, dst, weight)
+
+    def _edge_weight(self, src: int, dst: int):
+        """
+        Returns the weight of the edge from src to dst, or 0 if there is no
+        such edge
+        """
+        return self._succ[src].get(dst, 0)
+
+    def _store_edge(self, src: int, dst: int, weight) -> None:
+        """
+        Sets the weight of the edge from src to dst, copying the two rows it
+        changes first if the last snapshot shares them. A weight of 0
+        removes the edge.
+        """
+        self._own_table()
+        if ('succ', src) not in self._owned:
+            self._succ[src] = dict(self._succ[src])
+            self._owned.add(('succ', src))
+        if ('pred', dst) not in self._owned:
+            self._pred[dst] = dict(self._pred[dst])
+            self._owned.add(('pred', dst))
+
+        if weight > 0:
+            self._succ[src][dst] = weight
+            self._pred[dst][src] = weight
+        else:
+            self._succ[src].pop(dst, None)
+            self._pred[dst].pop(src, None)
+
+
+class UndirectedSnapshot(UndirectedGraph):
+    """
+    Immutable UndirectedGraph published by ConcurrentUndirectedGraph
+    - supports every read-only method of UndirectedGraph
+    - adding or removing vertices or edges raises TypeError
+    - the connected components are computed on first use, under a lock
+    """
+
+    def __init__(self, adj_list: dict, adj_set: dict, version: int):
+        """
+        Wrap adjacency rows that will not change again
+        """
+        self.adj_list = adj_list
+        self._adj_set = adj_set
+        self.version = version
+
+        # Built by the first component query
+        self._uf_parent = dict()
+        self._uf_rank = dict()
+        self._uf_count = 0
+        self._uf_stale = True
+        self._uf_lock = threading.Lock()
+
+    add_vertex = add_edge = remove_edge = remove_vertex = _load_rows = _read_only
+
+    def _refresh_components(self) -> None:
+        """
+        Builds the union-find index once, while other readers wait for it
+        """
+        if self._uf_stale:
+            with self._uf_lock:
+                super()._refresh_components()
+
+
+class ConcurrentUndirectedGraph(_Publisher, UndirectedGraph):
+    """
+    Class to implement an UndirectedGraph with snapshot isolation
+    - same rules and public API as UndirectedGraph, for the writer thread
+    - snapshot() returns an immutable UndirectedSnapshot for reader
+      threads; version counts the published snapshots
+    - each edit outside a batch() publishes a snapshot, which makes the
+      next edit copy the row tables in O(V); edit in batches when many
+      edits are made at once
+    """
+
+    def __init__(self, start_edges=None):
+        """
+        Store graph info as copy-on-write rows and publish the first snapshot
+        """
+        self.version = 0
+        self._init_publisher()
+        with self.batch():
+            super().__init__(start_edges)
+
+    def add_vertex(self, v: str) -> None:
+        """
+        Adds a new vertex like UndirectedGraph.add_vertex() and publishes it
+        """
+        with self.batch():
+
+            # Check if the vertex already exists; its row may still be
+            # shared with the last snapshot, so it must not be marked owned
+            if v in self.adj_list:
+                return
+
+            self._own_rows()
+            super().add_vertex(v)
+            self._owned.add(v)  # The new row is in no snapshot yet
+
+    def add_edge(self, u: str, v: str) -> None:
+        """
+        Adds an edge like UndirectedGraph.add_edge() and publishes it
+        """
+        with self.batch():
+            self._own_rows(u, v)
+            super().add_edge(u, v)
+
+    def add_edges(self, edges) -> None:
+        """
+        Adds edges like UndirectedGraph.add_edges() as a single batch
+        """
+        with self.batch():
+            super().add_edges(edges)
+
+    def remove_edge(self, v: str, u: str) -> None:
+        """
+        Removes an edge like UndirectedGraph.remove_edge() and publishes the
+        change
+        """
+        with self.batch():
+            self._own_rows(u, v)
+            super().remove_edge(v, u)
+
+    def remove_vertex(self, v: str) -> None:
+        """
+        Removes a vertex like UndirectedGraph.remove_vertex() and publishes
+        the change
+        """
+        with self.batch():
+            self._own_rows(*self.adj_list.get(v, ()))
+            super().remove_vertex(v)
+
+    def _load_rows(self, names: [], offsets, targets) -> None:
+        """
+        Loads rows like UndirectedGraph._load_rows() as a single batch
+        """
+        with self.batch():
+            self._own_rows()
+            super()._load_rows(names, offsets, targets)
+            self._owned.update(names)
+
+    def _own_rows(self, *vertices) -> None:
+        """
+        Copies the row tables, and the rows of the given vertices, if the
+        last snapshot shares them
+        """
+        if not self._owns_table:
+            self.adj_list = dict(self.adj_list)
+            self._adj_set = dict(self._adj_set)
+            self._owns_table = True
+
+        for vertex in vertices:
+            if vertex in self.adj_list and vertex not in self._owned:
+                self.adj_list[vertex] = list(self.adj_list[vertex])
+                self._adj_set[vertex] = set(self._adj_set[vertex])
+                self._owned.add(vertex)
+
+    def _make_snapshot(self) -> UndirectedSnapshot:
+        """
+        Returns a snapshot sharing the current rows
+        """
+        self.version += 1
+        return UndirectedSnapshot(self.adj_list, self._adj_set, self.version)
+
+
+if __name__ == '__main__':
+
+    print("\nSnapshot isolation example")
+    print("--------------------------")
+    g = ConcurrentUndirectedGraph(['AB', 'BC'])
+    before = g.snapshot()
+    with g.batch():
+        g.add_edge('C', 'D')
+        g.remove_edge('A', 'B')
+    after = g.snapshot()
+    print(before, before.count_connected_components())
+    print(after, after.count_connected_components())
+
+    d = ConcurrentDirectedGraph([(0, 1, 10), (1, 2, 5)])
+    first = d.snapshot()
+    d.add_edge(0, 2, 3)
+    print(first.dijkstra(0), d.snapshot().dijkstra(0), d.snapshot().version)
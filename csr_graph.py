@@ -0,0 +1,317 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Compressed sparse row (CSR) storage backend for the directed
+#              graph. Edges are kept in flat offsets/targets/weights arrays
+#              so memory grows with the number of edges instead of with the
+#              square of the number of vertices. Edits go to a small delta
+#              buffer that is merged back into the arrays periodically.
+
+from array import array
+from bisect import bisect_left
+from numbers import Integral
+
+from d_graph import DirectedGraph
+
+
+class CSRDirectedGraph(DirectedGraph):
+    """
+    Class to implement directed weighted graph in CSR form
+    - same rules and public API as DirectedGraph
+    - successors of vertex v are targets[offsets[v]:offsets[v + 1]],
+      stored in ascending order
+    - predecessors are kept the same way in in_offsets/sources/in_weights
+    - add_edge / remove_edge are buffered in a delta that is compacted
+      into the arrays once it grows past a fraction of the graph size
+    - weight_typecode selects the array type of the weights ('q' for
+      integer weights, 'd' for float weights); add_edge() raises TypeError
+      for a weight the arrays cannot hold
+    """
+
+    def __init__(self, start_edges=None, weight_typecode='q',
+                 compact_ratio=0.125, min_compact=1024):
+        """
+        Store graph info as CSR arrays plus a pending delta buffer
+        """
+        self.weight_typecode = weight_typecode
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+        self.weights = array(weight_typecode)
+
+        # Reverse (CSC) arrays used to look up predecessors
+        self.in_offsets = array('q', [0])
+        self.sources = array('q')
+        self.in_weights = array(weight_typecode)
+
+        # Pending edits as {src: {dst: weight}} and {dst: {src: weight}},
+        # a weight of 0 marks removal
+        self._delta = {}
+        self._delta_in = {}
+        self._delta_size = 0
+        self._compact_ratio = compact_ratio
+        self._min_compact = min_compact
+
+        super().__init__(start_edges)
+
+    def __str__(self):
+        """
+        Return content of the graph in the same form as DirectedGraph
+        """
+        return self._matrix_string()
+
+    # ------------------------------------------------------------------ #
+
+    def compact(self) -> None:
+        """
+        Merges the pending delta buffer into the CSR arrays
+        """
+        if self._delta_size == 0:
+            return
+
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array(self.weight_typecode)
+
+        # Rebuild each row from its stored slice and pending edits
+        for src in range(self.v_count):
+            for dst, weight in self._out_edges(src):
+                targets.append(dst)
+                weights.append(weight)
+            offsets.append(len(targets))
+
+        self.offsets, self.targets, self.weights = offsets, targets, weights
+        self._delta = {}
+        self._delta_in = {}
+        self._delta_size = 0
+        self._build_reverse()
+
+    def _build_reverse(self) -> None:
+        """
+        Rebuilds the reverse arrays from the compacted forward arrays with a
+        counting sort, so each row of sources comes out in ascending order
+        """
+        counts = [0] * (self.v_count + 1)
+        for dst in self.targets:
+            counts[dst + 1] += 1
+
+        in_offsets = array('q', [0])
+        for vertex in range(self.v_count):
+            in_offsets.append(in_offsets[-1] + counts[vertex + 1])
+
+        sources = array('q', [0]) * len(self.targets)
+        in_weights = array(self.weight_typecode, [0]) * len(self.targets)
+        fill = in_offsets.tolist()
+
+        # Visiting sources in ascending order keeps each row sorted
+        for src in range(self.v_count):
+            for index in range(self.offsets[src], self.offsets[src + 1]):
+                dst = self.targets[index]
+                sources[fill[dst]] = src
+                in_weights[fill[dst]] = self.weights[index]
+                fill[dst] += 1
+
+        self.in_offsets, self.sources, self.in_weights = in_offsets, sources, in_weights
+
+    # ------------------------------------------------------------------ #
+    # Storage primitives used by DirectedGraph
+
+    def _append_vertex(self) -> None:
+        """
+        Adds an empty row for vertex number v_count. Offsets that are
+        read-only views (see graph_file.py) are copied into arrays first.
+        """
+        if not isinstance(self.offsets, array):
+            self.offsets = array('q', self.offsets)
+            self.in_offsets = array('q', self.in_offsets)
+
+        self.offsets.append(self.offsets[-1])
+        self.in_offsets.append(self.in_offsets[-1])
+
+    def _bulk_load(self, n_vertices: int, edges) -> None:
+        """
+        Replaces the contents of an empty graph with n_vertices vertices and
+        the given edges, writing the CSR arrays directly. Invalid edges are
+        skipped and a repeated edge keeps its last weight, like add_edge().
+        """
+
+        # Keep valid edges only; the stable sort preserves input order
+        # among repeats of the same (src, dst) pair
+        valid = [(src, dst, weight) for src, dst, weight in edges
+                 if 0 <= src < n_vertices and 0 <= dst < n_vertices
+                 and src != dst and weight >= 1]
+        valid.sort(key=lambda edge: (edge[0], edge[1]))
+
+        counts = [0] * n_vertices
+        targets = array('q')
+        weights = array(self.weight_typecode)
+
+        for index, (src, dst, weight) in enumerate(valid):
+
+            # Skip an edge that is overwritten later in the input
+            if index + 1 < len(valid) and valid[index + 1][:2] == (src, dst):
+                continue
+
+            targets.append(dst)
+            weights.append(weight)
+            counts[src] += 1
+
+        offsets = array('q', [0])
+        for count in counts:
+            offsets.append(offsets[-1] + count)
+
+        self.offsets, self.targets, self.weights = offsets, targets, weights
+        self._delta = {}
+        self._delta_in = {}
+        self._delta_size = 0
+        self.v_count = n_vertices
+        self._build_reverse()
+
+    def _load_arrays(self, n_vertices: int, offsets, targets, weights,
+                     in_offsets, sources, in_weights) -> None:
+        """
+        Replaces the contents of an empty graph with ready-made forward and
+        reverse CSR arrays. Any sequences with array indexing and slicing
+        are accepted, so read-only memoryviews of a mapped file are used
+        as they are; later edits go to the delta buffer and compaction
+        builds fresh arrays.
+        """
+        self.offsets, self.targets, self.weights = offsets, targets, weights
+        self.in_offsets, self.sources, self.in_weights = in_offsets, sources, in_weights
+        self._delta = {}
+        self._delta_in = {}
+        self._delta_size = 0
+        self.v_count = n_vertices
+
+    def _edge_weight(self, src: int, dst: int):
+        """
+        Returns the weight of the edge from src to dst, or 0 if there is no
+        such edge
+        """
+
+        # Pending edits take precedence over the compacted arrays
+        pending = self._delta.get(src)
+        if pending is not None and dst in pending:
+            return pending[dst]
+
+        # Binary search the sorted row of src
+        start, end = self.offsets[src], self.offsets[src + 1]
+        index = bisect_left(self.targets, dst, start, end)
+        if index < end and self.targets[index] == dst:
+            return self.weights[index]
+
+        return 0
+
+    def _store_edge(self, src: int, dst: int, weight) -> None:
+        """
+        Records an edge weight in the delta buffer, compacting the buffer
+        into the arrays when it becomes too large
+        """
+
+        # Check if the weight fits the weight arrays, now rather than at
+        # the next compaction
+        if self.weight_typecode not in 'fd' and not isinstance(weight, Integral):
+            raise TypeError(f"weight {weight!r} does not fit weight_typecode "
+                            f"{self.weight_typecode!r}; use weight_typecode='d'")
+
+        if self._edge_weight(src, dst) == weight:
+            return
+
+        self._delta.setdefault(src, {})[dst] = weight
+        self._delta_in.setdefault(dst, {})[src] = weight
+        self._delta_size += 1
+
+        # Compact once the buffer is a fixed fraction of the graph size so
+        # the O(V + E) rebuild is amortized over many edits
+        limit = self._compact_ratio * (self.v_count + len(self.targets))
+        if self._delta_size > max(self._min_compact, limit):
+            self.compact()
+
+    def _out_edges(self, src: int) -> []:
+        """
+        Returns a list of (dst, weight) pairs for each edge leaving the given
+        vertex, in ascending order of dst
+        """
+        start, end = self.offsets[src], self.offsets[src + 1]
+        edges = zip(self.targets[start:end], self.weights[start:end])
+
+        # Fast path when the row has no pending edits
+        pending = self._delta.get(src)
+        if pending is None:
+            return list(edges)
+
+        merged = dict(edges)
+        merged.update(pending)
+        return sorted((dst, weight) for dst, weight in merged.items() if weight > 0)
+
+    def _out_degree(self, src: int) -> int:
+        """
+        Returns the number of edges leaving the given vertex
+        """
+        if src in self._delta:
+            return len(self._out_edges(src))
+        return self.offsets[src + 1] - self.offsets[src]
+
+    def _iter_out_edges(self, src: int):
+        """
+        Returns the (dst, weight) pairs of _out_edges(), which are already
+        in order at no extra cost
+        """
+        return self._out_edges(src)
+
+    def _in_degree(self, dst: int) -> int:
+        """
+        Returns the number of edges entering the given vertex
+        """
+        if dst in self._delta_in:
+            return len(self._in_edges(dst))
+        return self.in_offsets[dst + 1] - self.in_offsets[dst]
+
+    def _in_edges(self, dst: int) -> []:
+        """
+        Returns a list of (src, weight) pairs for each edge entering the
+        given vertex, in ascending order of src
+        """
+        start, end = self.in_offsets[dst], self.in_offsets[dst + 1]
+        edges = zip(self.sources[start:end], self.in_weights[start:end])
+
+        # Fast path when the row has no pending edits
+        pending = self._delta_in.get(dst)
+        if pending is None:
+            return list(edges)
+
+        merged = dict(edges)
+        merged.update(pending)
+        return sorted((src, weight) for src, weight in merged.items() if weight > 0)
+
+    def _iter_in_edges(self, dst: int):
+        """
+        Returns an iterable of (src, weight) pairs for each edge entering
+        the given vertex, in no particular order. Unlike _in_edges(), a
+        column with pending edits is not sorted.
+        """
+        start, end = self.in_offsets[dst], self.in_offsets[dst + 1]
+        edges = zip(self.sources[start:end], self.in_weights[start:end])
+
+        pending = self._delta_in.get(dst)
+        if pending is None:
+            return edges
+
+        merged = dict(edges)
+        merged.update(pending)
+        return [(src, weight) for src, weight in merged.items() if weight > 0]
+
+
+if __name__ == '__main__':
+
+    print("\nCSR - same API as DirectedGraph")
+    print("-------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = CSRDirectedGraph(edges)
+    print(g)
+    print(g.get_edges(), g.has_cycle(), sep='\n')
+    for start in range(5):
+        print(f'{start} DFS:{g.dfs(start)} BFS:{g.bfs(start)}')
+    g.compact()
+    g.remove_edge(4, 3)
+    for i in range(5):
+        print(f'DIJKSTRA {i} {g.dijkstra(i)}')
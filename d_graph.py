@@ -6,6 +6,7 @@
 #              an adjacency matrix.
 
 import heapq
+from array import array
 from collections import deque
 
 
@@ -18,6 +19,28 @@ class DirectedGraph:
     - vertex names are integers
     """
 
+    # Direction switching thresholds of frontier_bfs(). A level goes
+    # bottom-up once its frontier holds 1/alpha of the unexplored edges.
+    # Each bottom-up probe is an interpreted loop over _iter_in_edges(),
+    # not the bitmap test of Beamer et al., and their alpha = 14 was up to
+    # 20% slower on sparse random graphs with either the dict or the CSR
+    # storage; 2 to 8 timed the same. beta only affects the last levels.
+    _BFS_ALPHA = 4
+    _BFS_BETA = 24
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Creates the successor and predecessor indexes of {vertex: weight}
+        dicts kept in sync with the matrix, and the version counting changes
+        to the graph. They are set up here because __init__ must not change.
+        """
+        graph = super().__new__(cls)
+        graph._succ = []
+        graph._pred = []
+        graph.version = 0
+        graph._observers = []
+        return graph
+
     def __init__(self, start_edges=None):
         """
         Store graph info as adjacency matrix
@@ -54,23 +77,73 @@ class DirectedGraph:
         out = f"GRAPH ({self.v_count} vertices):\n{out}"
         return out
 
+    def _matrix_string(self) -> str:
+        """
+        Returns the same text as __str__, built from _out_edges(), for
+        storage backends that do not keep adj_matrix as lists of rows
+        """
+        if self.v_count == 0:
+            return 'EMPTY GRAPH\n'
+        out = '   |'
+        out += ' '.join(['{:2}'.format(i) for i in range(self.v_count)]) + '\n'
+        out += '-' * (self.v_count * 3 + 3) + '\n'
+        for i in range(self.v_count):
+            row = [0] * self.v_count
+            for dst, weight in self._out_edges(i):
+                row[dst] = weight
+            out += '{:2} |'.format(i)
+            out += ' '.join(['{:2}'.format(w) for w in row]) + '\n'
+        out = f"GRAPH ({self.v_count} vertices):\n{out}"
+        return out
+
+    @classmethod
+    def from_edges(cls, edges, n_vertices=None, **kwargs):
+        """
+        Builds a graph from an iterable of (src, dst, weight) tuples in one
+        pass. If n_vertices is given the edges are only read once, otherwise
+        they are scanned first to find the largest vertex. Extra keyword
+        arguments are passed to the constructor.
+        """
+        if n_vertices is None:
+            edges = list(edges)
+            n_vertices = 0
+            for u, v, _ in edges:
+                n_vertices = max(n_vertices, u + 1, v + 1)
+
+        graph = cls(**kwargs)
+        graph._bulk_load(n_vertices, edges)
+        return graph
+
+    def save(self, path) -> None:
+        """
+        Writes the graph to path in the binary format of graph_file.py
+        """
+        import graph_file
+        graph_file.save(self, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Reads a graph written by save() into a new graph of this class. CSR
+        backends use the memory-mapped arrays directly when mmap is True.
+        """
+        import graph_file
+        return graph_file.load(path, mmap, cls)
+
     # ------------------------------------------------------------------ #
 
     def add_vertex(self) -> int:
         """
         Adds a single vertex to the graph
         """
+        self._append_vertex()
+        self.v_count += 1  # Increment vertex count
 
-        # Add zero to each row
-        for src in range(self.v_count):
-            self.adj_matrix[src].append(0)
-
-        # Add extra row and fill with zeroes
-        self.adj_matrix.append([0])
-        for _ in range(self.v_count):
-            self.adj_matrix[self.v_count].append(0)
+        # Tell observers about the new vertex
+        self.version += 1
+        for observer in self._observers:
+            observer.vertex_added(self, self.v_count - 1)
 
-        self.v_count += 1  # Increment vertex count
         return self.v_count
 
     def add_edge(self, src: int, dst: int, weight=1) -> None:
@@ -91,7 +164,21 @@ class DirectedGraph:
         if weight < 1 or src == dst:
             return
 
-        self.adj_matrix[src][dst] = weight
+        self._change_edge(src, dst, weight)
+
+    def add_edges(self, edges) -> None:
+        """
+        Adds each (src, dst, weight) edge of an iterable, first adding
+        vertices so that both endpoints exist. The edges are read once, so
+        generators and other streams can be passed directly.
+        """
+        for src, dst, weight in edges:
+
+            # Grow the graph up to the larger endpoint
+            while self.v_count <= max(src, dst):
+                self.add_vertex()
+
+            self.add_edge(src, dst, weight)
 
     def remove_edge(self, src: int, dst: int) -> None:
         """
@@ -107,8 +194,39 @@ class DirectedGraph:
             return
 
         # Remove edge if it currently exists
-        if self.adj_matrix[src][dst] > 0:
-            self.adj_matrix[src][dst] = 0
+        if self._edge_weight(src, dst) > 0:
+            self._change_edge(src, dst, 0)
+
+    def subscribe(self, observer) -> None:
+        """
+        Registers an observer that is told about every change to the graph.
+        The observer must have the methods vertex_added(graph, v) and
+        edge_changed(graph, src, dst, old_weight, new_weight), where a
+        weight of 0 means there is no edge.
+        """
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer) -> None:
+        """
+        Removes an observer added with subscribe(), if it is registered
+        """
+        if observer in self._observers:
+            self._observers.remove(observer)
+
+    def _change_edge(self, src: int, dst: int, weight) -> None:
+        """
+        Stores a validated edge weight (0 to remove the edge), then bumps
+        the version and tells observers if the weight actually changed
+        """
+        old_weight = self._edge_weight(src, dst)
+        if old_weight == weight:
+            return
+
+        self._store_edge(src, dst, weight)
+
+        self.version += 1
+        for observer in self._observers:
+            observer.edge_changed(self, src, dst, old_weight, weight)
 
     def get_vertices(self) -> []:
         """
@@ -116,6 +234,28 @@ class DirectedGraph:
         """
         return [vertex for vertex in range(self.v_count)]
 
+    def successors(self, v: int) -> []:
+        """
+        Returns a list of the vertices that have an edge from the given
+        vertex, in ascending order. An empty list is returned if the vertex
+        is not in the graph.
+        """
+        if v < 0 or v >= self.v_count:
+            return []
+
+        return [dst for dst, _ in self._out_edges(v)]
+
+    def predecessors(self, v: int) -> []:
+        """
+        Returns a list of the vertices that have an edge to the given
+        vertex, in ascending order. An empty list is returned if the vertex
+        is not in the graph.
+        """
+        if v < 0 or v >= self.v_count:
+            return []
+
+        return [src for src, _ in self._in_edges(v)]
+
     def get_edges(self) -> []:
         """
         Returns a list of edges in the graph in the format (src, dst, weight)
@@ -124,12 +264,8 @@ class DirectedGraph:
 
         # Iterate over all edges in the graph
         for src in range(self.v_count):
-            for dst in range (self.v_count):
-                weight = self.adj_matrix[src][dst]
-
-                # Only add edge if it has positive weight
-                if weight > 0:
-                    edges.append((src, dst, weight))
+            for dst, weight in self._out_edges(src):
+                edges.append((src, dst, weight))
 
         return edges
 
@@ -149,7 +285,7 @@ class DirectedGraph:
             path_dst = path[index + 1]
 
             # Check if edge exists
-            if self.adj_matrix[path_src][path_dst] == 0:
+            if self._edge_weight(path_src, path_dst) == 0:
                 return False
 
         return True
@@ -161,83 +297,182 @@ class DirectedGraph:
         end vertex. Vertices are explored in ascending order if a choice
         must be made about which vertex to explore next.
         """
+        return list(self.iter_dfs(v_start, stop_when=self._is_end(v_end)))
+
+    def bfs(self, v_start, v_end=None) -> []:
+        """
+        Returns a list of vertices in the order they are visited in a
+        BFS traversal from the given start vertex to the optional given
+        end vertex. Vertices are explored in ascending order if a choice
+        must be made about which vertex to explore next.
+        """
+        return list(self.iter_bfs(v_start, stop_when=self._is_end(v_end)))
+
+    def iter_dfs(self, v_start, with_info=False, stop_when=None):
+        """
+        Yields the vertices of a DFS traversal from the given start vertex
+        as they are visited, in the same order as dfs(). With with_info,
+        (vertex, depth, parent) tuples are yielded instead, where parent is
+        None for the start vertex. The traversal stops after the first
+        vertex for which stop_when(vertex) is True, or when the caller stops
+        iterating. The graph must not be modified during iteration.
+        """
 
         # Check if start vertex is in the graph
         if v_start < 0 or v_start >= self.v_count:
-            return []  # Return empty list
+            return
+
+        stack = [v_start]
+        seen = set()
 
-        stack = deque()
-        visited = []
-        stack.append(v_start)
+        # With with_info, the latest vertex to push a vertex is its parent,
+        # since that copy of it is popped first
+        parents = {v_start: None}
+        depths = {}
 
         # Iterate through each vertex and perform DFS
         while len(stack) > 0:
             curr_vertex = stack.pop()
-
-            if curr_vertex not in visited:
-                visited.append(curr_vertex)
-
-                # Check if end vertex has been reached
-                if curr_vertex == v_end:
-                    return visited
-
-                # Add each neighbor of current vertex to a temp list
-                temp_list = []
-                for vertex in range(self.v_count):
-
-                    # Check if vertex is a neighbor to current vertex
-                    if self.adj_matrix[curr_vertex][vertex] > 0:
-                        temp_list.append(vertex)
-
-                # Add each neighbor to the stack in descending order
-                temp_list.sort(reverse=True)
-                for vertex in temp_list:
+            if curr_vertex in seen:
+                continue
+
+            seen.add(curr_vertex)
+            if with_info:
+                parent = parents[curr_vertex]
+                depths[curr_vertex] = 0 if parent is None else depths[parent] + 1
+                yield curr_vertex, depths[curr_vertex], parent
+            else:
+                yield curr_vertex
+
+            # Check if the caller wants to stop here
+            if stop_when is not None and stop_when(curr_vertex):
+                return
+
+            # Add each unvisited neighbor to the stack in descending order
+            for vertex in reversed(self.successors(curr_vertex)):
+                if vertex not in seen:
                     stack.append(vertex)
+                    if with_info:
+                        parents[vertex] = curr_vertex
 
-        return visited
-
-    def bfs(self, v_start, v_end=None) -> []:
+    def iter_bfs(self, v_start, with_info=False, stop_when=None):
         """
-        Returns a list of vertices in the order they are visited in a
-        BFS traversal from the given start vertex to the optional given
-        end vertex. Vertices are explored in ascending order if a choice
-        must be made about which vertex to explore next.
+        Yields the vertices of a BFS traversal from the given start vertex
+        as they are visited, in the same order as bfs(). with_info and
+        stop_when work as in iter_dfs(). The graph must not be modified
+        during iteration.
         """
 
         # Check if start vertex is in the graph
         if v_start < 0 or v_start >= self.v_count:
-            return []  # Return empty list
+            return
 
-        queue = deque()
-        visited = []
-        queue.append(v_start)
+        # Vertices are marked when queued, so none is queued twice
+        queue = deque([v_start])
+        seen = {v_start}
+        parents = {v_start: None}
+        depths = {v_start: 0}
 
         # Iterate through each vertex and perform BFS
         while len(queue) > 0:
             curr_vertex = queue.popleft()
-
-            if curr_vertex not in visited:
-                visited.append(curr_vertex)
-
-            # Check if end vertex has been found
-            if curr_vertex == v_end:
-                return visited
-
-            # Add each neighbor of current vertex to a temp list
-            temp_list = []
-            for vertex in range(self.v_count):
-
-                # Check if vertex is a neighbor to current vertex
-                if self.adj_matrix[curr_vertex][vertex] > 0:
-                    temp_list.append(vertex)
-
-            # Add each neighbor to the stack in descending order
-            temp_list.sort()
-            for vertex in temp_list:
-                if vertex not in visited:
+            if with_info:
+                yield curr_vertex, depths[curr_vertex], parents[curr_vertex]
+            else:
+                yield curr_vertex
+
+            # Check if the caller wants to stop here
+            if stop_when is not None and stop_when(curr_vertex):
+                return
+
+            # Add each unvisited neighbor to the queue in ascending order
+            for vertex in self.successors(curr_vertex):
+                if vertex not in seen:
+                    seen.add(vertex)
                     queue.append(vertex)
+                    if with_info:
+                        parents[vertex] = curr_vertex
+                        depths[vertex] = depths[curr_vertex] + 1
+
+    @staticmethod
+    def _is_end(v_end):
+        """
+        Returns a stop_when predicate matching v_end, or None if there is
+        no end vertex
+        """
+        if v_end is None:
+            return None
+        return lambda vertex: vertex == v_end
 
-        return visited
+    def frontier_bfs(self, sources, max_depth=None) -> ():
+        """
+        Runs one level-synchronous BFS from all the given sources at once
+        and returns (hops, parents) arrays indexed by vertex. hops[v] is the
+        number of edges on a shortest path from the nearest source to v and
+        parents[v] is the vertex before v on such a path. Both are -1 for
+        vertices that are not reached, and parents is -1 for the sources.
+        With max_depth, only vertices within max_depth hops are reached.
+
+        Each level is expanded top-down from the frontier while it is small,
+        and bottom-up, with every unreached vertex looking for a predecessor
+        in the frontier, while it is large (direction-optimizing BFS).
+        """
+        hops = array('q', [-1]) * self.v_count
+        parents = array('q', [-1]) * self.v_count
+
+        frontier = []
+        for src in sources:
+            if 0 <= src < self.v_count and hops[src] < 0:
+                hops[src] = 0
+                frontier.append(src)
+
+        depth = 0
+        reached = len(frontier)
+        scanned = 0         # Out-edges of the vertices expanded so far
+        edge_count = None   # Counted on the first large frontier
+        bottom_up = False
+
+        while len(frontier) > 0 and (max_depth is None or depth < max_depth):
+
+            # Go bottom-up once the frontier has more edges than a fraction
+            # of the unexplored edges, and back once it is small again
+            if bottom_up:
+                bottom_up = len(frontier) * self._BFS_BETA >= self.v_count
+            elif len(frontier) * self._BFS_ALPHA > self.v_count - reached:
+                if edge_count is None:
+                    edge_count = sum(self._out_degree(v) for v in range(self.v_count))
+                frontier_edges = sum(self._out_degree(v) for v in frontier)
+                bottom_up = frontier_edges * self._BFS_ALPHA > edge_count - scanned
+
+            next_frontier = []
+            if bottom_up:
+                scanned += sum(self._out_degree(v) for v in frontier)
+                for vertex in range(self.v_count):
+                    if hops[vertex] >= 0:
+                        continue
+
+                    # Take the first predecessor found in the frontier
+                    for pred, _ in self._iter_in_edges(vertex):
+                        if hops[pred] == depth:
+                            hops[vertex] = depth + 1
+                            parents[vertex] = pred
+                            next_frontier.append(vertex)
+                            break
+            else:
+                for vertex in frontier:
+                    out_edges = self._out_edges(vertex)
+                    scanned += len(out_edges)
+                    for successor, _ in out_edges:
+                        if hops[successor] < 0:
+                            hops[successor] = depth + 1
+                            parents[successor] = vertex
+                            next_frontier.append(successor)
+
+            frontier = next_frontier
+            reached += len(frontier)
+            depth += 1
+
+        return hops, parents
 
     def has_cycle(self):
         """
@@ -250,15 +485,11 @@ class DirectedGraph:
         in_degrees = []  # Count of incoming edges
         queue = deque()  # Queue of vertices with no incoming edges
 
-        for col in range(self.v_count):
-            deg_count = 0
-            for row in range(self.v_count):
-
-                if self.adj_matrix[row][col] > 0:
-                    deg_count += 1
+        for vertex in range(self.v_count):
+            deg_count = self._in_degree(vertex)
 
             if deg_count == 0:
-                queue.append(col)
+                queue.append(vertex)
 
             in_degrees.append(deg_count)
 
@@ -270,14 +501,11 @@ class DirectedGraph:
             visited_count += 1
 
             # Decrease in-degree of all neighbor vertices by 1
-            for vertex in range(self.v_count):
+            for vertex, _ in self._iter_out_edges(curr_vertex):
+                in_degrees[vertex] -= 1
 
-                # Check if vertex is a neighbor
-                if self.adj_matrix[curr_vertex][vertex] > 0:
-                    in_degrees[vertex] -= 1
-
-                    if in_degrees[vertex] == 0:
-                        queue.append(vertex)
+                if in_degrees[vertex] == 0:
+                    queue.append(vertex)
 
         # Graph contains cycle if vertices visited not equal to actual number of vertices
         if visited_count != self.v_count:
@@ -291,29 +519,387 @@ class DirectedGraph:
         given source vertex to each vertex in the graph. If a vertex is
         disconnected from the src subgraph, then its distance is marked as 'inf'.
         """
+        shortest_paths, _ = self._dijkstra_search(src)
+        return shortest_paths
+
+    def shortest_path_tree(self, src: int) -> ():
+        """
+        Returns a tuple (distances, parents) from Dijkstra's Algorithm, where
+        distances is the list returned by dijkstra() and parents[v] is the
+        vertex before v on a shortest path from src (None for src and for
+        unreachable vertices)
+        """
+        return self._dijkstra_search(src)
+
+    def shortest_path(self, src: int, dst: int) -> ():
+        """
+        Returns a tuple (distance, path) for the shortest path from src to
+        dst, where path is the list of vertices from src to dst. The search
+        stops as soon as dst is settled. If dst cannot be reached, or either
+        vertex is not in the graph, (inf, []) is returned.
+        """
+
+        # Check if both vertices are in the graph
+        if not 0 <= src < self.v_count or not 0 <= dst < self.v_count:
+            return float('inf'), []
+
+        shortest_paths, parents = self._dijkstra_search(src, dst)
+        if shortest_paths[dst] == float('inf'):
+            return float('inf'), []
+
+        return shortest_paths[dst], self._trace_path(parents, dst)
+
+    def all_pairs_shortest_paths(self, sources=None, workers=None, out=None) -> []:
+        """
+        Returns a list of dijkstra(src) for each source (every vertex by
+        default), spread over workers processes that share the graph
+        read-only. With an out path the rows are written to that file as a
+        float64 matrix instead, see apsp.py.
+        """
+        import apsp
+        return apsp.all_pairs_shortest_paths(self, sources, workers, out)
+
+    def all_pairs_dense(self, next_hops=False, method='auto') -> ():
+        """
+        Returns (distances, hops) NumPy matrices of all shortest path
+        distances and, if next_hops is True, of the next vertex on each
+        path. Uses a blocked Floyd-Warshall or repeated Dijkstra, whichever
+        suits the size and density of the graph, see apsp.py.
+        """
+        import apsp
+        return apsp.all_pairs_dense(self, next_hops, method)
+
+    def bidirectional_dijkstra(self, src: int, dst: int) -> ():
+        """
+        Returns a tuple (distance, path) for the shortest path from src to
+        dst, like shortest_path(). Runs one search forward from src over
+        outgoing edges and one backward from dst over incoming edges, and
+        stops once the two frontiers cannot improve the best meeting point.
+        """
+
+        # Check if both vertices are in the graph
+        if not 0 <= src < self.v_count or not 0 <= dst < self.v_count:
+            return float('inf'), []
+
+        # Index 0 holds the forward search and index 1 the backward search
+        distances = ({src: 0}, {dst: 0})
+        parents = ({src: None}, {dst: None})
+        settled = (set(), set())
+        p_queues = ([(0, src)], [(0, dst)])
+        neighbors = (self._out_edges, self._in_edges)
+
+        best_dist = 0 if src == dst else float('inf')
+        meeting = src if src == dst else None
+
+        while len(p_queues[0]) > 0 and len(p_queues[1]) > 0:
+
+            # Stop once no path through either frontier can be shorter
+            if p_queues[0][0][0] + p_queues[1][0][0] >= best_dist:
+                break
+
+            # Advance the search with the smaller frontier
+            side = 0 if len(p_queues[0]) <= len(p_queues[1]) else 1
+            curr_dist, curr_vertex = heapq.heappop(p_queues[side])
+            if curr_vertex in settled[side]:
+                continue
+            settled[side].add(curr_vertex)
+
+            for vertex, dist in neighbors[side](curr_vertex):
+                new_dist = curr_dist + dist
+                if vertex not in settled[side] \
+                        and new_dist < distances[side].get(vertex, float('inf')):
+                    distances[side][vertex] = new_dist
+                    parents[side][vertex] = curr_vertex
+                    heapq.heappush(p_queues[side], (new_dist, vertex))
+
+                # Check if the vertex joins the two searches more cheaply
+                other_dist = distances[1 - side].get(vertex)
+                if other_dist is not None \
+                        and distances[side][vertex] + other_dist < best_dist:
+                    best_dist = distances[side][vertex] + other_dist
+                    meeting = vertex
+
+        if meeting is None:
+            return float('inf'), []
+
+        # Join the forward path to the meeting vertex with the reversed
+        # backward path from it
+        path = self._trace_path(parents[0], meeting)
+        vertex = parents[1][meeting]
+        while vertex is not None:
+            path.append(vertex)
+            vertex = parents[1][vertex]
+
+        return best_dist, path
+
+    def astar(self, src: int, dst: int, heuristic=None) -> ():
+        """
+        Returns a tuple (distance, path) for the shortest path from src to
+        dst, like shortest_path(), using A* search. heuristic(v, dst) must
+        never overestimate the distance from v to dst; LandmarkHeuristic
+        below is one such heuristic. Without a heuristic this is the same
+        as Dijkstra's Algorithm.
+        """
+
+        # Check if both vertices are in the graph
+        if not 0 <= src < self.v_count or not 0 <= dst < self.v_count:
+            return float('inf'), []
+
+        if heuristic is None:
+            return self.shortest_path(src, dst)
+
+        distances = {src: 0}
+        parents = {src: None}
+        p_queue = [(heuristic(src, dst), 0, src)]
+
+        while len(p_queue) > 0:
+            _, curr_dist, curr_vertex = heapq.heappop(p_queue)
+
+            # Skip entries made stale by a shorter path to the vertex
+            if curr_dist > distances[curr_vertex]:
+                continue
+
+            # Check if the target vertex has been reached
+            if curr_vertex == dst:
+                return curr_dist, self._trace_path(parents, dst)
+
+            # A vertex is reopened whenever a shorter path to it is found, so
+            # admissible but inconsistent heuristics are still exact
+            for successor, dist in self._iter_out_edges(curr_vertex):
+                new_dist = curr_dist + dist
+                if new_dist < distances.get(successor, float('inf')):
+                    estimate = heuristic(successor, dst)
+                    if estimate == float('inf'):
+                        continue  # dst cannot be reached from successor
+
+                    distances[successor] = new_dist
+                    parents[successor] = curr_vertex
+                    heapq.heappush(p_queue, (new_dist + estimate, new_dist, successor))
+
+        return float('inf'), []
+
+    def _dijkstra_search(self, src: int, dst=None) -> ():
+        """
+        Runs Dijkstra's Algorithm from src and returns a tuple (distances,
+        parents). If dst is given the search stops once dst is settled, so
+        only the distances of settled vertices are final. A vertex is only
+        pushed onto the priority queue when its best known distance
+        improves, which keeps dominated entries out of the heap.
+        """
 
         # Initialize shortest paths to infinity
-        shortest_paths = []
-        for _ in range(self.v_count):
-            shortest_paths.append(float('inf'))
+        shortest_paths = [float('inf')] * self.v_count
+        parents = [None] * self.v_count
+        settled = [False] * self.v_count
 
         # Initialize priority queue with src vertex having a distance of zero
+        shortest_paths[src] = 0
         p_queue = [(0, src)]
 
         # Perform Dijkstra's Algorithm
         while len(p_queue) > 0:
             curr_dist, curr_vertex = heapq.heappop(p_queue)
 
-            # Check if current vertex has been visited
-            if shortest_paths[curr_vertex] == float('inf'):
-                shortest_paths[curr_vertex] = curr_dist
+            # Skip stale entries of vertices that were already settled
+            if settled[curr_vertex]:
+                continue
+            settled[curr_vertex] = True
 
-                for successor in range(self.v_count):
-                    if self.adj_matrix[curr_vertex][successor] > 0:
-                        dist = self.adj_matrix[curr_vertex][successor]
-                        heapq.heappush(p_queue, (curr_dist + dist, successor))
+            # Check if the target vertex has been reached
+            if curr_vertex == dst:
+                break
 
-        return shortest_paths
+            for successor, dist in self._iter_out_edges(curr_vertex):
+                new_dist = curr_dist + dist
+
+                # Only push the successor if its best distance improves
+                if not settled[successor] and new_dist < shortest_paths[successor]:
+                    shortest_paths[successor] = new_dist
+                    parents[successor] = curr_vertex
+                    heapq.heappush(p_queue, (new_dist, successor))
+
+        return shortest_paths, parents
+
+    @staticmethod
+    def _trace_path(parents, dst: int) -> []:
+        """
+        Returns the list of vertices from the root of the parent links to
+        dst, where the root is the vertex whose parent is None
+        """
+        path = [dst]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    # ------------------------------------------------------------------ #
+    # Storage primitives. Every method above reads and writes edges only
+    # through these, so alternative storage backends (see csr_graph.py)
+    # override them and inherit the rest of the API unchanged.
+
+    def _append_vertex(self) -> None:
+        """
+        Adds storage for vertex number v_count, with no edges. The caller
+        updates v_count.
+        """
+
+        # Add zero to each row
+        for row in self.adj_matrix:
+            row.append(0)
+
+        # Add extra row filled with zeroes
+        self.adj_matrix.append([0] * (self.v_count + 1))
+        self._succ.append({})
+        self._pred.append({})
+
+    def _bulk_load(self, n_vertices: int, edges) -> None:
+        """
+        Replaces the contents of an empty graph with n_vertices vertices and
+        the given edges. Invalid edges are skipped like in add_edge().
+        """
+        self.adj_matrix = [[0] * n_vertices for _ in range(n_vertices)]
+        self._succ = [{} for _ in range(n_vertices)]
+        self._pred = [{} for _ in range(n_vertices)]
+        self.v_count = n_vertices
+
+        for src, dst, weight in edges:
+            self.add_edge(src, dst, weight)
+
+    def _edge_weight(self, src: int, dst: int):
+        """
+        Returns the weight of the edge from src to dst, or 0 if there is no
+        such edge. Both vertices are assumed to exist.
+        """
+        return self.adj_matrix[src][dst]
+
+    def _store_edge(self, src: int, dst: int, weight) -> None:
+        """
+        Sets the weight of the edge from src to dst. A weight of 0 removes
+        the edge. Arguments are assumed to be validated by the caller.
+        """
+        self.adj_matrix[src][dst] = weight
+
+        # Keep the successor and predecessor indexes in sync
+        if weight > 0:
+            self._succ[src][dst] = weight
+            self._pred[dst][src] = weight
+        else:
+            self._succ[src].pop(dst, None)
+            self._pred[dst].pop(src, None)
+
+    def _out_edges(self, src: int) -> []:
+        """
+        Returns a list of (dst, weight) pairs for each edge leaving the given
+        vertex, in ascending order of dst
+        """
+        return sorted(self._succ[src].items())
+
+    def _iter_out_edges(self, src: int):
+        """
+        Returns an iterable of (dst, weight) pairs for each edge leaving the
+        given vertex, in no particular order. Used instead of _out_edges()
+        where the order does not matter, to skip sorting the row.
+        """
+        return self._succ[src].items()
+
+    def _out_degree(self, src: int) -> int:
+        """
+        Returns the number of edges leaving the given vertex
+        """
+        return len(self._succ[src])
+
+    def _in_degree(self, dst: int) -> int:
+        """
+        Returns the number of edges entering the given vertex
+        """
+        return len(self._pred[dst])
+
+    def _in_edges(self, dst: int) -> []:
+        """
+        Returns a list of (src, weight) pairs for each edge entering the
+        given vertex, in ascending order of src
+        """
+        return sorted(self._pred[dst].items())
+
+    def _iter_in_edges(self, dst: int):
+        """
+        Returns an iterable of (src, weight) pairs for each edge entering
+        the given vertex, in no particular order. Used instead of
+        _in_edges() where the order does not matter, to skip sorting.
+        """
+        return self._pred[dst].items()
+
+
+class LandmarkHeuristic:
+    """
+    ALT (A*, landmarks, triangle inequality) lower bounds for astar()
+    - distances from and to a few landmark vertices are computed once
+      with dijkstra() on the graph and on its reverse
+    - for a landmark L, both d(L, dst) - d(L, v) and d(v, L) - d(dst, L)
+      never exceed d(v, dst), so the largest of them is admissible
+    - the bounds must be recomputed after the graph changes
+    """
+
+    def __init__(self, graph: DirectedGraph, landmarks=None, count=4):
+        """
+        Precompute landmark distances. If no landmarks are given, count of
+        them are picked greedily, each as far as possible from the ones
+        already chosen.
+        """
+        reverse = DirectedGraph.from_edges(
+            [(dst, src, weight) for src, dst, weight in graph.get_edges()],
+            n_vertices=graph.v_count)
+
+        if landmarks is None:
+            landmarks = self._pick_landmarks(graph, count)
+
+        self.landmarks = list(landmarks)
+        self.from_landmark = [graph.dijkstra(landmark) for landmark in self.landmarks]
+        self.to_landmark = [reverse.dijkstra(landmark) for landmark in self.landmarks]
+
+    def __call__(self, v: int, dst: int):
+        """
+        Returns a lower bound on the distance from v to dst, or inf if the
+        landmarks prove that dst cannot be reached from v
+        """
+        bound = 0
+        for from_l, to_l in zip(self.from_landmark, self.to_landmark):
+
+            # L reaches v but not dst, so v cannot reach dst either
+            if from_l[dst] == float('inf') and from_l[v] != float('inf'):
+                return float('inf')
+
+            if from_l[dst] != float('inf') and from_l[v] != float('inf'):
+                bound = max(bound, from_l[dst] - from_l[v])
+            if to_l[v] != float('inf') and to_l[dst] != float('inf'):
+                bound = max(bound, to_l[v] - to_l[dst])
+
+        return bound
+
+    @staticmethod
+    def _pick_landmarks(graph: DirectedGraph, count: int) -> []:
+        """
+        Returns up to count landmarks using farthest-point selection on
+        dijkstra() distances, starting from vertex 0
+        """
+        if graph.v_count == 0:
+            return []
+
+        landmarks = [0]
+        nearest = graph.dijkstra(0)  # Distance to the closest landmark
+
+        while len(landmarks) < min(count, graph.v_count):
+            candidates = [vertex for vertex in range(graph.v_count)
+                          if vertex not in landmarks and nearest[vertex] != float('inf')]
+            if len(candidates) == 0:
+                candidates = [vertex for vertex in range(graph.v_count)
+                              if vertex not in landmarks]
+
+            landmark = max(candidates, key=lambda vertex: nearest[vertex])
+            landmarks.append(landmark)
+            nearest = [min(old, new) for old, new in zip(nearest, graph.dijkstra(landmark))]
+
+        return landmarks
 
 
 if __name__ == '__main__':
@@ -0,0 +1,187 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Incremental single-source shortest paths for a DirectedGraph.
+#              Distances and shortest path trees of a few tracked sources
+#              are repaired after each edge change instead of rerunning
+#              Dijkstra's Algorithm, following Ramalingam and Reps.
+
+import heapq
+
+from d_graph import DirectedGraph
+
+
+class DynamicShortestPaths:
+    """
+    Class to keep dijkstra() results of tracked sources up to date
+    - observes the graph, so every add_edge / remove_edge / add_vertex is
+      applied to the tracked results as it happens
+    - a new or shorter edge is propagated forward from its head with a
+      Dijkstra search limited to the vertices whose distance improves
+    - a longer or removed tree edge only invalidates the subtree below it;
+      those vertices are re-seeded from their unaffected predecessors and
+      settled with a Dijkstra search over the subtree
+    - edits to edges outside a shortest path tree cost O(1) per source
+    """
+
+    def __init__(self, graph: DirectedGraph, sources=()):
+        """
+        Attach to the given graph and start tracking the given sources
+        """
+        self.graph = graph
+        self._trees = {}  # {src: (distances, parents)}
+
+        for src in sources:
+            self.track(src)
+
+        graph.subscribe(self)
+
+    def close(self) -> None:
+        """
+        Detaches from the graph and stops tracking every source
+        """
+        self.graph.unsubscribe(self)
+        self._trees.clear()
+
+    def track(self, src: int) -> None:
+        """
+        Starts tracking src, computing its shortest paths once from scratch
+        """
+        if src not in self._trees:
+            self._trees[src] = self.graph.shortest_path_tree(src)
+
+    def untrack(self, src: int) -> None:
+        """
+        Stops tracking src
+        """
+        self._trees.pop(src, None)
+
+    def sources(self) -> []:
+        """
+        Returns a list of the tracked sources
+        """
+        return list(self._trees)
+
+    def distances(self, src: int) -> []:
+        """
+        Returns the same list as graph.dijkstra(src) for a tracked source
+        """
+        return list(self._trees[src][0])
+
+    def shortest_path(self, src: int, dst: int) -> ():
+        """
+        Returns the same (distance, path) tuple as graph.shortest_path() for
+        a tracked source
+        """
+        distances, parents = self._trees[src]
+        if not 0 <= dst < len(distances) or distances[dst] == float('inf'):
+            return float('inf'), []
+
+        return distances[dst], DirectedGraph._trace_path(parents, dst)
+
+    # ------------------------------------------------------------------ #
+    # Graph observer methods
+
+    def vertex_added(self, graph: DirectedGraph, v: int) -> None:
+        """
+        A new vertex has no edges, so it is unreachable from every source
+        """
+        for distances, parents in self._trees.values():
+            distances.append(float('inf'))
+            parents.append(None)
+
+    def edge_changed(self, graph: DirectedGraph, src: int, dst: int,
+                     old_weight, new_weight) -> None:
+        """
+        Repairs every tracked result after the weight of edge src -> dst
+        changed from old_weight to new_weight (0 means no edge)
+        """
+        for distances, parents in self._trees.values():
+            if new_weight == 0 or (old_weight > 0 and new_weight > old_weight):
+                self._increase(distances, parents, src, dst)
+            else:
+                self._decrease(distances, parents, src, dst, new_weight)
+
+    # ------------------------------------------------------------------ #
+
+    def _decrease(self, distances, parents, src: int, dst: int, weight) -> None:
+        """
+        Applies a new or shorter edge src -> dst. Only vertices whose
+        distance strictly improves are visited.
+        """
+        new_dist = distances[src] + weight
+        if new_dist >= distances[dst]:
+            return  # The edge does not improve any path
+
+        distances[dst] = new_dist
+        parents[dst] = src
+        self._propagate(distances, parents, [(new_dist, dst)])
+
+    def _increase(self, distances, parents, src: int, dst: int) -> None:
+        """
+        Applies a longer or removed edge src -> dst. Nothing changes unless
+        the edge is in the shortest path tree, in which case the subtree
+        below dst is recomputed.
+        """
+        if parents[dst] != src:
+            return  # The tree does not use the edge
+
+        # Collect the subtree hanging from dst and forget its distances
+        affected = {dst}
+        stack = [dst]
+        while len(stack) > 0:
+            vertex = stack.pop()
+            for successor in self.graph.successors(vertex):
+                if parents[successor] == vertex and successor not in affected:
+                    affected.add(successor)
+                    stack.append(successor)
+
+        for vertex in affected:
+            distances[vertex] = float('inf')
+            parents[vertex] = None
+
+        # Seed each affected vertex with its best unaffected predecessor
+        p_queue = []
+        for vertex in affected:
+            for pred, weight in self.graph._in_edges(vertex):
+                if pred not in affected and distances[pred] + weight < distances[vertex]:
+                    distances[vertex] = distances[pred] + weight
+                    parents[vertex] = pred
+
+            if distances[vertex] != float('inf'):
+                p_queue.append((distances[vertex], vertex))
+
+        heapq.heapify(p_queue)
+        self._propagate(distances, parents, p_queue)
+
+    def _propagate(self, distances, parents, p_queue: []) -> None:
+        """
+        Runs Dijkstra's Algorithm from the (distance, vertex) entries of the
+        heap p_queue, relaxing only edges that strictly improve a distance
+        """
+        while len(p_queue) > 0:
+            curr_dist, curr_vertex = heapq.heappop(p_queue)
+
+            # Skip entries made stale by a later improvement
+            if curr_dist > distances[curr_vertex]:
+                continue
+
+            for successor, weight in self.graph._iter_out_edges(curr_vertex):
+                new_dist = curr_dist + weight
+                if new_dist < distances[successor]:
+                    distances[successor] = new_dist
+                    parents[successor] = curr_vertex
+                    heapq.heappush(p_queue, (new_dist, successor))
+
+
+if __name__ == '__main__':
+
+    print("\nDynamicShortestPaths example")
+    print("----------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    paths = DynamicShortestPaths(g, sources=[0, 2])
+    for change in ((4, 3, 0), (4, 3, 3), (0, 2, 1), (1, 4, 40)):
+        src, dst, weight = change
+        g.add_edge(src, dst, weight) if weight > 0 else g.remove_edge(src, dst)
+        print(change, paths.distances(0), paths.distances(2), paths.shortest_path(0, 3))
@@ -0,0 +1,285 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Streaming edge-list ingestion for both graph classes. Edges are
+#              read from CSV/TSV/whitespace separated files (optionally
+#              gzip compressed), open file objects or any iterable, in
+#              fixed size chunks, so only the graph and one chunk are ever
+#              held in memory however large the input is.
+
+import csv
+import gzip
+import io
+import math
+import os
+import time
+from itertools import islice
+from numbers import Integral
+
+from d_graph import DirectedGraph
+
+GZIP_MAGIC = b'\x1f\x8b'
+COMMENT_PREFIXES = ('#', '%')
+
+
+def open_edge_file(path, delimiter=None):
+    """
+    Opens an edge-list file for reading text lines, decompressing it if it
+    starts with the gzip magic bytes. Returns the file and the delimiter to
+    use, which is guessed from the file name when delimiter is None: ','
+    for .csv, tab for .tsv, otherwise any run of whitespace (None).
+    """
+    with open(path, 'rb') as file:
+        compressed = file.read(2) == GZIP_MAGIC
+
+    if compressed:
+        file = gzip.open(path, 'rt', encoding='utf-8', newline='')
+    else:
+        file = open(path, 'r', encoding='utf-8', newline='')
+
+    if delimiter is None:
+        name = os.fspath(path).lower()
+        if name.endswith('.gz'):
+            name = name[:-3]
+        if name.endswith('.csv'):
+            delimiter = ','
+        elif name.endswith('.tsv'):
+            delimiter = '\t'
+
+    return file, delimiter
+
+
+def open_binary_stream(file):
+    """
+    Returns a text stream reading an open binary file, decompressing it if
+    it starts with the gzip magic bytes. The first bytes are peeked, or
+    read and sought back, so nothing is lost from the stream.
+    """
+    if not hasattr(file, 'peek') and not file.seekable():
+        file = io.BufferedReader(file)
+
+    if hasattr(file, 'peek'):
+        compressed = file.peek(2)[:2] == GZIP_MAGIC
+    else:
+        position = file.tell()
+        compressed = file.read(2) == GZIP_MAGIC
+        file.seek(position)
+
+    if compressed:
+        return gzip.open(file, 'rt', encoding='utf-8', newline='')
+    return io.TextIOWrapper(file, encoding='utf-8', newline='')
+
+
+def iter_edge_chunks(source, directed=True, delimiter=None, header=False,
+                     chunk_size=65536, errors='raise', stats=None):
+    """
+    Yields lists of at most chunk_size validated edges read from source,
+    which is a file path, an open text or binary file, or an iterable of
+    edge tuples or text lines.
+
+    Directed edges are (src, dst, weight) tuples of non-negative integer
+    vertices and a finite weight of at least 1 (1 if the column is
+    missing).
+    Undirected edges are (u, v) tuples of vertex names. Extra columns are
+    ignored, and blank lines and lines starting with '#' or '%' are
+    skipped, as is the first line if header is True.
+
+    A malformed line, such as one with a fractional vertex id, raises
+    ValueError if errors is 'raise' and is skipped if errors is 'skip'.
+    Well formed edges that add_edge() would ignore (loops, bad or
+    non-finite weights) are always skipped. Counts are accumulated in the
+    optional stats dictionary under 'lines', 'edges' and 'skipped'.
+    """
+    if errors not in ('raise', 'skip'):
+        raise ValueError(f"errors must be 'raise' or 'skip', not {errors!r}")
+    if stats is None:
+        stats = {}
+    for key in ('lines', 'edges', 'skipped'):
+        stats.setdefault(key, 0)
+
+    file = None
+    if isinstance(source, (str, bytes, os.PathLike)):
+        file, delimiter = open_edge_file(source, delimiter)
+        name = os.fspath(source)
+        rows = _split_lines(file, delimiter)
+    elif hasattr(source, 'read'):
+        name = getattr(source, 'name', '<file>')
+        if not isinstance(source, io.TextIOBase):
+            source = open_binary_stream(source)
+        rows = _split_lines(source, delimiter)
+    else:
+        name = '<iterable>'
+        rows = _iter_rows(source, delimiter)
+
+    parse = _parse_directed if directed else _parse_undirected
+    try:
+        if header and next(rows, None) is not None:
+            stats['lines'] += 1
+
+        while True:
+            chunk = []
+            n_rows = 0
+            for row in islice(rows, chunk_size):
+                n_rows += 1
+                stats['lines'] += 1
+
+                # Check if the row is blank or a comment
+                if len(row) == 0 or (isinstance(row[0], str) and row[0].startswith(COMMENT_PREFIXES)):
+                    continue
+
+                try:
+                    edge = parse(row)
+                except (ValueError, TypeError) as error:
+                    if errors == 'raise':
+                        raise ValueError(f"{name}:{stats['lines']}: {error}") from None
+                    edge = None
+
+                if edge is None:
+                    stats['skipped'] += 1
+                else:
+                    chunk.append(edge)
+                    stats['edges'] += 1
+
+            if len(chunk) > 0:
+                yield chunk
+
+            # Check if the input ran out before the chunk was filled
+            if n_rows < chunk_size:
+                return
+    finally:
+        if file is not None:
+            file.close()
+
+
+def ingest(graph, source, delimiter=None, header=False, chunk_size=65536,
+           errors='raise', progress=None) -> dict:
+    """
+    Streams the edges of source into graph, a DirectedGraph or
+    UndirectedGraph (or a subclass), one chunk at a time through
+    add_edges(). Directed graphs grow to fit the largest vertex seen. See
+    iter_edge_chunks() for the accepted sources and the arguments.
+
+    If given, progress(stats) is called after each chunk. Returns the final
+    stats dictionary with the counts 'lines', 'edges' and 'skipped', the
+    elapsed 'seconds' and the 'edges_per_second' throughput.
+    """
+    stats = {}
+    start = time.perf_counter()
+    chunks = iter_edge_chunks(source, isinstance(graph, DirectedGraph), delimiter,
+                              header, chunk_size, errors, stats)
+
+    for chunk in chunks:
+        graph.add_edges(chunk)
+        _update_rate(stats, start)
+        if progress is not None:
+            progress(stats)
+
+    _update_rate(stats, start)
+    return stats
+
+
+# ---------------------------------------------------------------------- #
+
+def _split_lines(lines, delimiter):
+    """
+    Returns an iterator of the fields of each text line. A delimiter of None
+    splits on whitespace, any other delimiter is read with the csv module so
+    quoted fields may contain it.
+    """
+    if delimiter is None:
+        return (line.split() for line in lines)
+    return csv.reader(lines, delimiter=delimiter)
+
+
+def _iter_rows(items, delimiter):
+    """
+    Yields the fields of each item of an iterable, splitting text lines and
+    passing tuples through unchanged
+    """
+    for item in items:
+        if isinstance(item, str):
+            yield from _split_lines([item], delimiter)
+        else:
+            yield item
+
+
+def _parse_directed(row):
+    """
+    Returns the (src, dst, weight) edge of a row, or None if add_edge()
+    would ignore it. Raises ValueError for a malformed row.
+    """
+    if len(row) < 2:
+        raise ValueError(f"expected src, dst and optional weight, got {list(row)}")
+
+    src, dst = _vertex_id(row[0]), _vertex_id(row[1])
+    weight = _number(row[2]) if len(row) > 2 else 1
+
+    # Check if add_edge() would accept the edge; nan and inf would pass
+    # the weight check but cannot be stored consistently
+    if src < 0 or dst < 0 or src == dst or not math.isfinite(weight) or weight < 1:
+        return None
+    return src, dst, weight
+
+
+def _parse_undirected(row):
+    """
+    Returns the (u, v) edge of a row, or None for a loop. Raises ValueError
+    for a malformed row.
+    """
+    if len(row) < 2:
+        raise ValueError(f"expected two vertices, got {list(row)}")
+
+    u, v = row[0], row[1]
+    if u == v:
+        return None
+    return u, v
+
+
+def _vertex_id(value) -> int:
+    """
+    Returns value as an int vertex id. Raises ValueError if it is not a
+    whole number, rather than truncating it.
+    """
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"vertex id {value!r} is not an integer")
+        return int(value)
+    if isinstance(value, (str, Integral)):
+        return int(value)
+    raise ValueError(f"vertex id {value!r} is not an integer")
+
+
+def _number(value):
+    """
+    Returns value as an int if it is integral, otherwise as a float
+    """
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _update_rate(stats: dict, start: float) -> None:
+    """
+    Stores the elapsed time and edge throughput since start in stats
+    """
+    stats['seconds'] = time.perf_counter() - start
+    stats['edges_per_second'] = stats['edges'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+
+
+if __name__ == '__main__':
+
+    print("\nStreaming ingestion example")
+    print("---------------------------")
+    lines = io.StringIO("# src dst weight\n0 1 10\n4 0 12\n1 4 15\n4 3 3\n"
+                        "3 1 5\n2 1 23\n3 2 7\n3 3 1\n")
+    g = DirectedGraph()
+    print(ingest(g, lines, chunk_size=3, progress=lambda stats: print('  ', stats['edges'])))
+    print(g.get_edges())
+
+    from ud_graph import UndirectedGraph
+    pairs = ((str(i), str((i * 7) % 10)) for i in range(10))
+    u = UndirectedGraph()
+    stats = ingest(u, pairs)
+    print(stats['edges'], stats['skipped'], u.count_connected_components())
@@ -0,0 +1,194 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Binary on-disk format for both graph classes. A file holds a
+#              fixed header followed by CSR arrays (and, for undirected
+#              graphs, a vertex name table), each padded to 8 bytes. Loading
+#              a directed graph into CSRDirectedGraph with mmap=True maps
+#              the arrays straight from the file without copying them, so
+#              several processes can share one page-cached graph.
+#
+#              Layout after the header, in order:
+#              directed:   offsets q[n+1], targets q[m], weights w[m],
+#                          in_offsets q[n+1], sources q[m], in_weights w[m]
+#              undirected: offsets q[n+1], targets i[m],
+#                          name_offsets q[n+1], names (utf-8)
+
+import mmap as _mmap
+import struct
+from array import array
+
+from d_graph import DirectedGraph
+from csr_graph import CSRDirectedGraph
+from ud_graph import UndirectedGraph
+
+MAGIC = b'CSGRAPH1'
+DIRECTED, UNDIRECTED = 0, 1
+
+# magic, kind, weight typecode, vertex count, edge entries, name bytes
+HEADER = struct.Struct('<8sBc6xqqq')
+
+
+def save(graph, path) -> None:
+    """
+    Writes a DirectedGraph or UndirectedGraph (or a subclass) to path
+    """
+    if isinstance(graph, DirectedGraph):
+        header, sections = _directed_sections(graph)
+    elif isinstance(graph, UndirectedGraph):
+        header, sections = _undirected_sections(graph)
+    else:
+        raise TypeError(f"cannot save {type(graph).__name__}")
+
+    with open(path, 'wb') as file:
+        file.write(header)
+        for section in sections:
+            file.write(section)
+            file.write(b'\0' * (-len(section) % 8))
+
+
+def load(path, mmap=True, cls=None):
+    """
+    Reads a graph written by save(). Directed graphs load into cls, which
+    defaults to CSRDirectedGraph; undirected graphs load into cls, which
+    defaults to UndirectedGraph. With mmap=True the file is memory mapped
+    and CSR classes use the mapped arrays directly, otherwise every
+    section is copied into memory. Raises ValueError if cls is not a
+    subclass of the graph class stored in the file.
+    """
+    with open(path, 'rb') as file:
+        if mmap:
+            buffer = memoryview(_mmap.mmap(file.fileno(), 0, access=_mmap.ACCESS_READ))
+        else:
+            buffer = memoryview(file.read())
+
+    magic, kind, typecode, n_vertices, n_entries, name_bytes = \
+        HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a graph file")
+    typecode = typecode.decode()
+
+    # Check if the file holds the kind of graph cls can store
+    if kind not in (DIRECTED, UNDIRECTED):
+        raise ValueError(f"{path} holds an unknown graph kind {kind}")
+    expected = DirectedGraph if kind == DIRECTED else UndirectedGraph
+    if cls is not None and not issubclass(cls, expected):
+        article = 'a directed' if kind == DIRECTED else 'an undirected'
+        raise ValueError(f"{path} holds {article} graph, which cannot be "
+                         f"loaded into {cls.__name__}")
+
+    reader = _SectionReader(buffer, HEADER.size, copy=not mmap)
+
+    if kind == DIRECTED:
+        arrays = (reader.take('q', n_vertices + 1), reader.take('q', n_entries),
+                  reader.take(typecode, n_entries), reader.take('q', n_vertices + 1),
+                  reader.take('q', n_entries), reader.take(typecode, n_entries))
+        return _load_directed(cls or CSRDirectedGraph, typecode, n_vertices, arrays)
+
+    offsets = reader.take('q', n_vertices + 1)
+    targets = reader.take('i', n_entries)
+    name_offsets = reader.take('q', n_vertices + 1)
+    blob = bytes(reader.take('B', name_bytes))
+    names = [blob[name_offsets[v]:name_offsets[v + 1]].decode()
+             for v in range(n_vertices)]
+
+    graph = (cls or UndirectedGraph)()
+    graph._load_rows(names, offsets, targets)
+    return graph
+
+
+# ---------------------------------------------------------------------- #
+
+class _SectionReader:
+    """
+    Reads consecutive 8 byte aligned sections from a buffer, as typed
+    memoryviews or as copied arrays
+    """
+
+    def __init__(self, buffer, position: int, copy: bool):
+        self.buffer = buffer
+        self.position = position
+        self.copy = copy
+
+    def take(self, typecode: str, count: int):
+        """
+        Returns the next section of count items of the given type
+        """
+        size = array(typecode).itemsize * count
+        raw = self.buffer[self.position:self.position + size]
+        self.position += size + (-size % 8)
+
+        if self.copy:
+            section = array(typecode)
+            section.frombytes(raw)
+            return section
+        return raw.cast(typecode)
+
+
+def _directed_sections(graph: DirectedGraph):
+    """
+    Returns the header and sections of a directed graph
+    """
+    typecode = getattr(graph, 'weight_typecode', None)
+    edges = graph.get_edges()
+    if typecode is None:
+        typecode = 'q' if all(isinstance(w, int) for _, _, w in edges) else 'd'
+
+    offsets, targets, weights = array('q', [0]), array('q'), array(typecode)
+    in_offsets, sources, in_weights = array('q', [0]), array('q'), array(typecode)
+
+    for v in range(graph.v_count):
+        for dst, weight in graph._out_edges(v):
+            targets.append(dst)
+            weights.append(weight)
+        offsets.append(len(targets))
+
+        for src, weight in graph._in_edges(v):
+            sources.append(src)
+            in_weights.append(weight)
+        in_offsets.append(len(sources))
+
+    header = HEADER.pack(MAGIC, DIRECTED, typecode.encode(), graph.v_count,
+                         len(targets), 0)
+    sections = [offsets, targets, weights, in_offsets, sources, in_weights]
+    return header, [section.tobytes() for section in sections]
+
+
+def _undirected_sections(graph: UndirectedGraph):
+    """
+    Returns the header and sections of an undirected graph. Vertices are
+    numbered in get_vertices() order and each row keeps the name order of
+    the adjacency list.
+    """
+    names = graph.get_vertices()
+    ids = {name: vid for vid, name in enumerate(names)}
+
+    offsets, targets = array('q', [0]), array('i')
+    name_offsets, blob = array('q', [0]), bytearray()
+
+    for name in names:
+        for neighbor in graph.adj_list[name]:
+            targets.append(ids[neighbor])
+        offsets.append(len(targets))
+
+        blob += name.encode()
+        name_offsets.append(len(blob))
+
+    header = HEADER.pack(MAGIC, UNDIRECTED, b'q', len(names), len(targets), len(blob))
+    return header, [offsets.tobytes(), targets.tobytes(), name_offsets.tobytes(), bytes(blob)]
+
+
+def _load_directed(cls, typecode: str, n_vertices: int, arrays):
+    """
+    Builds a directed graph of class cls from the six CSR sections
+    """
+    if issubclass(cls, CSRDirectedGraph):
+        graph = cls(weight_typecode=typecode)
+        graph._load_arrays(n_vertices, *arrays)
+        return graph
+
+    # Other storage backends are bulk loaded from the edge list
+    offsets, targets, weights = arrays[:3]
+    edges = ((src, targets[index], weights[index])
+             for src in range(n_vertices)
+             for index in range(offsets[src], offsets[src + 1]))
+    return cls.from_edges(edges, n_vertices=n_vertices)
@@ -0,0 +1,463 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Compact storage for the undirected graph. Vertex names are
+#              interned to dense integer ids once, and each adjacency list
+#              is an array('i') of neighbor ids, so large graphs use a
+#              fraction of the memory of lists of name references. The
+#              public API still takes and returns vertex names.
+
+from array import array
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Mapping
+
+from ud_graph import UndirectedGraph
+
+
+class _NeighborView(Mapping):
+    """
+    Read-only {name: [neighbor names]} view of an InternedUndirectedGraph,
+    so code written against UndirectedGraph.adj_list keeps working. Each
+    lookup builds a new list.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, name):
+        graph = self._graph
+        return [graph._names[vid] for vid in graph._adj[graph._ids[name]]]
+
+    def __iter__(self):
+        return iter(self._graph._ids)
+
+    def __len__(self):
+        return len(self._graph._ids)
+
+    def __contains__(self, name):
+        return name in self._graph._ids
+
+
+class InternedUndirectedGraph(UndirectedGraph):
+    """
+    Class to implement undirected graph on interned integer ids
+    - same rules and public API as UndirectedGraph
+    - _ids maps names to ids and _names maps ids back to names; ids of
+      removed vertices are reused
+    - _adj[id] is an array('i') of neighbor ids ordered by neighbor name,
+      so traversals run on int arrays and still visit in lexicographic
+      order
+    - edge lookups binary search the smaller of the two arrays, which
+      costs O(log d) instead of keeping a hash set per vertex
+    - adj_list is a read-only view that builds name lists on demand
+    """
+
+    def __init__(self, start_edges=None):
+        """
+        Store graph info as interned ids and arrays of neighbor ids
+        """
+        self._ids = dict()       # Name to id, in vertex insertion order
+        self._names = []         # Id to name, None for a free id
+        self._adj = []           # Id to array of neighbor ids
+        self._free_ids = []
+        self.adj_list = _NeighborView(self)
+
+        # Union-find index of connected components, indexed by id
+        self._uf_parent = array('i')
+        self._uf_rank = array('b')
+        self._uf_count = 0
+        self._uf_stale = False
+
+        if start_edges is not None:
+            for u, v in start_edges:
+                self.add_edge(u, v)
+
+    # ------------------------------------------------------------------ #
+
+    def add_vertex(self, v: str) -> None:
+        """
+        Adds a new vertex to the graph
+        """
+
+        # Check if vertex already exists
+        if v in self._ids:
+            return  # Do nothing
+
+        # Reuse the id of a removed vertex if there is one
+        if len(self._free_ids) > 0:
+            vid = self._free_ids.pop()
+            self._names[vid] = v
+            self._adj[vid] = array('i')
+        else:
+            vid = len(self._names)
+            self._names.append(v)
+            self._adj.append(array('i'))
+        self._ids[v] = vid
+
+        # The new vertex is a component of its own
+        if not self._uf_stale:
+            if vid == len(self._uf_parent):
+                self._uf_parent.append(vid)
+                self._uf_rank.append(0)
+            else:
+                self._uf_parent[vid] = vid
+                self._uf_rank[vid] = 0
+            self._uf_count += 1
+
+    def add_edge(self, u: str, v: str) -> None:
+        """
+        Adds the given edge to the graph. If either vertex does not exist
+        yet in the graph, the vertex will be created first, then the edge
+        will be created between the two vertices.
+        """
+
+        # Check if u and v refer to same vertex, or the edge already exists
+        if u == v or self.has_edge(u, v):
+            return  # Do nothing
+
+        self.add_vertex(u)
+        self.add_vertex(v)
+        uid, vid = self._ids[u], self._ids[v]
+
+        # Add v and u to each others arrays in name order
+        insort(self._adj[uid], vid, key=self._names.__getitem__)
+        insort(self._adj[vid], uid, key=self._names.__getitem__)
+
+        # Merge the components of u and v
+        if not self._uf_stale:
+            self._union(uid, vid)
+
+    def remove_edge(self, v: str, u: str) -> None:
+        """
+        Removes the given edge from the graph. If either vertices do not
+        exist, or there is no edge between them , then nothing is done.
+        """
+
+        # Check if there is an edge between u and v
+        if not self.has_edge(u, v):
+            return
+
+        uid, vid = self._ids[u], self._ids[v]
+        self._discard_neighbor_id(uid, vid)
+        self._discard_neighbor_id(vid, uid)
+        self._uf_stale = True  # The component may have split
+
+    def remove_vertex(self, v: str) -> None:
+        """
+        Removes the given vertex and all connected edges incident to it.
+        """
+
+        # Check if vertex exists
+        if v not in self._ids:
+            return
+
+        vid = self._ids.pop(v)
+        for neighbor in self._adj[vid]:
+            self._discard_neighbor_id(neighbor, vid)
+
+        # Free the id for reuse
+        self._names[vid] = None
+        self._adj[vid] = array('i')
+        self._free_ids.append(vid)
+        self._uf_stale = True  # The component may have split
+
+    def has_edge(self, u: str, v: str) -> bool:
+        """
+        Returns True if there is an edge between u and v, False otherwise
+        """
+        uid, vid = self._ids.get(u), self._ids.get(v)
+        if uid is None or vid is None:
+            return False
+
+        # Search the shorter of the two neighbor arrays
+        if len(self._adj[uid]) > len(self._adj[vid]):
+            uid, vid = vid, uid
+        neighbors = self._adj[uid]
+        index = bisect_left(neighbors, self._names[vid], key=self._names.__getitem__)
+        return index < len(neighbors) and neighbors[index] == vid
+
+    def _discard_neighbor_id(self, vid: int, uid: int) -> None:
+        """
+        Removes id uid from the neighbor array of id vid
+        """
+        neighbors = self._adj[vid]
+        del neighbors[bisect_left(neighbors, self._names[uid], key=self._names.__getitem__)]
+
+    def get_vertices(self) -> []:
+        """
+        Returns a list of vertices in the graph (any order)
+        """
+        return list(self._ids)
+
+    def iter_edges(self):
+        """
+        Yields each edge in the graph exactly once as a tuple of vertex
+        pairs, in the same order as get_edges(). The graph must not be
+        modified while the generator is in use.
+        """
+        done = bytearray(len(self._names))  # Ids whose edges were yielded
+
+        for name, vid in self._ids.items():
+            for neighbor in self._adj[vid]:
+                if not done[neighbor]:
+                    yield name, self._names[neighbor]
+            done[vid] = 1
+
+    def iter_dfs(self, v_start, with_info=False, stop_when=None):
+        """
+        Yields the vertices of a DFS search as they are visited, in the same
+        order as dfs(). with_info and stop_when work as in
+        UndirectedGraph.iter_dfs().
+        """
+
+        # Check if given start vertex is in graph
+        if v_start not in self._ids:
+            return
+
+        names = self._names
+        seen = bytearray(len(names))
+        stack = [self._ids[v_start]]
+        parents = {stack[0]: None}
+        depths = {}
+
+        # Perform traversal on ids and yield each vertex visited
+        while len(stack) > 0:
+            curr = stack.pop()
+            if seen[curr]:
+                continue
+
+            seen[curr] = 1
+            if with_info:
+                parent = parents[curr]
+                depths[curr] = 0 if parent is None else depths[parent] + 1
+                yield names[curr], depths[curr], None if parent is None else names[parent]
+            else:
+                yield names[curr]
+
+            # Check if the caller wants to stop here
+            if stop_when is not None and stop_when(names[curr]):
+                return
+
+            # Push each adjacent vertex in reverse lexicographical order
+            for neighbor in reversed(self._adj[curr]):
+                if not seen[neighbor]:
+                    stack.append(neighbor)
+                    if with_info:
+                        parents[neighbor] = curr
+
+    def iter_bfs(self, v_start, with_info=False, stop_when=None):
+        """
+        Yields the vertices of a BFS search as they are visited, in the same
+        order as bfs(). with_info and stop_when work as in
+        UndirectedGraph.iter_dfs().
+        """
+
+        # Check if start vertex exists
+        if v_start not in self._ids:
+            return
+
+        names = self._names
+        seen = bytearray(len(names))
+        queue = deque([self._ids[v_start]])
+        seen[queue[0]] = 1
+        parents = {queue[0]: None}
+        depths = {queue[0]: 0}
+
+        # Perform traversal on ids and yield each vertex visited
+        while len(queue) > 0:
+            curr = queue.popleft()
+            if with_info:
+                parent = parents[curr]
+                yield names[curr], depths[curr], None if parent is None else names[parent]
+            else:
+                yield names[curr]
+
+            # Check if the caller wants to stop here
+            if stop_when is not None and stop_when(names[curr]):
+                return
+
+            # Add each adjacent vertex in lexicographical order if not seen
+            for neighbor in self._adj[curr]:
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    queue.append(neighbor)
+                    if with_info:
+                        parents[neighbor] = curr
+                        depths[neighbor] = depths[curr] + 1
+
+    def frontier_bfs(self, sources, max_depth=None) -> ():
+        """
+        Same as UndirectedGraph.frontier_bfs(), with the levels kept in an
+        array indexed by id
+        """
+        hops = array('i', [-1]) * len(self._names)
+        parents = array('i', [-1]) * len(self._names)
+
+        frontier = []
+        for src in sources:
+            vid = self._ids.get(src)
+            if vid is not None and hops[vid] < 0:
+                hops[vid] = 0
+                frontier.append(vid)
+
+        order = list(frontier)  # Reached ids, for building the result
+        depth = 0
+        scanned = 0
+        edge_count = None
+        bottom_up = False
+
+        while len(frontier) > 0 and (max_depth is None or depth < max_depth):
+
+            # Choose the direction of this level as in UndirectedGraph
+            if bottom_up:
+                bottom_up = len(frontier) * self._BFS_BETA >= len(self._ids)
+            elif len(frontier) * self._BFS_ALPHA > len(self._ids) - len(order):
+                if edge_count is None:
+                    edge_count = sum(len(self._adj[vid]) for vid in self._ids.values())
+                frontier_edges = sum(len(self._adj[vid]) for vid in frontier)
+                bottom_up = frontier_edges * self._BFS_ALPHA > edge_count - scanned
+
+            next_frontier = []
+            if bottom_up:
+                scanned += sum(len(self._adj[vid]) for vid in frontier)
+                for vid in self._ids.values():
+                    if hops[vid] >= 0:
+                        continue
+
+                    # Take the first neighbor found in the frontier
+                    for neighbor in self._adj[vid]:
+                        if hops[neighbor] == depth:
+                            hops[vid] = depth + 1
+                            parents[vid] = neighbor
+                            next_frontier.append(vid)
+                            break
+            else:
+                for vid in frontier:
+                    scanned += len(self._adj[vid])
+                    for neighbor in self._adj[vid]:
+                        if hops[neighbor] < 0:
+                            hops[neighbor] = depth + 1
+                            parents[neighbor] = vid
+                            next_frontier.append(neighbor)
+
+            frontier = next_frontier
+            order.extend(frontier)
+            depth += 1
+
+        names = self._names
+        return ({names[vid]: hops[vid] for vid in order},
+                {names[vid]: None if parents[vid] < 0 else names[parents[vid]] for vid in order})
+
+    def connected(self, u: str, v: str) -> bool:
+        """
+        Returns True if u and v are in the same connected component, False
+        otherwise or if either vertex is not in the graph
+        """
+        if u not in self._ids or v not in self._ids:
+            return False
+
+        self._refresh_components()
+        return self._find(self._ids[u]) == self._find(self._ids[v])
+
+    def component_of(self, v: str):
+        """
+        Returns a representative vertex of the connected component of v, or
+        None if v is not in the graph
+        """
+        if v not in self._ids:
+            return None
+
+        self._refresh_components()
+        return self._names[self._find(self._ids[v])]
+
+    def has_cycle(self):
+        """
+        Returns True if graph contains at least one cycle, False otherwise
+        """
+        edge_count = sum(len(self._adj[vid]) for vid in self._ids.values()) // 2
+        return edge_count > len(self._ids) - self.count_connected_components()
+
+    def find_cycle(self) -> []:
+        """
+        Returns a list of vertices that form a cycle, or an empty list if
+        the graph has no cycle. Uses a single DFS with parent tracking.
+        """
+        unvisited, no_parent = -2, -1
+        parents = array('i', [unvisited]) * len(self._names)
+
+        for root in self._ids.values():
+            if parents[root] != unvisited:
+                continue
+
+            parents[root] = no_parent
+            stack = [(root, iter(self._adj[root]))]
+
+            # Perform DFS, keeping the current path on the stack
+            while len(stack) > 0:
+                curr, neighbors = stack[-1]
+                neighbor = next(neighbors, None)
+
+                if neighbor is None:
+                    stack.pop()
+
+                elif parents[neighbor] == unvisited:
+                    parents[neighbor] = curr
+                    stack.append((neighbor, iter(self._adj[neighbor])))
+
+                elif neighbor != parents[curr]:
+
+                    # Walk the tree back up to the ancestor neighbor
+                    cycle = [curr]
+                    while cycle[-1] != neighbor:
+                        cycle.append(parents[cycle[-1]])
+                    cycle.reverse()
+                    return [self._names[vid] for vid in cycle]
+
+        return []
+
+    def _load_rows(self, names: [], offsets, targets) -> None:
+        """
+        Replaces the contents of an empty graph with the given vertices. The
+        file ids are used as interned ids and each row of targets is copied
+        into its neighbor array as it is.
+        """
+        self._names = list(names)
+        self._ids = {name: vid for vid, name in enumerate(names)}
+        self._adj = [array('i', targets[offsets[vid]:offsets[vid + 1]])
+                     for vid in range(len(names))]
+
+        # Components are rebuilt on the first query
+        self._uf_stale = True
+
+    def _refresh_components(self) -> None:
+        """
+        Rebuilds the union-find index from the neighbor arrays if a vertex
+        or edge was removed since it was last built
+        """
+        if not self._uf_stale:
+            return
+
+        self._uf_parent = array('i', range(len(self._names)))
+        self._uf_rank = array('b', [0]) * len(self._names)
+        self._uf_count = len(self._ids)
+
+        for vid in self._ids.values():
+            for neighbor in self._adj[vid]:
+                if neighbor > vid:
+                    self._union(vid, neighbor)
+
+        # Cleared last, so the index is never seen half built
+        self._uf_stale = False
+
+
+if __name__ == '__main__':
+
+    print("\nInterned graph - same API as UndirectedGraph")
+    print("--------------------------------------------")
+    edges = ['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG']
+    g = InternedUndirectedGraph(edges)
+    print(g)
+    print(g.get_edges(), g.get_vertices(), sep='\n')
+    for case in 'ABCDEGH':
+        print(f'{case} DFS:{g.dfs(case)} BFS:{g.bfs(case)}')
+    print(g.count_connected_components(), g.has_cycle(), g.find_cycle())
@@ -0,0 +1,364 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Vectorized engines for the directed graph. NumpyDirectedGraph
+#              keeps the adjacency matrix as a NumPy array, and
+#              SciPyDirectedGraph runs the algorithms of the CSR backend
+#              through scipy.sparse.csgraph. Both keep the DirectedGraph API.
+#              NumPy and SciPy are optional and only needed by these classes.
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse import csgraph
+except ImportError:  # pragma: no cover
+    csr_matrix = csgraph = None
+
+from numbers import Integral
+
+from d_graph import DirectedGraph
+from csr_graph import CSRDirectedGraph
+
+
+def _distance_list(distances, integer_weights: bool) -> []:
+    """
+    Converts an array of distances to the list returned by dijkstra(),
+    with unreachable vertices as float('inf') and integer distances as int
+    when the weights are integers
+    """
+    distances = distances.tolist()
+    if integer_weights:
+        return [dist if dist == float('inf') else int(dist) for dist in distances]
+    return distances
+
+
+class NumpyDirectedGraph(DirectedGraph):
+    """
+    Class to implement directed weighted graph on a NumPy matrix
+    - same rules and public API as DirectedGraph
+    - adj_matrix is a view of the top-left corner of a larger buffer
+      whose capacity doubles when it fills up
+    - suited to small, dense graphs (up to a few thousand vertices)
+    - dtype selects the matrix type ('int64' for integer weights,
+      'float64' for float weights); add_edge() raises TypeError for a
+      weight an integer matrix cannot hold
+    """
+
+    def __init__(self, start_edges=None, dtype='int64'):
+        """
+        Store graph info as a NumPy adjacency matrix
+        """
+        if np is None:
+            raise ImportError("NumpyDirectedGraph requires numpy")
+
+        self._buffer = np.zeros((0, 0), dtype=dtype)
+        super().__init__(start_edges)
+        self.adj_matrix = self._buffer[:self.v_count, :self.v_count]
+
+    # ------------------------------------------------------------------ #
+
+    def get_edges(self) -> []:
+        """
+        Returns a list of edges in the graph in the format (src, dst, weight)
+        """
+        srcs, dsts = np.nonzero(self.adj_matrix)
+        weights = self.adj_matrix[srcs, dsts]
+        return list(zip(srcs.tolist(), dsts.tolist(), weights.tolist()))
+
+    def has_cycle(self):
+        """
+        Returns True if there is at least one cycle in the graph, otherwise
+        returns False. Runs Kahn's Algorithm one layer at a time, with the
+        in-degrees counted as column sums.
+        """
+        in_degrees = np.count_nonzero(self.adj_matrix, axis=0)
+        remaining = np.ones(self.v_count, dtype=bool)
+        frontier = np.flatnonzero(in_degrees == 0)
+        visited_count = 0
+
+        # Remove every vertex with no incoming edges at once
+        while frontier.size > 0:
+            visited_count += frontier.size
+            remaining[frontier] = False
+            in_degrees -= np.count_nonzero(self.adj_matrix[frontier], axis=0)
+            frontier = np.flatnonzero((in_degrees == 0) & remaining)
+
+        return visited_count != self.v_count
+
+    def dijkstra(self, src: int) -> []:
+        """
+        Uses the dense O(V^2) form of Dijkstra's Algorithm, relaxing a whole
+        matrix row per step, to find the shortest path from the given source
+        vertex to each vertex in the graph. Unreachable vertices are 'inf'.
+        """
+        distances = np.full(self.v_count, np.inf)
+        settled = np.zeros(self.v_count, dtype=bool)
+        distances[src] = 0
+
+        for _ in range(self.v_count):
+
+            # Pick the closest unsettled vertex
+            curr_vertex = np.where(settled, np.inf, distances).argmin()
+            if settled[curr_vertex] or distances[curr_vertex] == np.inf:
+                break
+            settled[curr_vertex] = True
+
+            # Relax every outgoing edge of the vertex
+            row = self.adj_matrix[curr_vertex]
+            candidates = np.where(row > 0, distances[curr_vertex] + row, np.inf)
+            np.minimum(distances, candidates, out=distances)
+
+        integer_weights = np.issubdtype(self._buffer.dtype, np.integer)
+        return _distance_list(distances, integer_weights)
+
+    # ------------------------------------------------------------------ #
+    # Storage primitives used by DirectedGraph
+
+    def _append_vertex(self) -> None:
+        """
+        Adds vertex number v_count to the matrix view, growing the buffer by
+        doubling its capacity when it is full
+        """
+        capacity = self._buffer.shape[0]
+        if self.v_count == capacity:
+            capacity = max(16, 2 * capacity)
+            buffer = np.zeros((capacity, capacity), dtype=self._buffer.dtype)
+            buffer[:self.v_count, :self.v_count] = self.adj_matrix
+            self._buffer = buffer
+
+        self.adj_matrix = self._buffer[:self.v_count + 1, :self.v_count + 1]
+
+    def _bulk_load(self, n_vertices: int, edges) -> None:
+        """
+        Replaces the contents of an empty graph with n_vertices vertices and
+        the given edges. Invalid edges are skipped and a repeated edge keeps
+        its last weight, like add_edge().
+        """
+        latest = {}
+        for src, dst, weight in edges:
+            if 0 <= src < n_vertices and 0 <= dst < n_vertices \
+                    and src != dst and weight >= 1:
+                self._check_weight(weight)
+                latest[(src, dst)] = weight
+
+        self._buffer = np.zeros((n_vertices, n_vertices), dtype=self._buffer.dtype)
+        if len(latest) > 0:
+            index = np.array(list(latest.keys()))
+            self._buffer[index[:, 0], index[:, 1]] = list(latest.values())
+
+        self.v_count = n_vertices
+        self.adj_matrix = self._buffer[:n_vertices, :n_vertices]
+
+    def _edge_weight(self, src: int, dst: int):
+        """
+        Returns the weight of the edge from src to dst, or 0 if there is no
+        such edge
+        """
+        return self.adj_matrix[src, dst].item()
+
+    def _store_edge(self, src: int, dst: int, weight) -> None:
+        """
+        Sets the weight of the edge from src to dst. A weight of 0 removes
+        the edge.
+        """
+        self._check_weight(weight)
+        self.adj_matrix[src, dst] = weight
+
+    def _check_weight(self, weight) -> None:
+        """
+        Raises TypeError if an integer matrix would truncate the weight
+        """
+        if self._buffer.dtype.kind in 'iu' and not isinstance(weight, Integral):
+            raise TypeError(f"weight {weight!r} does not fit dtype "
+                            f"{self._buffer.dtype.name!r}; use dtype='float64'")
+
+    def _out_edges(self, src: int) -> []:
+        """
+        Returns a list of (dst, weight) pairs for each edge leaving the given
+        vertex, in ascending order of dst
+        """
+        row = self.adj_matrix[src]
+        dsts = np.flatnonzero(row)
+        return list(zip(dsts.tolist(), row[dsts].tolist()))
+
+    def _in_edges(self, dst: int) -> []:
+        """
+        Returns a list of (src, weight) pairs for each edge entering the
+        given vertex, in ascending order of src
+        """
+        col = self.adj_matrix[:, dst]
+        srcs = np.flatnonzero(col)
+        return list(zip(srcs.tolist(), col[srcs].tolist()))
+
+    def _out_degree(self, src: int) -> int:
+        """
+        Returns the number of edges leaving the given vertex
+        """
+        return int(np.count_nonzero(self.adj_matrix[src]))
+
+    def _iter_out_edges(self, src: int):
+        """
+        Returns the (dst, weight) pairs of _out_edges(), which are already
+        in order at no extra cost
+        """
+        return self._out_edges(src)
+
+    def _iter_in_edges(self, dst: int):
+        """
+        Returns the (src, weight) pairs of _in_edges(), which are already
+        in order at no extra cost
+        """
+        return self._in_edges(dst)
+
+    def _in_degree(self, dst: int) -> int:
+        """
+        Returns the number of edges entering the given vertex
+        """
+        return int(np.count_nonzero(self.adj_matrix[:, dst]))
+
+
+class SciPyDirectedGraph(CSRDirectedGraph):
+    """
+    Class to implement directed weighted graph on CSR arrays whose
+    traversals and shortest paths run in scipy.sparse.csgraph
+    - same rules and public API as DirectedGraph
+    - the scipy matrix is built from the compacted arrays on first use
+      after a change, so it suits large, sparse, read-mostly graphs
+    """
+
+    def __init__(self, start_edges=None, weight_typecode='q',
+                 compact_ratio=0.125, min_compact=1024):
+        """
+        Store graph info as CSR arrays with a cached scipy matrix
+        """
+        if csgraph is None:
+            raise ImportError("SciPyDirectedGraph requires numpy and scipy")
+
+        self._matrix = None
+        super().__init__(start_edges, weight_typecode, compact_ratio, min_compact)
+
+    # ------------------------------------------------------------------ #
+
+    def dfs(self, v_start, v_end=None) -> []:
+        """
+        Returns a list of vertices in the order they are visited in a
+        DFS traversal from the given start vertex to the optional given
+        end vertex. Vertices are explored in ascending order if a choice
+        must be made about which vertex to explore next.
+        """
+        if v_start < 0 or v_start >= self.v_count:
+            return []
+
+        order = csgraph.depth_first_order(self._csgraph(), v_start,
+                                          return_predecessors=False)
+        return self._until(order.tolist(), v_end)
+
+    def bfs(self, v_start, v_end=None) -> []:
+        """
+        Returns a list of vertices in the order they are visited in a
+        BFS traversal from the given start vertex to the optional given
+        end vertex. Vertices are explored in ascending order if a choice
+        must be made about which vertex to explore next.
+        """
+        if v_start < 0 or v_start >= self.v_count:
+            return []
+
+        order = csgraph.breadth_first_order(self._csgraph(), v_start,
+                                            return_predecessors=False)
+        return self._until(order.tolist(), v_end)
+
+    def has_cycle(self):
+        """
+        Returns True if there is at least one cycle in the graph, otherwise
+        returns False. Since loops are not allowed, the graph has a cycle
+        exactly when some strongly connected component has two or more
+        vertices.
+        """
+        if self.v_count == 0:
+            return False
+
+        n_components, _ = csgraph.connected_components(
+            self._csgraph(), directed=True, connection='strong')
+        return n_components != self.v_count
+
+    def dijkstra(self, src: int) -> []:
+        """
+        Uses scipy's Dijkstra's Algorithm to find and return the shortest
+        path from the given source vertex to each vertex in the graph.
+        Unreachable vertices are marked as 'inf'.
+        """
+        distances = csgraph.dijkstra(self._csgraph(), directed=True, indices=src)
+        return _distance_list(distances, self.weight_typecode != 'd')
+
+    # ------------------------------------------------------------------ #
+
+    def _csgraph(self):
+        """
+        Returns the graph as a scipy CSR matrix, compacting the delta buffer
+        and rebuilding the matrix if the graph changed since the last call
+        """
+        if self._matrix is None:
+            self.compact()
+            self._matrix = csr_matrix(
+                (np.array(self.weights), np.array(self.targets),
+                 np.array(self.offsets)),
+                shape=(self.v_count, self.v_count))
+        return self._matrix
+
+    @staticmethod
+    def _until(order: [], v_end) -> []:
+        """
+        Returns the prefix of a visiting order that ends at v_end, or the
+        whole order if v_end is not in it
+        """
+        if v_end in order:
+            return order[:order.index(v_end) + 1]
+        return order
+
+    def _append_vertex(self) -> None:
+        """
+        Adds an empty row for vertex number v_count and drops the cached
+        matrix
+        """
+        self._matrix = None
+        super()._append_vertex()
+
+    def _bulk_load(self, n_vertices: int, edges) -> None:
+        """
+        Replaces the contents of an empty graph and drops the cached matrix
+        """
+        self._matrix = None
+        super()._bulk_load(n_vertices, edges)
+
+    def _load_arrays(self, n_vertices: int, *arrays) -> None:
+        """
+        Replaces the contents of an empty graph with ready-made CSR arrays
+        and drops the cached matrix
+        """
+        self._matrix = None
+        super()._load_arrays(n_vertices, *arrays)
+
+    def _store_edge(self, src: int, dst: int, weight) -> None:
+        """
+        Records an edge weight and drops the cached matrix
+        """
+        self._matrix = None
+        super()._store_edge(src, dst, weight)
+
+
+if __name__ == '__main__':
+
+    print("\nNumPy - same API as DirectedGraph")
+    print("---------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    for cls in (NumpyDirectedGraph, SciPyDirectedGraph):
+        g = cls(edges)
+        print(cls.__name__, g.get_edges(), g.has_cycle(), sep='\n')
+        for start in range(5):
+            print(f'{start} DFS:{g.dfs(start)} BFS:{g.bfs(start)}')
+        for i in range(5):
+            print(f'DIJKSTRA {i} {g.dijkstra(i)}')
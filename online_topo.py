@@ -0,0 +1,216 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Online topological order for a DirectedGraph, maintained with
+#              the Pearce-Kelly algorithm as edges are added, so cycle
+#              checks after each edit only look at the vertices whose
+#              relative order is affected.
+
+from collections import deque
+
+from d_graph import DirectedGraph
+
+
+class OnlineTopologicalOrder:
+    """
+    Class to maintain a topological order of a DirectedGraph
+    - observes the graph, so every add_edge / remove_edge / add_vertex is
+      applied to the order as it happens
+    - an added edge that already agrees with the order costs O(1); any
+      other edge only reorders the vertices between its endpoints
+    - removing an edge never breaks a topological order, but it may make
+      a cyclic graph acyclic again, in which case the order is rebuilt
+      with Kahn's Algorithm on the next query
+    """
+
+    def __init__(self, graph: DirectedGraph):
+        """
+        Compute the order of the given graph and start observing it
+        """
+        self.graph = graph
+        self._rebuild()
+        graph.subscribe(self)
+
+    def close(self) -> None:
+        """
+        Stops observing the graph
+        """
+        self.graph.unsubscribe(self)
+
+    def has_cycle(self) -> bool:
+        """
+        Returns True if the graph has at least one cycle, False otherwise
+        """
+        self._refresh()
+        return self._order is None
+
+    def topological_order(self):
+        """
+        Returns a list of all vertices such that every edge goes from an
+        earlier vertex to a later one, or None if the graph has a cycle
+        """
+        self._refresh()
+        if self._order is None:
+            return None
+        return list(self._order)
+
+    def creates_cycle(self, src: int, dst: int) -> bool:
+        """
+        Returns True if adding the edge src -> dst would leave the graph
+        with a cycle, False otherwise. Both vertices must be in the graph.
+        """
+        self._refresh()
+        if self._order is None:
+            return True
+
+        # Loops are never added by add_edge(), and edges that agree with
+        # the order can never close a cycle
+        if src == dst or self._position[src] < self._position[dst]:
+            return False
+
+        # Otherwise there is a cycle exactly when src is reachable from dst
+        return src in self._reach_forward(dst, self._position[src])
+
+    def try_add_edge(self, src: int, dst: int, weight=1) -> bool:
+        """
+        Adds the edge to the graph unless it would create a cycle. Returns
+        True if the edge was passed to add_edge(), False if it was rejected.
+        """
+        if self.creates_cycle(src, dst):
+            return False
+
+        self.graph.add_edge(src, dst, weight)
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Graph observer methods
+
+    def vertex_added(self, graph: DirectedGraph, v: int) -> None:
+        """
+        A new vertex has no edges, so it can go at the end of the order
+        """
+        if self._order is not None:
+            self._position.append(len(self._order))
+            self._order.append(v)
+
+    def edge_changed(self, graph: DirectedGraph, src: int, dst: int,
+                     old_weight, new_weight) -> None:
+        """
+        Updates the order after the edge src -> dst was added or removed.
+        Weight changes of an existing edge do not affect the order.
+        """
+        if new_weight == 0:
+
+            # A removal can only matter if it breaks the last cycle
+            if self._order is None:
+                self._stale = True
+
+        elif old_weight == 0 and self._order is not None:
+            if self._position[src] > self._position[dst]:
+                self._reorder(src, dst)
+
+    # ------------------------------------------------------------------ #
+
+    def _reorder(self, src: int, dst: int) -> None:
+        """
+        Pearce-Kelly update for a new edge src -> dst with dst currently
+        before src. The vertices between them that are reachable from dst,
+        or that reach src, are moved so that the latter come first.
+        """
+        lower, upper = self._position[dst], self._position[src]
+
+        forward = self._reach_forward(dst, upper)
+        if src in forward:
+            self._order = None  # The new edge closed a cycle
+            return
+
+        backward = self._reach_backward(src, lower)
+
+        # Reuse the same positions, giving the first ones to the vertices
+        # that must come before the new edge
+        by_position = lambda vertex: self._position[vertex]
+        moved = sorted(backward, key=by_position) + sorted(forward, key=by_position)
+        positions = sorted(self._position[vertex] for vertex in moved)
+
+        for vertex, position in zip(moved, positions):
+            self._position[vertex] = position
+            self._order[position] = vertex
+
+    def _reach_forward(self, start: int, upper: int) -> set:
+        """
+        Returns the vertices reachable from start without passing any
+        vertex positioned after upper
+        """
+        reached = {start}
+        stack = [start]
+        while len(stack) > 0:
+            vertex = stack.pop()
+            for successor in self.graph.successors(vertex):
+                if successor not in reached and self._position[successor] <= upper:
+                    reached.add(successor)
+                    stack.append(successor)
+        return reached
+
+    def _reach_backward(self, start: int, lower: int) -> set:
+        """
+        Returns the vertices that reach start without passing any vertex
+        positioned before lower
+        """
+        reached = {start}
+        stack = [start]
+        while len(stack) > 0:
+            vertex = stack.pop()
+            for predecessor in self.graph.predecessors(vertex):
+                if predecessor not in reached and self._position[predecessor] >= lower:
+                    reached.add(predecessor)
+                    stack.append(predecessor)
+        return reached
+
+    def _refresh(self) -> None:
+        """
+        Rebuilds the order if an edge removal may have broken every cycle
+        """
+        if self._stale:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """
+        Computes the order from scratch with Kahn's Algorithm, or marks the
+        graph as cyclic
+        """
+        in_degrees = [self.graph._in_degree(v) for v in range(self.graph.v_count)]
+        queue = deque(v for v in range(self.graph.v_count) if in_degrees[v] == 0)
+        order = []
+
+        while len(queue) > 0:
+            vertex = queue.popleft()
+            order.append(vertex)
+
+            for successor in self.graph.successors(vertex):
+                in_degrees[successor] -= 1
+                if in_degrees[successor] == 0:
+                    queue.append(successor)
+
+        self._stale = False
+        if len(order) != self.graph.v_count:
+            self._order = self._position = None
+            return
+
+        self._order = order
+        self._position = [0] * len(order)
+        for position, vertex in enumerate(order):
+            self._position[vertex] = position
+
+
+if __name__ == '__main__':
+
+    print("\nOnlineTopologicalOrder example")
+    print("------------------------------")
+    g = DirectedGraph([(0, 1, 1), (1, 2, 1), (3, 4, 1)])
+    topo = OnlineTopologicalOrder(g)
+    print(topo.topological_order())
+    for src, dst in ((4, 0), (2, 3), (4, 1), (2, 4)):
+        print(f'add {src}->{dst}', topo.try_add_edge(src, dst), topo.topological_order())
+    g.add_edge(4, 3)
+    print('forced 4->3', topo.has_cycle(), topo.topological_order())
+    g.remove_edge(3, 4)
+    print('removed 3->4', topo.has_cycle(), topo.topological_order())
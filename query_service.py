@@ -0,0 +1,399 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Asyncio front-end that serves dijkstra, bfs and is_valid_path
+#              queries for many concurrent clients. Concurrent requests for
+#              the same query share one computation, queries that arrive
+#              close together are sent to a worker pool as one batch, and
+#              the latency of every request is recorded in a histogram.
+
+import asyncio
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+
+import graph_file
+from apsp import SharedGraph
+
+# Methods answered by the worker pool
+POOL_METHODS = ('dijkstra', 'bfs')
+
+# State of a worker process, set by _init_worker()
+_worker_graph = None
+
+
+class LatencyHistogram:
+    """
+    Counts latencies in buckets whose upper bounds double from 50
+    microseconds to about 6.5 seconds, plus one bucket for anything slower
+    """
+
+    BOUNDS = tuple(0.00005 * 2 ** i for i in range(18))
+
+    def __init__(self):
+        """
+        Start with every bucket empty
+        """
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Adds one latency to the histogram
+        """
+        self.counts[bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> float:
+        """
+        Returns an upper bound on the p-th percentile latency (0 < p <= 100),
+        the upper bound of the bucket that holds it, or 0.0 if nothing was
+        recorded
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count > 0:
+                break
+
+        if bucket == len(self.BOUNDS):
+            return self.max
+        return min(self.BOUNDS[bucket], self.max)
+
+    def summary(self) -> dict:
+        """
+        Returns the count, mean, max and p50/p90/p99 latencies in seconds,
+        and the non-empty buckets as (upper bound, count) pairs
+        """
+        bounds = self.BOUNDS + (float('inf'),)
+        return {'count': self.count,
+                'mean': self.total / self.count if self.count > 0 else 0.0,
+                'max': self.max,
+                'p50': self.percentile(50),
+                'p90': self.percentile(90),
+                'p99': self.percentile(99),
+                'buckets': [(bound, count) for bound, count in zip(bounds, self.counts)
+                            if count > 0]}
+
+
+class QueryService:
+    """
+    Asyncio service answering queries on a DirectedGraph or UndirectedGraph
+    (or a subclass)
+    - dijkstra() and bfs() run on a pool of worker threads, or of worker
+      processes if processes is True
+    - requests for the same query that arrive while it is queued or
+      running share its result (request coalescing)
+    - queries are held for up to batch_window seconds, or until max_batch
+      of one method are waiting, and sent to the pool as one task
+      (micro-batching)
+    - is_valid_path() is cheap, so it is answered on the event loop
+    - stats() returns a latency histogram summary per method
+
+    Thread workers query graph.snapshot() when the graph has one (see
+    concurrent_graph.py), otherwise the graph itself, which must then not
+    be changed while the service runs. Process workers memory map a copy of
+    the graph written by start(); call reload() to serve later edits.
+    Use the service as an async context manager, or call start() and
+    close().
+    """
+
+    def __init__(self, graph, workers=None, processes=False,
+                 batch_window=0.001, max_batch=64):
+        """
+        Set up the service. No workers are started until start().
+        """
+        self.graph = graph
+        self.workers = workers
+        self.processes = processes
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+
+        self._executor = None
+        self._resources = None
+        self._inflight = {}   # {(method, args): future shared by callers}
+        self._batches = {}    # {method: [args waiting to be sent]}
+        self._timers = {}     # {method: handle of the pending flush}
+        self._histograms = {method: LatencyHistogram()
+                            for method in POOL_METHODS + ('is_valid_path',)}
+        self._coalesced = dict.fromkeys(self._histograms, 0)
+        self._batch_counts = dict.fromkeys(POOL_METHODS, 0)
+
+    async def __aenter__(self):
+        """
+        Starts the service for an async with block
+        """
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """
+        Closes the service at the end of an async with block
+        """
+        await self.close()
+
+    # ------------------------------------------------------------------ #
+
+    async def start(self) -> None:
+        """
+        Starts the worker pool
+        """
+        self._resources = ExitStack()
+        if self.processes:
+            path = self._resources.enter_context(SharedGraph(self.graph))
+            self._executor = self._resources.enter_context(
+                ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                    initargs=(path,)))
+        else:
+            self._executor = self._resources.enter_context(
+                ThreadPoolExecutor(self.workers))
+
+    async def close(self) -> None:
+        """
+        Sends the queued queries, waits for every query to finish and stops
+        the worker pool
+        """
+        for method in list(self._batches):
+            self._flush(method)
+        if len(self._inflight) > 0:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
+        if self._resources is not None:
+            self._resources.close()
+        self._executor = self._resources = None
+
+    async def reload(self) -> None:
+        """
+        Restarts the worker pool so that process workers see the current
+        graph
+        """
+        await self.close()
+        await self.start()
+
+    def stats(self) -> dict:
+        """
+        Returns {method: summary} with the LatencyHistogram summary of each
+        method, plus the number of requests that shared another request's
+        result ('coalesced') and of batches sent to the pool ('batches')
+        """
+        return {method: dict(histogram.summary(),
+                             coalesced=self._coalesced[method],
+                             batches=self._batch_counts.get(method, 0))
+                for method, histogram in self._histograms.items()}
+
+    # ------------------------------------------------------------------ #
+
+    async def dijkstra(self, src) -> []:
+        """
+        Returns graph.dijkstra(src)
+        """
+        if not hasattr(self.graph, 'dijkstra'):
+            raise TypeError(f"{type(self.graph).__name__} has no dijkstra()")
+        return await self._query('dijkstra', (src,))
+
+    async def bfs(self, v_start, v_end=None) -> []:
+        """
+        Returns graph.bfs(v_start, v_end)
+        """
+        return await self._query('bfs', (v_start, v_end))
+
+    async def is_valid_path(self, path: []) -> bool:
+        """
+        Returns graph.is_valid_path(path)
+        """
+        start = time.perf_counter()
+        try:
+            return self._target().is_valid_path(path)
+        finally:
+            self._histograms['is_valid_path'].record(time.perf_counter() - start)
+
+    # ------------------------------------------------------------------ #
+
+    async def _query(self, method: str, args: ()) -> []:
+        """
+        Returns the result of a pool method, sharing the computation with
+        any identical query in flight. Every caller gets its own copy of
+        the result list.
+        """
+        if self._executor is None:
+            raise RuntimeError("the service is not started")
+
+        start = time.perf_counter()
+        try:
+            # A cancelled caller must not cancel the shared computation
+            result = await asyncio.shield(self._enqueue(method, args))
+        finally:
+            self._histograms[method].record(time.perf_counter() - start)
+        return list(result)
+
+    def _enqueue(self, method: str, args: ()):
+        """
+        Returns the future of a query, adding the query to the batch of its
+        method unless the same query is already in flight
+        """
+        key = (method, args)
+        future = self._inflight.get(key)
+        if future is not None:
+            self._coalesced[method] += 1
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+
+        batch = self._batches.setdefault(method, [])
+        batch.append(args)
+
+        # Send a full batch now, otherwise when the window closes
+        if len(batch) >= self.max_batch:
+            self._flush(method)
+        elif len(batch) == 1:
+            self._timers[method] = loop.call_later(self.batch_window, self._flush, method)
+        return future
+
+    def _flush(self, method: str) -> None:
+        """
+        Sends the waiting queries of a method to the pool as one task
+        """
+        timer = self._timers.pop(method, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._batches.pop(method, [])
+        if len(batch) == 0:
+            return
+
+        self._batch_counts[method] += 1
+        task = asyncio.get_running_loop().run_in_executor(
+            self._executor, _run_queries, self._pool_target(), method, batch)
+        task.add_done_callback(lambda done: self._resolve(method, batch, done))
+
+    def _resolve(self, method: str, batch: [], done) -> None:
+        """
+        Passes the results of a finished batch to the futures of its queries
+        """
+        error = done.exception()
+        results = done.result() if error is None else [error] * len(batch)
+
+        for args, result in zip(batch, results):
+            future = self._inflight.pop((method, args))
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _target(self):
+        """
+        Returns the graph to query in this process
+        """
+        snapshot = getattr(self.graph, 'snapshot', None)
+        return self.graph if snapshot is None else snapshot()
+
+    def _pool_target(self):
+        """
+        Returns the graph to pass to the pool, or None for process workers,
+        which use their own mapped copy
+        """
+        return None if self.processes else self._target()
+
+
+class LocalClient:
+    """
+    In-process stand-in for a network client of a QueryService, for tests
+    and load generation
+    """
+
+    def __init__(self, service: QueryService):
+        """
+        Connect the client to a started service
+        """
+        self.service = service
+
+    async def dijkstra(self, src) -> []:
+        """
+        Returns the shortest path distances from src
+        """
+        return await self.service.dijkstra(src)
+
+    async def bfs(self, v_start, v_end=None) -> []:
+        """
+        Returns the BFS visiting order from v_start to the optional v_end
+        """
+        return await self.service.bfs(v_start, v_end)
+
+    async def is_valid_path(self, path: []) -> bool:
+        """
+        Returns True if path is a valid path in the graph
+        """
+        return await self.service.is_valid_path(path)
+
+    async def run(self, queries) -> []:
+        """
+        Sends every (method name, args) query at once, like many clients
+        connecting together, and returns the results in order. A failed
+        query returns its exception instead of raising it.
+        """
+        return await asyncio.gather(
+            *(getattr(self, method)(*args) for method, args in queries),
+            return_exceptions=True)
+
+
+# ---------------------------------------------------------------------- #
+
+def _init_worker(graph_path) -> None:
+    """
+    Maps the shared graph file once per worker process
+    """
+    global _worker_graph
+    _worker_graph = graph_file.load(graph_path, mmap=True)
+
+
+def _run_queries(graph, method: str, batch: []) -> []:
+    """
+    Runs a method of the graph (the worker's mapped graph if graph is None)
+    with each args tuple of a batch. A query that raises returns its
+    exception so the rest of the batch still gets answered.
+    """
+    if graph is None:
+        graph = _worker_graph
+
+    func = getattr(graph, method)
+    results = []
+    for args in batch:
+        try:
+            results.append(func(*args))
+        except Exception as error:
+            results.append(error)
+    return results
+
+
+if __name__ == '__main__':
+
+    from d_graph import DirectedGraph
+
+    async def main():
+        edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+                 (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+        async with QueryService(DirectedGraph(edges)) as service:
+            client = LocalClient(service)
+            queries = [('dijkstra', (i % 5,)) for i in range(20)]
+            queries += [('bfs', (0,)), ('is_valid_path', ([0, 1, 4],))]
+            results = await client.run(queries)
+            for result in results[-3:]:
+                print(result)
+            stats = service.stats()['dijkstra']
+            print(stats['count'], stats['coalesced'], stats['batches'])
+
+    print("\nQuery service example")
+    print("---------------------")
+    asyncio.run(main())
@@ -0,0 +1,214 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Least recently used cache of single-source shortest path
+#              results for a DirectedGraph. Entries are stamped with the
+#              graph version, and edits that cannot change a cached result
+#              carry the entry forward instead of evicting it.
+
+import sys
+from collections import OrderedDict
+
+from d_graph import DirectedGraph
+
+
+class ShortestPathCache:
+    """
+    Class to cache dijkstra() results of a DirectedGraph
+    - entries are keyed on source vertex and only served while their
+      version matches graph.version
+    - the cache observes the graph, and after each edit it re-stamps the
+      entries whose shortest path tree the edit cannot affect, and drops
+      the rest
+    - total entry size is kept under max_bytes by evicting the least
+      recently used entries
+    """
+
+    def __init__(self, graph: DirectedGraph, max_bytes=64 * 1024 * 1024):
+        """
+        Create an empty cache attached to the given graph
+        """
+        self.graph = graph
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+
+        # {src: [version, distances, parents, size]} in least to most
+        # recently used order
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0       # Entries dropped to stay under max_bytes
+        self.invalidations = 0   # Entries dropped because of an edit
+
+        graph.subscribe(self)
+
+    def close(self) -> None:
+        """
+        Detaches the cache from its graph and empties it
+        """
+        self.graph.unsubscribe(self)
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache
+        """
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters as a dictionary
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'invalidations': self.invalidations,
+                'entries': len(self._entries), 'size_bytes': self.size_bytes}
+
+    # ------------------------------------------------------------------ #
+
+    def dijkstra(self, src: int) -> []:
+        """
+        Returns the same list as graph.dijkstra(src), from the cache when
+        possible
+        """
+        distances, _ = self._lookup(src)
+        return list(distances)
+
+    def shortest_path(self, src: int, dst: int) -> ():
+        """
+        Returns the same (distance, path) tuple as graph.shortest_path(),
+        read from the cached shortest path tree of src
+        """
+        if not 0 <= src < self.graph.v_count or not 0 <= dst < self.graph.v_count:
+            return float('inf'), []
+
+        distances, parents = self._lookup(src)
+        if distances[dst] == float('inf'):
+            return float('inf'), []
+
+        return distances[dst], DirectedGraph._trace_path(parents, dst)
+
+    def _lookup(self, src: int) -> ():
+        """
+        Returns the cached (distances, parents) of src, computing and storing
+        them on a miss
+        """
+        entry = self._entries.get(src)
+        if entry is not None and entry[0] == self.graph.version:
+            self.hits += 1
+            self._entries.move_to_end(src)
+            return entry[1], entry[2]
+
+        self.misses += 1
+        if entry is not None:
+            self._drop(src)
+
+        distances, parents = self.graph.shortest_path_tree(src)
+        size = self._entry_size(distances, parents)
+
+        # Results too large for the cache are returned without storing them
+        if size <= self.max_bytes:
+            self._entries[src] = [self.graph.version, distances, parents, size]
+            self.size_bytes += size
+            self._evict()
+
+        return distances, parents
+
+    @staticmethod
+    def _entry_size(distances: [], parents: []) -> int:
+        """
+        Returns the bytes held by a cached result, counting both lists and
+        every number object in them. Objects shared with the rest of the
+        program (small ints, a repeated inf) are counted each time they
+        appear, so the estimate errs on the high side.
+        """
+        size = sys.getsizeof(distances) + sys.getsizeof(parents)
+        size += sum(map(sys.getsizeof, distances))
+        size += sum(sys.getsizeof(parent) for parent in parents if parent is not None)
+        return size
+
+    def _evict(self) -> None:
+        """
+        Drops least recently used entries until the cache fits in max_bytes
+        """
+        while self.size_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, src: int) -> None:
+        """
+        Removes the entry of src from the cache
+        """
+        self.size_bytes -= self._entries.pop(src)[3]
+
+    # ------------------------------------------------------------------ #
+    # Graph observer methods
+
+    def vertex_added(self, graph: DirectedGraph, v: int) -> None:
+        """
+        A new vertex is unreachable from every source, so each current
+        entry is extended with one more unreachable vertex
+        """
+        for entry in self._entries.values():
+            if entry[0] == graph.version - 1:
+                distances, parents = entry[1], entry[2]
+                old_size = sys.getsizeof(distances) + sys.getsizeof(parents)
+
+                entry[0] = graph.version
+                distances.append(float('inf'))
+                parents.append(None)
+
+                # The lists may have grown, and they hold one more float
+                growth = sys.getsizeof(distances) + sys.getsizeof(parents) - old_size \
+                    + sys.getsizeof(distances[-1])
+                entry[3] += growth
+                self.size_bytes += growth
+
+        self._evict()
+
+    def edge_changed(self, graph: DirectedGraph, src: int, dst: int,
+                     old_weight, new_weight) -> None:
+        """
+        Keeps each current entry whose shortest path tree is unaffected by
+        the edge change and drops the others
+        """
+        for source in list(self._entries):
+            entry = self._entries[source]
+            if entry[0] != graph.version - 1:
+                continue
+
+            distances, parents = entry[1], entry[2]
+            if new_weight == 0 or (old_weight > 0 and new_weight > old_weight):
+
+                # A longer or removed edge only matters if the tree uses it
+                unaffected = parents[dst] != src
+            else:
+
+                # A new or shorter edge only matters if it gives dst a
+                # strictly shorter distance
+                unaffected = distances[src] + new_weight >= distances[dst]
+
+            if unaffected:
+                entry[0] = graph.version
+            else:
+                self._drop(source)
+                self.invalidations += 1
+
+
+if __name__ == '__main__':
+
+    print("\nShortestPathCache example")
+    print("-------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    cache = ShortestPathCache(g)
+    for i in range(5):
+        print(f'DIJKSTRA {i} {cache.dijkstra(i)}')
+    g.add_edge(2, 1, 30)   # Longer edge, only trees that use it are dropped
+    g.add_edge(0, 2, 40)   # New edge that shortens no path, nothing dropped
+    g.remove_edge(4, 3)    # Removed edge, only trees that use it are dropped
+    for i in range(5):
+        print(f'DIJKSTRA {i} {cache.dijkstra(i)}')
+    print(cache.stats())
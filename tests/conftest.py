@@ -0,0 +1,9 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Shared pytest setup. The graph modules live at the top of the
+#              repository, so it is put on the import path here.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,40 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Graphs and checks shared by the test modules. The demo edge
+#              lists are the examples of d_graph.py and ud_graph.py, and the
+#              assert_same_* helpers compare a graph class against the
+#              original DirectedGraph or UndirectedGraph.
+
+DIRECTED_EDGES = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+                  (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+UNDIRECTED_EDGES = ['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG']
+
+
+def assert_same_directed(graph, reference):
+    """
+    Checks that a directed graph answers every query like the reference
+    """
+    assert graph.v_count == reference.v_count
+    assert sorted(graph.get_edges()) == sorted(reference.get_edges())
+    assert str(graph) == str(reference)
+    assert graph.has_cycle() == reference.has_cycle()
+    for v in range(reference.v_count):
+        assert graph.dfs(v) == reference.dfs(v)
+        assert graph.bfs(v) == reference.bfs(v)
+        assert graph.dijkstra(v) == reference.dijkstra(v)
+        assert graph._in_degree(v) == reference._in_degree(v)
+        assert sorted(graph._iter_in_edges(v)) == reference._in_edges(v)
+
+
+def assert_same_undirected(graph, reference):
+    """
+    Checks that an undirected graph answers every query like the reference
+    """
+    assert str(graph) == str(reference)
+    assert sorted(graph.get_vertices()) == sorted(reference.get_vertices())
+    assert graph.get_edges() == reference.get_edges()
+    assert graph.count_connected_components() == reference.count_connected_components()
+    assert graph.has_cycle() == reference.has_cycle()
+    for v in reference.get_vertices():
+        assert graph.dfs(v) == reference.dfs(v)
+        assert graph.bfs(v) == reference.bfs(v)
@@ -0,0 +1,104 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for all-pairs shortest paths.
+
+import os
+import random
+from array import array
+
+import pytest
+
+import apsp
+from csr_graph import CSRDirectedGraph
+from d_graph import DirectedGraph
+from helpers import DIRECTED_EDGES
+
+
+def random_edges(rng, n_vertices, count):
+    """
+    Returns count random weighted edges between n_vertices vertices
+    """
+    return [(rng.randrange(n_vertices), rng.randrange(n_vertices), rng.randint(1, 9))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+@pytest.mark.parametrize('cls', [DirectedGraph, CSRDirectedGraph])
+def test_rows_match_dijkstra(cls, workers):
+    rng = random.Random(19)
+    graph = cls.from_edges(random_edges(rng, 40, 120), n_vertices=40)
+    reference = [graph.dijkstra(src) for src in range(graph.v_count)]
+
+    assert apsp.all_pairs_shortest_paths(graph, workers=workers) == reference
+
+    sources = list(range(0, 40, 3))[::-1]
+    rows = list(apsp.iter_shortest_path_rows(graph, sources, workers, batch_size=2))
+    assert rows == [(src, reference[src]) for src in sources]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_rows_written_to_out_file(tmp_path, workers):
+    graph = DirectedGraph(DIRECTED_EDGES)
+    sources = [4, 2, 0]
+    out = tmp_path / 'rows.bin'
+
+    assert apsp.all_pairs_shortest_paths(graph, sources, workers, out=out) is None
+    data = array(apsp.ROW_TYPECODE)
+    data.frombytes(out.read_bytes())
+    n = graph.v_count
+    assert [list(data[row * n:(row + 1) * n]) for row in range(len(sources))] == \
+        [graph.dijkstra(src) for src in sources]
+
+
+def test_temporary_graph_file_is_removed(tmp_path):
+    graph = DirectedGraph(DIRECTED_EDGES)
+    apsp.all_pairs_shortest_paths(graph, workers=2, tmp_dir=tmp_path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_batches_cover_every_source():
+    sources = list(range(10))
+    batches = apsp._batches(sources, 2, 3)
+    assert batches == [(0, [0, 1, 2]), (3, [3, 4, 5]), (6, [6, 7, 8]), (9, [9])]
+    assert apsp._worker_count(8, 3) == 3
+    assert apsp._worker_count(None, 0) == 1
+
+
+def test_dense_methods_match_dijkstra():
+    np = pytest.importorskip('numpy')
+    rng = random.Random(20)
+    for n_vertices in (0, 1, 9, 30):
+        edges = random_edges(rng, n_vertices, n_vertices * 4) if n_vertices else []
+        for cls in (DirectedGraph, CSRDirectedGraph):
+            graph = cls.from_edges(edges, n_vertices=n_vertices)
+            reference = np.array([graph.dijkstra(src) for src in range(n_vertices)],
+                                 dtype=np.float64).reshape(n_vertices, n_vertices)
+
+            for method in ('floyd_warshall', 'dijkstra', 'auto'):
+                distances, hops = apsp.all_pairs_dense(graph, next_hops=True, method=method,
+                                                       block_size=4, workers=1)
+                assert np.array_equal(distances, reference)
+                assert apsp.all_pairs_dense(graph, method=method, workers=1)[1] is None
+
+                for src in range(n_vertices):
+                    for dst in range(n_vertices):
+                        path = apsp.dense_path(hops, src, dst)
+                        if reference[src, dst] == np.inf:
+                            assert path == []
+                        else:
+                            assert path[0] == src and path[-1] == dst
+                            assert sum(graph._edge_weight(u, v)
+                                       for u, v in zip(path, path[1:])) == reference[src, dst]
+
+
+def test_choose_method_uses_density():
+    pytest.importorskip('numpy')
+    sparse = CSRDirectedGraph.from_edges([(v, v + 1, 1) for v in range(999)], n_vertices=1000)
+    n = 200
+    dense = CSRDirectedGraph.from_edges([(u, v, 1) for u in range(n) for v in range(n)],
+                                        n_vertices=n)
+    assert apsp._choose_method(sparse) == 'dijkstra'
+    assert apsp._choose_method(dense) == 'floyd_warshall'
+
+    with pytest.raises(ValueError):
+        apsp.all_pairs_dense(sparse, method='bellman_ford')
@@ -0,0 +1,83 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for the benchmark suite helpers.
+
+import pytest
+
+import benchmark
+from d_graph import DirectedGraph
+from ud_graph import UndirectedGraph
+
+
+@pytest.mark.parametrize('name', sorted(benchmark.GENERATORS))
+def test_generators_are_valid_and_repeatable(name):
+    generator = benchmark.GENERATORS[name]
+    edges = generator(200, seed=3)
+    assert edges == generator(200, seed=3)
+    assert len(edges) > 0
+    for src, dst, weight in edges:
+        assert 0 <= src < 200 and 0 <= dst < 200 and weight >= 1
+
+    if name == 'dag':
+        assert not DirectedGraph.from_edges(edges, n_vertices=200).has_cycle()
+
+
+def test_measure_runs_setup_before_every_call():
+    calls = []
+    seconds, peak_bytes = benchmark.measure(calls.append, setup=lambda: (len(calls),),
+                                            repeat=3)
+    assert calls == [0, 1, 2, 3]  # Three timed calls and one traced call
+    assert seconds >= 0 and peak_bytes >= 0
+
+
+@pytest.mark.parametrize('cls', benchmark.UNDIRECTED_CLASSES)
+def test_component_methods_rebuild_the_union_find(cls):
+    edges = benchmark.undirected_edges(benchmark.erdos_renyi_edges(100, seed=1))
+    methods = {method: (func, setup)
+               for method, func, setup in benchmark._undirected_methods(cls, edges, 100, 10)}
+    expected = UndirectedGraph(edges).count_connected_components()
+
+    for method in ('has_cycle', 'count_connected_components'):
+        func, setup = methods[method]
+        graph = func.__self__
+        graph.count_connected_components()
+        assert not graph._uf_stale
+
+        # Each timed call must rebuild, not read the cached count
+        func(*setup())
+        assert graph._uf_stale is False
+        setup()
+        assert graph._uf_stale
+        assert graph.count_connected_components() == expected
+
+
+def test_run_suite_covers_every_class_and_method(monkeypatch):
+    monkeypatch.setitem(benchmark.SCALES, 'tiny', 60)
+    results = benchmark.run_suite(['tiny'], ['grid'], repeat=1, batch=5)
+
+    methods = {}
+    for result in results:
+        methods.setdefault(result['class'], set()).add(result['method'])
+        assert result['seconds'] is not None and result['peak_bytes'] is not None
+    assert set(methods) == {cls.__name__ for cls in
+                            benchmark.DIRECTED_CLASSES + benchmark.UNDIRECTED_CLASSES}
+    assert 'count_connected_components' in methods['InternedUndirectedGraph']
+    assert 'dijkstra' in methods['CSRDirectedGraph']
+
+
+def test_compare_results_reports_regressions(tmp_path):
+    row = {'generator': 'grid', 'scale': 'small', 'class': 'UndirectedGraph'}
+    baseline = [dict(row, method='bfs', seconds=0.010, peak_bytes=1000),
+                dict(row, method='dfs', seconds=0.010, peak_bytes=1000),
+                dict(row, method='has_cycle', seconds=0.0001, peak_bytes=1000),
+                dict(row, method='get_edges', seconds=None, peak_bytes=None)]
+    current = [dict(row, method='bfs', seconds=0.020, peak_bytes=1000),
+               dict(row, method='dfs', seconds=0.011, peak_bytes=2000),
+               dict(row, method='has_cycle', seconds=0.0005, peak_bytes=1000),
+               dict(row, method='get_edges', seconds=0.1, peak_bytes=1000)]
+
+    path = tmp_path / 'baseline.json'
+    benchmark.save_results(baseline, path, scales=['small'])
+    regressions = benchmark.compare_results(benchmark.load_results(path), current)
+    assert [(r['method'], r['seconds_ratio'], r['memory_ratio']) for r in regressions] == \
+        [('bfs', 2.0, 1.0), ('dfs', pytest.approx(1.1), 2.0)]
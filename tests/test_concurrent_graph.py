@@ -0,0 +1,117 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for the snapshot isolated graph classes, checked
+#              against DirectedGraph and UndirectedGraph.
+
+import random
+import threading
+
+import pytest
+
+from concurrent_graph import ConcurrentDirectedGraph, ConcurrentUndirectedGraph
+from d_graph import DirectedGraph
+from ud_graph import UndirectedGraph
+from helpers import (DIRECTED_EDGES, UNDIRECTED_EDGES, assert_same_directed,
+                     assert_same_undirected)
+
+NAMES = 'ABCDEFGHIJ'
+
+
+def test_directed_random_edits_match_directed_graph():
+    rng = random.Random(23)
+    graph, reference = ConcurrentDirectedGraph(DIRECTED_EDGES), DirectedGraph(DIRECTED_EDGES)
+    assert_same_directed(graph, reference)
+    assert_same_directed(graph.snapshot(), reference)
+
+    for _ in range(200):
+        if rng.random() < 0.05:
+            graph.add_vertex()
+            reference.add_vertex()
+            continue
+        src, dst = rng.randrange(reference.v_count), rng.randrange(reference.v_count)
+        if rng.random() < 0.3:
+            graph.remove_edge(src, dst)
+            reference.remove_edge(src, dst)
+        else:
+            weight = rng.randint(1, 9)
+            graph.add_edge(src, dst, weight)
+            reference.add_edge(src, dst, weight)
+        assert graph.snapshot().get_edges() == reference.get_edges()
+    assert_same_directed(graph, reference)
+    assert_same_directed(graph.snapshot(), reference)
+
+
+def test_undirected_random_edits_match_undirected_graph():
+    rng = random.Random(23)
+    graph, reference = ConcurrentUndirectedGraph(UNDIRECTED_EDGES), UndirectedGraph(UNDIRECTED_EDGES)
+    for _ in range(200):
+        command = rng.choice(('add_edge', 'add_edge', 'remove_edge', 'add_vertex',
+                              'remove_vertex'))
+        if command in ('add_edge', 'remove_edge'):
+            args = rng.sample(NAMES, 2)
+        else:
+            args = [rng.choice(NAMES)]
+        getattr(graph, command)(*args)
+        getattr(reference, command)(*args)
+        assert graph.snapshot().get_edges() == reference.get_edges()
+    assert_same_undirected(graph, reference)
+    assert_same_undirected(graph.snapshot(), reference)
+
+
+def test_snapshots_do_not_change():
+    graph = ConcurrentDirectedGraph(DIRECTED_EDGES)
+    first = graph.snapshot()
+    with graph.batch():
+        graph.add_edge(0, 2, 3)
+        graph.remove_edge(0, 1)
+        graph.add_vertex()
+        assert graph.snapshot() is first  # Not published until the batch ends
+
+    assert_same_directed(first, DirectedGraph(DIRECTED_EDGES))
+    assert graph.snapshot().v_count == 6 and graph.snapshot().version > first.version
+
+    with pytest.raises(TypeError):
+        first.add_edge(0, 2, 1)
+    with pytest.raises(TypeError):
+        graph.snapshot().add_vertex()
+
+
+def test_undirected_snapshot_survives_re_adding_a_vertex():
+    graph = ConcurrentUndirectedGraph(UNDIRECTED_EDGES)
+    before = graph.snapshot()
+    with graph.batch():
+        graph.add_vertex('A')
+        graph.add_edge('A', 'B')
+        graph.remove_edge('A', 'C')
+    after = graph.snapshot()
+
+    assert_same_undirected(before, UndirectedGraph(UNDIRECTED_EDGES))
+    assert after.has_edge('A', 'B') and not after.has_edge('A', 'C')
+    with pytest.raises(TypeError):
+        before.remove_vertex('A')
+
+
+def test_readers_see_whole_batches():
+    graph = ConcurrentUndirectedGraph()
+    stop = threading.Event()
+    errors = []
+
+    # Each batch adds a triangle, so every published snapshot has 3k edges
+    def reader():
+        while not stop.is_set():
+            snapshot = graph.snapshot()
+            if len(snapshot.get_edges()) % 3 != 0:
+                errors.append(snapshot.version)
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for k in range(200):
+        with graph.batch():
+            graph.add_edges([(f'a{k}', f'b{k}'), (f'b{k}', f'c{k}'), (f'a{k}', f'c{k}')])
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert graph.snapshot().count_connected_components() == 200
@@ -0,0 +1,70 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for the CSR storage backend, checked against the dense
+#              DirectedGraph.
+
+import random
+
+import pytest
+
+from d_graph import DirectedGraph
+from csr_graph import CSRDirectedGraph
+from helpers import DIRECTED_EDGES, assert_same_directed
+
+
+def test_matches_dense_graph():
+    assert_same_directed(CSRDirectedGraph(DIRECTED_EDGES), DirectedGraph(DIRECTED_EDGES))
+
+
+def test_random_edits_match_dense_graph():
+    rng = random.Random(1)
+    graph = CSRDirectedGraph(min_compact=8)
+    reference = DirectedGraph()
+    for _ in range(12):
+        graph.add_vertex()
+        reference.add_vertex()
+
+    for step in range(600):
+        src, dst = rng.randrange(12), rng.randrange(12)
+        if rng.random() < 0.3:
+            graph.remove_edge(src, dst)
+            reference.remove_edge(src, dst)
+        else:
+            weight = rng.randint(-1, 9)
+            graph.add_edge(src, dst, weight)
+            reference.add_edge(src, dst, weight)
+        if step % 50 == 0:
+            assert_same_directed(graph, reference)
+
+    graph.compact()
+    assert graph._delta_size == 0
+    assert_same_directed(graph, reference)
+
+
+def test_float_weight_needs_float_typecode():
+    graph = CSRDirectedGraph([(0, 1, 1)])
+    with pytest.raises(TypeError):
+        graph.add_edge(0, 1, 2.5)
+
+    # The rejected edge never reaches the arrays
+    graph.compact()
+    assert graph.get_edges() == [(0, 1, 1)]
+
+    floats = CSRDirectedGraph([(0, 1, 1)], weight_typecode='d')
+    floats.add_edge(1, 0, 2.5)
+    floats.compact()
+    assert sorted(floats.get_edges()) == [(0, 1, 1.0), (1, 0, 2.5)]
+
+
+def test_degrees_include_pending_edits():
+    graph = CSRDirectedGraph(DIRECTED_EDGES)
+    graph.add_edge(0, 3, 2)
+    graph.remove_edge(3, 1)
+    reference = DirectedGraph(DIRECTED_EDGES)
+    reference.add_edge(0, 3, 2)
+    reference.remove_edge(3, 1)
+
+    for v in range(5):
+        assert graph._in_degree(v) == reference._in_degree(v)
+        assert graph._out_degree(v) == reference._out_degree(v)
+        assert sorted(graph._iter_out_edges(v)) == graph._out_edges(v)
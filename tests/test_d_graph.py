@@ -0,0 +1,144 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for DirectedGraph.
+
+import random
+
+from d_graph import DirectedGraph, LandmarkHeuristic
+from helpers import DIRECTED_EDGES
+
+
+def random_edges(rng, n_vertices, count):
+    """
+    Returns count random edges, some of them invalid, between n_vertices
+    vertices
+    """
+    return [(rng.randrange(n_vertices), rng.randrange(n_vertices), rng.randint(-1, 9))
+            for _ in range(count)]
+
+
+def test_add_vertex_returns_count():
+    graph = DirectedGraph()
+    assert [graph.add_vertex() for _ in range(4)] == [1, 2, 3, 4]
+    assert graph.adj_matrix == [[0] * 4 for _ in range(4)]
+
+    graph.add_edge(0, 3, 2)
+    graph.add_vertex()
+    assert graph.adj_matrix[0] == [0, 0, 0, 2, 0]
+    assert graph.adj_matrix[4] == [0] * 5
+
+
+def test_from_edges_matches_add_edge():
+    rng = random.Random(2)
+    for _ in range(50):
+        edges = random_edges(rng, 8, 30)
+        reference = DirectedGraph()
+        for _ in range(8):
+            reference.add_vertex()
+        for src, dst, weight in edges:
+            reference.add_edge(src, dst, weight)
+
+        graph = DirectedGraph.from_edges(edges, n_vertices=8)
+        assert graph.adj_matrix == reference.adj_matrix
+        assert graph.get_edges() == reference.get_edges()
+
+
+def test_from_edges_sizes_graph_from_edges():
+    graph = DirectedGraph.from_edges(iter(DIRECTED_EDGES))
+    assert graph.v_count == 5
+    assert graph.get_edges() == DirectedGraph(DIRECTED_EDGES).get_edges()
+
+    # A repeated edge keeps its last weight
+    assert DirectedGraph.from_edges([(0, 1, 3), (0, 1, 8)]).get_edges() == [(0, 1, 8)]
+
+
+def test_successors_and_predecessors_follow_edits():
+    graph = DirectedGraph(DIRECTED_EDGES)
+    assert graph.successors(3) == [1, 2]
+    assert graph.predecessors(1) == [0, 2, 3]
+
+    graph.remove_edge(3, 1)
+    graph.add_edge(0, 3, 4)
+    assert graph.successors(3) == [2]
+    assert graph.predecessors(3) == [0, 4]
+    assert [graph._in_degree(v) for v in range(5)] == [1, 2, 1, 2, 1]
+    assert [graph._out_degree(v) for v in range(5)] == [2, 1, 1, 1, 2]
+
+
+def test_has_cycle():
+    graph = DirectedGraph([(0, 1, 1), (1, 2, 1), (0, 2, 1)])
+    assert not graph.has_cycle()
+    graph.add_edge(2, 0, 1)
+    assert graph.has_cycle()
+    graph.remove_edge(1, 2)
+    graph.remove_edge(0, 2)
+    assert not graph.has_cycle()
+    assert DirectedGraph(DIRECTED_EDGES).has_cycle()
+
+
+def test_dijkstra():
+    graph = DirectedGraph(DIRECTED_EDGES)
+    assert [graph.dijkstra(v) for v in range(5)] == [
+        [0, 10, 35, 28, 25], [27, 0, 25, 18, 15], [50, 23, 0, 41, 38],
+        [32, 5, 7, 0, 20], [12, 8, 10, 3, 0]]
+
+    inf = float('inf')
+    graph.remove_edge(4, 3)
+    assert graph.dijkstra(0) == [0, 10, inf, inf, 25]
+    assert graph.dijkstra(4) == [12, 22, inf, inf, 0]
+
+
+def test_shortest_path_and_tree():
+    graph = DirectedGraph(DIRECTED_EDGES)
+    assert graph.shortest_path(0, 2) == (35, [0, 1, 4, 3, 2])
+    assert graph.shortest_path(2, 2) == (0, [2])
+    assert graph.shortest_path(0, 9) == (float('inf'), [])
+
+    distances, parents = graph.shortest_path_tree(0)
+    assert distances == graph.dijkstra(0)
+    assert parents == [None, 0, 3, 4, 1]
+
+    graph.remove_edge(4, 3)
+    assert graph.shortest_path(0, 3) == (float('inf'), [])
+
+
+def test_shortest_path_matches_dijkstra_on_random_graphs():
+    rng = random.Random(4)
+    for _ in range(30):
+        graph = DirectedGraph.from_edges(random_edges(rng, 10, 25), n_vertices=10)
+        for src in range(10):
+            distances = graph.dijkstra(src)
+            for dst in range(10):
+                dist, path = graph.shortest_path(src, dst)
+                assert dist == distances[dst]
+                if path:
+                    assert path[0] == src and path[-1] == dst
+                    assert sum(graph.adj_matrix[u][v] for u, v in zip(path, path[1:])) == dist
+
+
+def test_point_to_point_searches_match_dijkstra():
+    rng = random.Random(5)
+    for _ in range(30):
+        graph = DirectedGraph.from_edges(random_edges(rng, 12, 30), n_vertices=12)
+        heuristic = LandmarkHeuristic(graph, count=3)
+        for src in range(12):
+            distances = graph.dijkstra(src)
+            for dst in range(12):
+                for dist, path in (graph.bidirectional_dijkstra(src, dst),
+                                   graph.astar(src, dst, heuristic),
+                                   graph.astar(src, dst)):
+                    assert dist == distances[dst]
+                    assert (path == []) == (dist == float('inf'))
+                    if path:
+                        assert path[0] == src and path[-1] == dst
+                        assert graph.is_valid_path(path)
+
+                # The landmark bound never overestimates
+                assert heuristic(src, dst) <= distances[dst]
+
+
+def test_point_to_point_searches_reject_missing_vertices():
+    graph = DirectedGraph(DIRECTED_EDGES)
+    assert graph.bidirectional_dijkstra(0, 7) == (float('inf'), [])
+    assert graph.astar(-1, 2) == (float('inf'), [])
+    assert graph.bidirectional_dijkstra(3, 3) == (0, [3])
@@ -0,0 +1,68 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for incremental shortest paths, checked against a fresh
+#              dijkstra() after every edit.
+
+import random
+
+from d_graph import DirectedGraph
+from csr_graph import CSRDirectedGraph
+from dynamic_sssp import DynamicShortestPaths
+from helpers import DIRECTED_EDGES
+
+
+def assert_exact(paths, graph):
+    """
+    Checks every tracked source against a fresh computation
+    """
+    for src in paths.sources():
+        assert paths.distances(src) == graph.dijkstra(src)
+        for dst in range(graph.v_count):
+            dist, path = paths.shortest_path(src, dst)
+            assert dist == graph.dijkstra(src)[dst]
+            if path:
+                assert path[0] == src and path[-1] == dst
+                assert graph.is_valid_path(path)
+
+
+def test_demo_edits():
+    graph = DirectedGraph(DIRECTED_EDGES)
+    paths = DynamicShortestPaths(graph, sources=[0, 2])
+    for src, dst, weight in ((4, 3, 0), (4, 3, 3), (0, 2, 1), (1, 4, 40)):
+        if weight > 0:
+            graph.add_edge(src, dst, weight)
+        else:
+            graph.remove_edge(src, dst)
+        assert_exact(paths, graph)
+
+
+def test_random_edits():
+    for cls in (DirectedGraph, CSRDirectedGraph):
+        rng = random.Random(7)
+        graph = cls.from_edges([(rng.randrange(12), rng.randrange(12), rng.randint(1, 9))
+                                for _ in range(30)], n_vertices=12)
+        paths = DynamicShortestPaths(graph, sources=[0, 5, 11])
+        for step in range(300):
+            src, dst = rng.randrange(graph.v_count), rng.randrange(graph.v_count)
+            roll = rng.random()
+            if roll < 0.02:
+                graph.add_vertex()
+            elif roll < 0.4:
+                graph.remove_edge(src, dst)
+            else:
+                graph.add_edge(src, dst, rng.randint(1, 9))
+            assert_exact(paths, graph)
+
+
+def test_track_and_untrack():
+    graph = DirectedGraph(DIRECTED_EDGES)
+    paths = DynamicShortestPaths(graph)
+    paths.track(3)
+    assert paths.sources() == [3]
+    graph.remove_edge(3, 1)
+    assert paths.distances(3) == graph.dijkstra(3)
+    paths.untrack(3)
+    assert paths.sources() == []
+
+    paths.close()
+    assert graph._observers == []
@@ -0,0 +1,116 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for streaming edge-list ingestion.
+
+import gzip
+import io
+
+import pytest
+
+from csr_graph import CSRDirectedGraph
+from d_graph import DirectedGraph
+from edge_stream import ingest, iter_edge_chunks
+from ud_graph import UndirectedGraph
+from helpers import DIRECTED_EDGES
+
+TEXT = ('# src dst weight\n' + ''.join(f'{u} {v} {w}\n' for u, v, w in DIRECTED_EDGES)
+        + '3 3 1\n')
+
+
+class RawStream(io.RawIOBase):
+    """
+    Binary stream that can be neither peeked nor sought, like a pipe
+    """
+
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._data.readinto(buffer)
+
+
+def test_ingest_text_stream():
+    graph = DirectedGraph()
+    stats = ingest(graph, io.StringIO(TEXT), chunk_size=3)
+    assert graph.get_edges() == DirectedGraph(DIRECTED_EDGES).get_edges()
+    assert (stats['lines'], stats['edges'], stats['skipped']) == (9, 7, 1)
+    assert stats['edges_per_second'] >= 0
+
+
+@pytest.mark.parametrize('compress', [False, True])
+@pytest.mark.parametrize('wrap', [io.BytesIO, RawStream,
+                                  lambda data: io.BufferedReader(io.BytesIO(data))])
+def test_ingest_binary_stream(wrap, compress):
+    data = TEXT.encode()
+    if compress:
+        data = gzip.compress(data)
+    graph = DirectedGraph()
+    ingest(graph, wrap(data))
+    assert graph.get_edges() == DirectedGraph(DIRECTED_EDGES).get_edges()
+
+
+@pytest.mark.parametrize('name', ['edges.csv', 'edges.csv.gz', 'edges.txt'])
+def test_ingest_file_path(tmp_path, name):
+    delimiter = ',' if '.csv' in name else ' '
+    data = ''.join(f'{u}{delimiter}{v}{delimiter}{w}\n'
+                   for u, v, w in DIRECTED_EDGES).encode()
+    path = tmp_path / name
+    path.write_bytes(gzip.compress(data) if name.endswith('.gz') else data)
+
+    graph = CSRDirectedGraph()
+    ingest(graph, path)
+    assert graph.get_edges() == DirectedGraph(DIRECTED_EDGES).get_edges()
+
+
+def test_ingest_undirected_iterable():
+    pairs = ((str(i), str((i * 7) % 10)) for i in range(10))
+    graph = UndirectedGraph()
+    stats = ingest(graph, pairs)
+    assert (stats['edges'], stats['skipped']) == (8, 2)
+    assert graph.count_connected_components() == 2
+
+
+def test_chunks_are_bounded():
+    chunks = list(iter_edge_chunks(iter(DIRECTED_EDGES), chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 1]
+
+
+def test_malformed_lines():
+    with pytest.raises(ValueError, match='<file>:2'):
+        list(iter_edge_chunks(io.StringIO('0 1\nx 2\n')))
+
+    stats = {}
+    chunks = list(iter_edge_chunks(io.StringIO('0 1\nx 2\n5\n1 2 3\n'), errors='skip',
+                                   stats=stats))
+    assert chunks == [[(0, 1, 1), (1, 2, 3)]]
+    assert stats['skipped'] == 2
+
+    with pytest.raises(ValueError):
+        list(iter_edge_chunks([], errors='ignore'))
+
+
+def test_start_edges_keep_baseline_semantics():
+    assert DirectedGraph([]).v_count == 1
+    assert DirectedGraph().v_count == 0
+    assert DirectedGraph(DIRECTED_EDGES).v_count == 5
+
+
+def test_non_finite_weights_are_skipped():
+    graph = DirectedGraph()
+    stats = ingest(graph, io.StringIO('0 1 nan\n1 2 inf\n2 3 1.5\n3 4 -inf\n'))
+    assert (stats['edges'], stats['skipped']) == (1, 3)
+    assert graph.get_edges() == [(2, 3, 1.5)]
+
+
+def test_fractional_vertex_ids_are_rejected():
+    with pytest.raises(ValueError, match='not an integer'):
+        ingest(DirectedGraph(), [(0, 1.9, 2)])
+
+    graph = DirectedGraph()
+    stats = ingest(graph, [(0, 1.9, 2), (0, 2.0, 3), ('1', 2, 4), (None, 1, 1)],
+                   errors='skip')
+    assert (stats['edges'], stats['skipped']) == (2, 2)
+    assert graph.get_edges() == [(0, 2, 3), (1, 2, 4)]
@@ -0,0 +1,63 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for the binary graph file format.
+
+import pytest
+
+import graph_file
+from csr_graph import CSRDirectedGraph
+from d_graph import DirectedGraph
+from interned_graph import InternedUndirectedGraph
+from ud_graph import UndirectedGraph
+from helpers import DIRECTED_EDGES, UNDIRECTED_EDGES
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+@pytest.mark.parametrize('cls', [None, CSRDirectedGraph, DirectedGraph])
+def test_directed_round_trip(tmp_path, cls, mmap):
+    reference = DirectedGraph(DIRECTED_EDGES)
+    path = tmp_path / 'directed.graph'
+    graph_file.save(reference, path)
+
+    graph = graph_file.load(path, mmap=mmap, cls=cls)
+    assert isinstance(graph, cls or CSRDirectedGraph)
+    assert graph.v_count == reference.v_count
+    assert graph.get_edges() == reference.get_edges()
+    for v in range(reference.v_count):
+        assert graph.dijkstra(v) == reference.dijkstra(v)
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+@pytest.mark.parametrize('cls', [None, UndirectedGraph, InternedUndirectedGraph])
+def test_undirected_round_trip(tmp_path, cls, mmap):
+    reference = UndirectedGraph(UNDIRECTED_EDGES)
+    reference.add_vertex('Z')
+    path = tmp_path / 'undirected.graph'
+    graph_file.save(reference, path)
+
+    graph = graph_file.load(path, mmap=mmap, cls=cls)
+    assert isinstance(graph, cls or UndirectedGraph)
+    assert str(graph) == str(reference)
+    assert graph.get_edges() == reference.get_edges()
+    assert graph.count_connected_components() == reference.count_connected_components()
+
+
+def test_load_rejects_the_wrong_graph_kind(tmp_path):
+    directed, undirected = tmp_path / 'd.graph', tmp_path / 'u.graph'
+    graph_file.save(DirectedGraph(DIRECTED_EDGES), directed)
+    graph_file.save(UndirectedGraph(UNDIRECTED_EDGES), undirected)
+
+    with pytest.raises(ValueError, match='directed graph'):
+        graph_file.load(directed, cls=UndirectedGraph)
+    with pytest.raises(ValueError, match='undirected graph'):
+        graph_file.load(undirected, cls=CSRDirectedGraph)
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.graph'
+    path.write_bytes(b'\0' * graph_file.HEADER.size)
+    with pytest.raises(ValueError, match='not a graph file'):
+        graph_file.load(path)
+
+    with pytest.raises(TypeError):
+        graph_file.save(object(), path)
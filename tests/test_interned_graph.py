@@ -0,0 +1,68 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for InternedUndirectedGraph, checked against
+#              UndirectedGraph.
+
+import random
+
+from interned_graph import InternedUndirectedGraph
+from ud_graph import UndirectedGraph
+from helpers import UNDIRECTED_EDGES, assert_same_undirected
+
+NAMES = [chr(ord('A') + i) for i in range(12)]
+
+
+def random_edit(rng, graph):
+    """
+    Applies one random edit to the graph and returns it
+    """
+    command = rng.choice(('add_edge', 'add_edge', 'remove_edge', 'add_vertex',
+                          'remove_vertex'))
+    if command in ('add_edge', 'remove_edge'):
+        args = tuple(rng.sample(NAMES, 2))
+    else:
+        args = (rng.choice(NAMES),)
+    getattr(graph, command)(*args)
+    return command, args
+
+
+def test_matches_undirected_graph():
+    assert_same_undirected(InternedUndirectedGraph(UNDIRECTED_EDGES),
+                           UndirectedGraph(UNDIRECTED_EDGES))
+    assert_same_undirected(InternedUndirectedGraph(), UndirectedGraph())
+
+
+def test_random_edits_match_undirected_graph():
+    rng = random.Random(16)
+    for _ in range(20):
+        graph, reference = InternedUndirectedGraph(), UndirectedGraph()
+        for _ in range(60):
+            command, args = random_edit(rng, reference)
+            getattr(graph, command)(*args)
+            assert_same_undirected(graph, reference)
+
+
+def test_components_rebuilt_after_removal():
+    graph = InternedUndirectedGraph(UNDIRECTED_EDGES)
+    assert graph.count_connected_components() == 2
+    graph.remove_edge('B', 'H')
+    assert graph._uf_stale
+    assert graph.count_connected_components() == 3
+    assert not graph._uf_stale
+    assert graph.connected('A', 'D') and not graph.connected('A', 'H')
+
+    # Edges added after the rebuild merge components incrementally
+    graph.add_edge('H', 'G')
+    assert not graph._uf_stale
+    assert graph.count_connected_components() == 2
+
+
+def test_removed_vertex_ids_are_reused():
+    graph = InternedUndirectedGraph(UNDIRECTED_EDGES)
+    graph.remove_vertex('H')
+    graph.add_edge('X', 'A')
+    reference = UndirectedGraph(UNDIRECTED_EDGES)
+    reference.remove_vertex('H')
+    reference.add_edge('X', 'A')
+    assert len(graph._names) == 9
+    assert_same_undirected(graph, reference)
@@ -0,0 +1,64 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for the NumPy and SciPy engines, checked against the
+#              dense DirectedGraph.
+
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('scipy')
+
+from d_graph import DirectedGraph
+from np_graph import NumpyDirectedGraph, SciPyDirectedGraph
+from helpers import DIRECTED_EDGES, assert_same_directed
+
+ENGINES = (NumpyDirectedGraph, SciPyDirectedGraph)
+
+
+@pytest.mark.parametrize('cls', ENGINES)
+def test_matches_dense_graph(cls):
+    assert_same_directed(cls(DIRECTED_EDGES), DirectedGraph(DIRECTED_EDGES))
+    assert_same_directed(cls.from_edges(DIRECTED_EDGES), DirectedGraph(DIRECTED_EDGES))
+
+
+@pytest.mark.parametrize('cls', ENGINES)
+def test_random_edits_match_dense_graph(cls):
+    rng = random.Random(3)
+    graph, reference = cls(), DirectedGraph()
+    for step in range(300):
+        if step % 40 == 0:
+            graph.add_vertex()
+            reference.add_vertex()
+
+        src, dst = rng.randrange(-1, graph.v_count + 1), rng.randrange(-1, graph.v_count + 1)
+        if rng.random() < 0.3:
+            graph.remove_edge(src, dst)
+            reference.remove_edge(src, dst)
+        else:
+            weight = rng.randint(0, 9)
+            graph.add_edge(src, dst, weight)
+            reference.add_edge(src, dst, weight)
+
+        if step % 25 == 0:
+            assert_same_directed(graph, reference)
+    assert_same_directed(graph, reference)
+
+
+def test_float_weights():
+    graph = NumpyDirectedGraph([(0, 1, 1.5), (1, 2, 2.25)], dtype='float64')
+    assert graph.dijkstra(0) == [0.0, 1.5, 3.75]
+
+
+@pytest.mark.parametrize('cls', ENGINES)
+def test_float_weights_need_a_float_type(cls):
+    with pytest.raises(TypeError):
+        cls([(0, 1, 2.5), (1, 2, 1)])
+    with pytest.raises(TypeError):
+        cls.from_edges([(0, 1, 2.5), (1, 2, 1)])
+
+    graph = cls([(0, 1, 2), (1, 2, 1)])
+    with pytest.raises(TypeError):
+        graph.add_edge(0, 2, 1.5)
+    assert graph.get_edges() == [(0, 1, 2), (1, 2, 1)]
@@ -0,0 +1,71 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for the online topological order.
+
+import random
+
+from d_graph import DirectedGraph
+from online_topo import OnlineTopologicalOrder
+
+
+def assert_valid_order(topo, graph):
+    """
+    Checks that the order is a topological order of the graph, or None
+    exactly when the graph has a cycle
+    """
+    order = topo.topological_order()
+    assert topo.has_cycle() == graph.has_cycle()
+    if order is None:
+        return
+
+    assert sorted(order) == list(range(graph.v_count))
+    position = {v: i for i, v in enumerate(order)}
+    for src, dst, _ in graph.get_edges():
+        assert position[src] < position[dst]
+
+
+def test_try_add_edge_rejects_cycles():
+    graph = DirectedGraph([(0, 1, 1), (1, 2, 1), (3, 4, 1)])
+    topo = OnlineTopologicalOrder(graph)
+    assert topo.try_add_edge(4, 0)
+    assert not topo.try_add_edge(2, 3)
+    assert topo.try_add_edge(4, 1)
+    assert not topo.try_add_edge(2, 4)
+    assert graph.adj_matrix[2][3] == graph.adj_matrix[2][4] == 0
+    assert_valid_order(topo, graph)
+
+    # Edges added behind its back are still tracked
+    graph.add_edge(4, 3)
+    graph.add_edge(3, 4)
+    assert topo.has_cycle() and topo.topological_order() is None
+    graph.remove_edge(3, 4)
+    assert_valid_order(topo, graph)
+
+
+def test_random_edits_keep_order_valid():
+    rng = random.Random(8)
+    graph = DirectedGraph.from_edges([], n_vertices=10)
+    topo = OnlineTopologicalOrder(graph)
+    for _ in range(400):
+        src, dst = rng.randrange(graph.v_count), rng.randrange(graph.v_count)
+        roll = rng.random()
+        if roll < 0.02:
+            graph.add_vertex()
+        elif roll < 0.3:
+            graph.remove_edge(src, dst)
+        elif roll < 0.4:
+            graph.add_edge(src, dst)  # May close a cycle
+        else:
+            expected = src != dst and graph.adj_matrix[src][dst] == 0 and _closes_cycle(graph, src, dst)
+            assert topo.creates_cycle(src, dst) == (expected or graph.has_cycle())
+            topo.try_add_edge(src, dst)
+        assert_valid_order(topo, graph)
+
+
+def _closes_cycle(graph, src, dst):
+    """
+    Returns True if adding src -> dst to a copy of the graph makes it cyclic
+    """
+    copy = DirectedGraph.from_edges(graph.get_edges(), n_vertices=graph.v_count)
+    copy.add_edge(src, dst)
+    return copy.has_cycle()
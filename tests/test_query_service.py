@@ -0,0 +1,110 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for the asyncio query service.
+
+import asyncio
+import os
+
+import pytest
+
+from apsp import SharedGraph
+from concurrent_graph import ConcurrentDirectedGraph
+from d_graph import DirectedGraph
+from query_service import LatencyHistogram, LocalClient, QueryService
+from ud_graph import UndirectedGraph
+from helpers import DIRECTED_EDGES
+
+
+def run(service, queries):
+    """
+    Starts the service, sends every query at once and returns the results
+    and the final stats
+    """
+    async def main():
+        async with service:
+            results = await LocalClient(service).run(queries)
+        return results, service.stats()
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_results_match_the_graph(processes):
+    graph = DirectedGraph(DIRECTED_EDGES)
+    queries = [('dijkstra', (v,)) for v in range(5)] + [('bfs', (v, 2)) for v in range(5)]
+    queries.append(('is_valid_path', ([0, 1, 4],)))
+    results, _ = run(QueryService(graph, workers=2, processes=processes), queries)
+    assert results == [graph.dijkstra(v) for v in range(5)] + \
+        [graph.bfs(v, 2) for v in range(5)] + [True]
+
+
+def test_identical_queries_are_coalesced():
+    graph = DirectedGraph(DIRECTED_EDGES)
+    results, stats = run(QueryService(graph, batch_window=0.05),
+                         [('dijkstra', (0,))] * 10)
+    assert results == [graph.dijkstra(0)] * 10
+    assert results[0] is not results[1]  # Every caller gets its own list
+    assert (stats['dijkstra']['count'], stats['dijkstra']['coalesced'],
+            stats['dijkstra']['batches']) == (10, 9, 1)
+
+
+def test_queries_are_sent_in_batches():
+    graph = DirectedGraph(DIRECTED_EDGES)
+    queries = [('bfs', (v % 5, v // 5)) for v in range(20)]
+    _, stats = run(QueryService(graph, batch_window=0.05, max_batch=8), queries)
+    assert stats['bfs']['coalesced'] == 0
+    assert stats['bfs']['batches'] == 3  # Two full batches, then the window closes
+
+    _, stats = run(QueryService(graph, batch_window=0.05, max_batch=64), queries)
+    assert stats['bfs']['batches'] == 1
+
+
+def test_errors_reach_only_their_caller():
+    graph = DirectedGraph(DIRECTED_EDGES)
+    results, stats = run(QueryService(graph, batch_window=0.05),
+                         [('dijkstra', (0,)), ('dijkstra', ('x',)), ('dijkstra', (1,))])
+    assert results[0] == graph.dijkstra(0) and results[2] == graph.dijkstra(1)
+    assert isinstance(results[1], TypeError)
+    assert stats['dijkstra']['batches'] == 1
+
+    results, _ = run(QueryService(UndirectedGraph(['AB'])), [('dijkstra', ('A',))])
+    assert isinstance(results[0], TypeError)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(QueryService(graph).dijkstra(0))
+
+
+def test_thread_workers_query_the_latest_snapshot():
+    graph = ConcurrentDirectedGraph(DIRECTED_EDGES)
+
+    async def main():
+        async with QueryService(graph) as service:
+            before = await service.dijkstra(0)
+            graph.add_edge(0, 2, 1)
+            after = await service.dijkstra(0)
+        return before, after
+
+    before, after = asyncio.run(main())
+    assert before == DirectedGraph(DIRECTED_EDGES).dijkstra(0)
+    assert after == graph.dijkstra(0) and after[2] == 1
+
+
+def test_shared_graph_file_is_removed(tmp_path):
+    graph = DirectedGraph(DIRECTED_EDGES)
+    with SharedGraph(graph, tmp_path) as path:
+        assert os.path.dirname(path) == str(tmp_path)
+        assert DirectedGraph.load(path).get_edges() == graph.get_edges()
+    assert os.listdir(tmp_path) == []
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0.0
+    for seconds in [0.00001] * 90 + [0.001] * 9 + [100.0]:
+        histogram.record(seconds)
+
+    summary = histogram.summary()
+    assert summary['count'] == 100 and summary['max'] == 100.0
+    assert summary['p50'] == summary['p90'] == LatencyHistogram.BOUNDS[0]
+    assert summary['p99'] == LatencyHistogram.BOUNDS[5]  # 1.6 ms holds 1 ms
+    assert histogram.percentile(100) == 100.0
+    assert sum(count for _, count in summary['buckets']) == 100
@@ -0,0 +1,86 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for the shortest-path result cache.
+
+import random
+
+from d_graph import DirectedGraph
+from sp_cache import ShortestPathCache
+from helpers import DIRECTED_EDGES
+
+
+def entry_sizes(cache):
+    """
+    Returns the total size of the cache entries, measured from scratch
+    """
+    return sum(ShortestPathCache._entry_size(entry[1], entry[2])
+               for entry in cache._entries.values())
+
+
+def test_hits_and_misses():
+    graph = DirectedGraph(DIRECTED_EDGES)
+    cache = ShortestPathCache(graph)
+    assert cache.dijkstra(0) == graph.dijkstra(0)
+    assert cache.dijkstra(0) == graph.dijkstra(0)
+    assert cache.shortest_path(0, 2) == graph.shortest_path(0, 2)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # Results are copies, so callers cannot corrupt the cache
+    cache.dijkstra(0).append(99)
+    assert cache.dijkstra(0) == graph.dijkstra(0)
+
+
+def test_edits_keep_results_exact():
+    rng = random.Random(6)
+    graph = DirectedGraph.from_edges([], n_vertices=10)
+    cache = ShortestPathCache(graph)
+    for step in range(400):
+        src, dst = rng.randrange(graph.v_count), rng.randrange(graph.v_count)
+        roll = rng.random()
+        if roll < 0.02:
+            graph.add_vertex()
+        elif roll < 0.3:
+            graph.remove_edge(src, dst)
+        else:
+            graph.add_edge(src, dst, rng.randint(1, 9))
+
+        source = rng.randrange(graph.v_count)
+        assert cache.dijkstra(source) == graph.dijkstra(source)
+        assert cache.size_bytes == entry_sizes(cache)
+    assert cache.hits > 0
+
+
+def test_size_counts_list_contents():
+    graph = DirectedGraph.from_edges([(v, v + 1, 1) for v in range(99)], n_vertices=100)
+    cache = ShortestPathCache(graph)
+    cache.dijkstra(0)
+
+    # Two lists of 100 pointers plus 100 ints
+    assert cache.size_bytes >= 100 * 8 * 2 + 100 * 24
+    assert cache.size_bytes == entry_sizes(cache)
+
+    graph.add_vertex()
+    assert cache.dijkstra(0)[-1] == float('inf')
+    assert cache.hits == 1
+    assert cache.size_bytes == entry_sizes(cache)
+
+
+def test_byte_budget_evicts_least_recently_used():
+    graph = DirectedGraph.from_edges([(v, v + 1, 1) for v in range(49)], n_vertices=50)
+    probe = ShortestPathCache(graph)
+    probe.dijkstra(0)
+    entry_bytes = probe.size_bytes
+    probe.close()
+
+    cache = ShortestPathCache(graph, max_bytes=entry_bytes * 2 + entry_bytes // 2)
+    for src in (0, 1, 0, 2):
+        cache.dijkstra(src)
+    assert list(cache._entries) == [0, 2]
+    assert cache.evictions == 1
+    assert cache.size_bytes <= cache.max_bytes
+
+    # Growing the entries past the budget evicts the oldest one
+    for _ in range(40):
+        graph.add_vertex()
+    assert cache.size_bytes <= cache.max_bytes
+    assert cache.size_bytes == entry_sizes(cache)
@@ -0,0 +1,155 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for the lazy iter_dfs() / iter_bfs() traversals and
+#              frontier_bfs() of every graph class.
+
+import random
+from itertools import islice
+
+import pytest
+
+from csr_graph import CSRDirectedGraph
+from d_graph import DirectedGraph
+from interned_graph import InternedUndirectedGraph
+from ud_graph import UndirectedGraph
+from helpers import DIRECTED_EDGES, UNDIRECTED_EDGES
+
+DIRECTED_CLASSES = [DirectedGraph, CSRDirectedGraph]
+UNDIRECTED_CLASSES = [UndirectedGraph, InternedUndirectedGraph]
+
+
+def assert_info_is_consistent(traversal, start, successors):
+    """
+    Checks the (vertex, depth, parent) tuples of a traversal: the start
+    vertex comes first with no parent, and every other vertex is a
+    successor of an earlier vertex one level up
+    """
+    depths = {}
+    for vertex, depth, parent in traversal:
+        if parent is None:
+            assert vertex == start and depth == 0
+        else:
+            assert vertex in successors(parent) and depth == depths[parent] + 1
+        depths[vertex] = depth
+    return depths
+
+
+def reference_hops(successors, sources, max_depth):
+    """
+    Returns {vertex: hops} for the vertices within max_depth hops of the
+    sources, found by a plain top-down BFS
+    """
+    hops = dict.fromkeys(sources, 0)
+    frontier = list(hops)
+    depth = 0
+    while len(frontier) > 0 and (max_depth is None or depth < max_depth):
+        depth += 1
+        next_frontier = []
+        for v in frontier:
+            for u in successors(v):
+                if u not in hops:
+                    hops[u] = depth
+                    next_frontier.append(u)
+        frontier = next_frontier
+    return hops
+
+
+@pytest.mark.parametrize('cls', DIRECTED_CLASSES)
+def test_directed_orders_match_baseline(cls):
+    graph = cls(DIRECTED_EDGES)
+    assert [graph.dfs(v) for v in range(5)] == [
+        [0, 1, 4, 3, 2], [1, 4, 0, 3, 2], [2, 1, 4, 0, 3], [3, 1, 4, 0, 2], [4, 0, 1, 3, 2]]
+    assert [graph.bfs(v) for v in range(5)] == [
+        [0, 1, 4, 3, 2], [1, 4, 0, 3, 2], [2, 1, 4, 0, 3], [3, 1, 2, 4, 0], [4, 0, 3, 1, 2]]
+    assert graph.dfs(3, 0) == [3, 1, 4, 0]
+    assert graph.bfs(5) == graph.dfs(-1) == []
+
+
+@pytest.mark.parametrize('cls', DIRECTED_CLASSES)
+def test_directed_iterators_match_lists(cls):
+    rng = random.Random(21)
+    for _ in range(20):
+        n = rng.randint(1, 20)
+        edges = [(rng.randrange(n), rng.randrange(n), 1) for _ in range(n * 2)]
+        graph = cls.from_edges(edges, n_vertices=n)
+        for start in range(n):
+            end = rng.randrange(n)
+            assert list(graph.iter_dfs(start, stop_when=lambda v: v == end)) == graph.dfs(start, end)
+            assert list(graph.iter_bfs(start, stop_when=lambda v: v == end)) == graph.bfs(start, end)
+            assert list(islice(graph.iter_bfs(start), 2)) == graph.bfs(start)[:2]
+
+            dfs_info = list(graph.iter_dfs(start, with_info=True))
+            assert [v for v, _, _ in dfs_info] == graph.dfs(start)
+            assert_info_is_consistent(dfs_info, start, graph.successors)
+
+            bfs_info = list(graph.iter_bfs(start, with_info=True))
+            assert [v for v, _, _ in bfs_info] == graph.bfs(start)
+            depths = assert_info_is_consistent(bfs_info, start, graph.successors)
+
+            # Every edge weighs 1, so BFS depths are shortest distances
+            distances = graph.dijkstra(start)
+            assert all(distances[v] == depth for v, depth in depths.items())
+
+
+@pytest.mark.parametrize('cls', UNDIRECTED_CLASSES)
+def test_undirected_iterators_match_lists(cls):
+    graph = cls(UNDIRECTED_EDGES)
+    assert list(graph.iter_dfs('A')) == ['A', 'C', 'B', 'D', 'E', 'H']
+    assert list(graph.iter_bfs('A', stop_when=lambda v: v == 'D')) == ['A', 'C', 'E', 'B', 'D']
+    assert list(graph.iter_bfs('Z')) == []
+
+    for start in graph.get_vertices():
+        info = list(graph.iter_bfs(start, with_info=True))
+        assert [v for v, _, _ in info] == graph.bfs(start)
+        assert_info_is_consistent(info, start, graph.adj_list.__getitem__)
+
+        info = list(graph.iter_dfs(start, with_info=True))
+        assert [v for v, _, _ in info] == graph.dfs(start)
+        assert_info_is_consistent(info, start, graph.adj_list.__getitem__)
+
+
+@pytest.mark.parametrize('cls', DIRECTED_CLASSES)
+def test_directed_frontier_bfs(cls):
+    rng = random.Random(22)
+
+    # Dense graphs switch to bottom-up levels, sparse ones stay top-down
+    for degree in (1, 3, 30):
+        for _ in range(10):
+            n = rng.randint(1, 80)
+            edges = [(rng.randrange(n), rng.randrange(n), 1) for _ in range(n * degree)]
+            graph = cls.from_edges(edges, n_vertices=n)
+            sources = rng.sample(range(n), rng.randint(1, min(n, 4))) + [-1, n]
+            max_depth = rng.choice([None, 1, 2])
+
+            hops, parents = graph.frontier_bfs(sources, max_depth)
+            expected = reference_hops(graph.successors, [s for s in sources if 0 <= s < n],
+                                      max_depth)
+            for v in range(n):
+                assert hops[v] == expected.get(v, -1)
+                if hops[v] > 0:
+                    assert hops[parents[v]] == hops[v] - 1
+                    assert v in graph.successors(parents[v])
+                else:
+                    assert parents[v] == -1
+
+
+@pytest.mark.parametrize('cls', UNDIRECTED_CLASSES)
+def test_undirected_frontier_bfs(cls):
+    graph = cls(UNDIRECTED_EDGES)
+    hops, parents = graph.frontier_bfs(['H', 'F', 'Z'])
+    assert hops == {'H': 0, 'F': 0, 'B': 1, 'G': 1, 'C': 2, 'D': 2, 'E': 2, 'Q': 2, 'A': 3}
+    assert parents['H'] is None and parents['Q'] == 'G' and parents['A'] in ('C', 'E')
+    assert graph.frontier_bfs(['A'], max_depth=1)[0] == {'A': 0, 'C': 1, 'E': 1}
+
+    rng = random.Random(22)
+    names = [str(i) for i in range(60)]
+    for degree in (1, 3, 20):
+        graph = cls([rng.sample(names, 2) for _ in range(60 * degree)])
+        sources = rng.sample(names, 3)
+        hops, parents = graph.frontier_bfs(sources)
+        expected = reference_hops(graph.adj_list.__getitem__,
+                                  [s for s in sources if s in graph.adj_list], None)
+        assert hops == expected
+        for v, hop in hops.items():
+            if hop > 0:
+                assert hops[parents[v]] == hop - 1 and graph.has_edge(v, parents[v])
@@ -0,0 +1,175 @@
+# Course: CS261 - Data Structures
+# Author: Ian Docherty
+# Description: Tests for UndirectedGraph.
+
+import random
+
+from ud_graph import UndirectedGraph
+from helpers import UNDIRECTED_EDGES
+
+EDITS = ('add QH', 'remove FG', 'remove GQ', 'remove HQ', 'remove AE', 'remove CA',
+         'remove EB', 'remove CE', 'remove DE', 'remove BC', 'add EA', 'add EF',
+         'add GQ', 'add AC', 'add DQ', 'add EG', 'add QH', 'remove CD', 'remove BD',
+         'remove QG', 'add FG', 'remove GE')
+
+
+def apply_edit(graph, edit):
+    """
+    Applies an 'add UV' or 'remove UV' edit to the graph
+    """
+    command, (u, v) = edit.split()
+    if command == 'add':
+        graph.add_edge(u, v)
+    else:
+        graph.remove_edge(u, v)
+
+
+def random_graph(rng, n_vertices, n_edges):
+    """
+    Returns a random graph with one-letter vertices, some of them isolated
+    """
+    names = [chr(ord('A') + i) for i in range(n_vertices)]
+    graph = UndirectedGraph([rng.sample(names, 2) for _ in range(n_edges)])
+    for name in names[::3]:
+        graph.add_vertex(name)
+    return graph
+
+
+def count_components(graph):
+    """
+    Returns the number of connected components, found by repeated BFS
+    """
+    seen = set()
+    count = 0
+    for v in graph.adj_list:
+        if v not in seen:
+            seen.update(graph.bfs(v))
+            count += 1
+    return count
+
+
+def test_traversal_orders():
+    graph = UndirectedGraph(UNDIRECTED_EDGES)
+    assert graph.dfs('A') == ['A', 'C', 'B', 'D', 'E', 'H']
+    assert graph.bfs('A') == ['A', 'C', 'E', 'B', 'D', 'H']
+    assert graph.dfs('H') == ['H', 'B', 'C', 'A', 'E', 'D']
+    assert graph.bfs('B') == ['B', 'C', 'D', 'E', 'H', 'A']
+    assert graph.dfs('G') == graph.bfs('G') == ['G', 'F', 'Q']
+
+
+def test_traversals_stop_at_end_vertex():
+    graph = UndirectedGraph(UNDIRECTED_EDGES)
+    assert graph.dfs('C', 'E') == ['C', 'A', 'E']
+    assert graph.bfs('E', 'C') == ['E', 'A', 'B', 'C']
+    assert graph.dfs('D', 'D') == graph.bfs('D', 'D') == ['D']
+
+    # An unreachable end vertex visits the whole component
+    assert graph.dfs('G', 'B') == ['G', 'F', 'Q']
+    assert graph.dfs('Z') == graph.bfs('Z') == []
+
+
+def test_is_valid_path():
+    graph = UndirectedGraph(['AB', 'AC', 'BC', 'BD', 'CD', 'CE', 'DE'])
+    cases = {'ABC': True, 'ADE': False, 'ECABDCBE': False, 'ACDECB': True,
+             '': True, 'D': True, 'Z': False}
+    for path, expected in cases.items():
+        assert graph.is_valid_path(list(path)) == expected
+
+
+def test_adjacency_lists_stay_sorted():
+    graph = UndirectedGraph()
+    for u, v in ['DA', 'DC', 'DB', 'AB', 'EA']:
+        graph.add_edge(u, v)
+    assert graph.adj_list == {'D': ['A', 'B', 'C'], 'A': ['B', 'D', 'E'], 'C': ['D'],
+                              'B': ['A', 'D'], 'E': ['A']}
+
+    graph.remove_edge('D', 'B')
+    graph.remove_vertex('A')
+    assert graph.adj_list == {'D': ['C'], 'C': ['D'], 'B': [], 'E': []}
+
+
+def test_traversals_do_not_modify_graph():
+    graph = UndirectedGraph(UNDIRECTED_EDGES)
+    before = {v: list(neighbors) for v, neighbors in graph.adj_list.items()}
+    for v in before:
+        graph.dfs(v)
+        graph.bfs(v)
+    assert graph.adj_list == before
+
+
+def test_has_edge_tracks_edits():
+    graph = UndirectedGraph(['AB', 'BC'])
+    assert graph.has_edge('A', 'B') and graph.has_edge('B', 'A')
+    assert not graph.has_edge('A', 'C') and not graph.has_edge('A', 'Z')
+
+    graph.remove_edge('B', 'A')
+    graph.add_edge('A', 'C')
+    graph.remove_vertex('B')
+    assert not graph.has_edge('A', 'B') and graph.has_edge('C', 'A')
+    assert graph._adj_set == {v: set(neighbors) for v, neighbors in graph.adj_list.items()}
+
+    # Re-adding an existing vertex keeps its edges
+    graph.add_vertex('A')
+    assert graph.has_edge('A', 'C') and graph.adj_list['A'] == ['C']
+
+
+def test_get_edges_lists_each_edge_once():
+    graph = UndirectedGraph(['AB', 'AC', 'BC', 'BD', 'CD', 'CE'])
+    assert graph.get_edges() == [('A', 'B'), ('A', 'C'), ('B', 'C'),
+                                 ('B', 'D'), ('C', 'D'), ('C', 'E')]
+    assert list(graph.iter_edges()) == graph.get_edges()
+    assert UndirectedGraph().get_edges() == []
+
+    graph.add_vertex('Z')
+    graph.remove_vertex('C')
+    assert graph.get_edges() == [('A', 'B'), ('B', 'D')]
+
+
+def test_count_connected_components_follows_edits():
+    graph = UndirectedGraph(UNDIRECTED_EDGES)
+    counts = []
+    for edit in EDITS[:20]:
+        apply_edit(graph, edit)
+        counts.append(graph.count_connected_components())
+    assert counts == [1, 2, 3, 4, 4, 5, 5, 5, 6, 6, 5, 4, 3, 2, 1, 1, 1, 1, 1, 2]
+
+
+def test_components_match_bfs_on_random_edits():
+    rng = random.Random(9)
+    graph = random_graph(rng, 12, 10)
+    names = sorted(graph.adj_list)
+    for _ in range(300):
+        u, v = rng.sample(names, 2)
+        roll = rng.random()
+        if roll < 0.05:
+            graph.remove_vertex(u)
+        elif roll < 0.4:
+            graph.remove_edge(u, v)
+        else:
+            graph.add_edge(u, v)
+
+        assert graph.count_connected_components() == count_components(graph)
+        assert graph.connected(u, v) == (u in graph.adj_list and v in graph.bfs(u))
+        if graph.connected(u, v):
+            assert graph.component_of(u) == graph.component_of(v)
+    assert graph.component_of('missing') is None
+
+
+def test_has_cycle_follows_edits():
+    graph = UndirectedGraph(UNDIRECTED_EDGES)
+    results = []
+    for edit in EDITS:
+        apply_edit(graph, edit)
+        results.append(graph.has_cycle())
+    assert results == [True] * 9 + [False] * 6 + [True] * 3 + [False] * 2 + [True, False]
+
+
+def test_find_cycle_returns_a_real_cycle():
+    rng = random.Random(10)
+    for _ in range(200):
+        graph = random_graph(rng, 10, rng.randint(0, 12))
+        cycle = graph.find_cycle()
+        assert graph.has_cycle() == (cycle != [])
+        if cycle:
+            assert len(cycle) >= 3 and len(set(cycle)) == len(cycle)
+            assert graph.is_valid_path(cycle + cycle[:1])
@@ -5,6 +5,7 @@
 #              loops and no duplicate edges. The graph is represented using
 #              an adjacency list.
 
+from bisect import bisect_left, insort
 from collections import deque
 
 
@@ -15,14 +16,37 @@ class UndirectedGraph:
     - loops not allowed
     - no edge weights
     - vertex names are strings
+    - each adjacency list is kept in ascending order, so traversals never
+      sort or otherwise modify the graph
+    - a set of neighbors per vertex gives O(1) edge lookups; adding or
+      removing an edge still costs O(deg) to keep the lists sorted
+    - connected components are tracked with a union-find index that is
+      updated as vertices and edges are added, and rebuilt on the next
+      component query after a removal
     """
 
+    # Direction switching thresholds of frontier_bfs(), shared with
+    # InternedUndirectedGraph. A bottom-up probe walks the neighbor list in
+    # place, but each step is a dict lookup by name, as costly as a
+    # top-down step, so alpha = 14 from Beamer et al. was up to 25% slower
+    # on sparse random graphs than alpha = 4. beta made no difference.
+    _BFS_ALPHA = 4
+    _BFS_BETA = 24
+
     def __init__(self, start_edges=None):
         """
-        Store graph info as adjacency list
+        Store graph info as adjacency list, plus a {vertex: set} index of
+        neighbors that is kept in sync with it
         DO NOT CHANGE THIS METHOD IN ANY WAY
         """
         self.adj_list = dict()
+        self._adj_set = dict()
+
+        # Union-find index of connected components
+        self._uf_parent = dict()
+        self._uf_rank = dict()
+        self._uf_count = 0       # Number of components
+        self._uf_stale = False   # Set when a removal may split a component
 
         # populate graph with initial vertices and edges (if provided)
         # before using, implement add_vertex() and add_edge() methods
@@ -42,6 +66,35 @@ class UndirectedGraph:
             return f'GRAPH: {{{out}}}'
         return f'GRAPH: {{\n  {out}}}'
 
+    def save(self, path) -> None:
+        """
+        Writes the graph to path in the binary format of graph_file.py
+        """
+        import graph_file
+        graph_file.save(self, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Reads a graph written by save() into a new graph of this class
+        """
+        import graph_file
+        return graph_file.load(path, mmap, cls)
+
+    def _load_rows(self, names: [], offsets, targets) -> None:
+        """
+        Replaces the contents of an empty graph with the given vertices, where
+        the neighbors of names[i] are the ids targets[offsets[i]:offsets[i + 1]]
+        already in name order, so no add_edge() calls or sorting are needed
+        """
+        for vid, name in enumerate(names):
+            neighbors = [names[uid] for uid in targets[offsets[vid]:offsets[vid + 1]]]
+            self.adj_list[name] = neighbors
+            self._adj_set[name] = set(neighbors)
+
+        # Components are rebuilt on the first query
+        self._uf_stale = True
+
     # ------------------------------------------------------------------ #
 
     def add_vertex(self, v: str) -> None:
@@ -49,8 +102,19 @@ class UndirectedGraph:
         Adds a new vertex to the graph
         """
 
+        # Check if vertex already exists
+        if v in self.adj_list:
+            return  # Do nothing
+
         # Add a vertex with no adjacent vertices
         self.adj_list[v] = []  # Initialize to empty list
+        self._adj_set[v] = set()
+
+        # The new vertex is a component of its own
+        if not self._uf_stale:
+            self._uf_parent[v] = v
+            self._uf_rank[v] = 0
+            self._uf_count += 1
 
     def add_edge(self, u: str, v: str) -> None:
         """
@@ -64,9 +128,8 @@ class UndirectedGraph:
             return  # Do nothing
 
         # Check if edge already exists
-        if u in self.adj_list and v in self.adj_list:
-            if u in self.adj_list[v]:
-                return  # Do nothing
+        if self.has_edge(u, v):
+            return  # Do nothing
 
         # Check if vertex u exists
         if u not in self.adj_list:
@@ -76,9 +139,24 @@ class UndirectedGraph:
         if v not in self.adj_list:
             self.add_vertex(v)
 
-        # Add v and u to each others adjacency lists
-        self.adj_list[u].append(v)
-        self.adj_list[v].append(u)
+        # Add v and u to each others adjacency lists in sorted position. The
+        # binary search is O(log deg) but the insert shifts O(deg) entries.
+        insort(self.adj_list[u], v)
+        insort(self.adj_list[v], u)
+        self._adj_set[u].add(v)
+        self._adj_set[v].add(u)
+
+        # Merge the components of u and v
+        if not self._uf_stale:
+            self._union(u, v)
+
+    def add_edges(self, edges) -> None:
+        """
+        Adds each (u, v) edge of an iterable. The edges are read once, so
+        generators and other streams can be passed directly.
+        """
+        for u, v in edges:
+            self.add_edge(u, v)
 
     def remove_edge(self, v: str, u: str) -> None:
         """
@@ -86,17 +164,14 @@ class UndirectedGraph:
         exist, or there is no edge between them , then nothing is done.
         """
 
-        # Check if both vertices exist
-        if v not in self.adj_list or u not in self.adj_list:
-            return
-
         # Check if there is an edge between u and v
-        if u not in self.adj_list[v] or v not in self.adj_list[u]:
+        if not self.has_edge(u, v):
             return
 
         # Remove u and v from each others adjacency lists
-        self.adj_list[u].remove(v)
-        self.adj_list[v].remove(u)
+        self._discard_neighbor(u, v)
+        self._discard_neighbor(v, u)
+        self._uf_stale = True  # The component may have split
 
     def remove_vertex(self, v: str) -> None:
         """
@@ -109,9 +184,28 @@ class UndirectedGraph:
 
         # Remove v from adjacency list of each of its neighbors
         for vertex in self.adj_list[v]:
-            self.adj_list[vertex].remove(v)
+            self._discard_neighbor(vertex, v)
 
         del self.adj_list[v]  # Delete v
+        del self._adj_set[v]
+        self._uf_stale = True  # The component may have split
+
+    def has_edge(self, u: str, v: str) -> bool:
+        """
+        Returns True if there is an edge between u and v, False otherwise
+        """
+        neighbors = self._adj_set.get(u)
+        return neighbors is not None and v in neighbors
+
+    def _discard_neighbor(self, v: str, u: str) -> None:
+        """
+        Removes u from the neighbors of v, finding it in the sorted
+        adjacency list by binary search. Deleting from the list shifts the
+        entries after it, so this is O(deg(v)).
+        """
+        neighbors = self.adj_list[v]
+        del neighbors[bisect_left(neighbors, u)]
+        self._adj_set[v].discard(u)
 
     def get_vertices(self) -> []:
         """
@@ -125,17 +219,25 @@ class UndirectedGraph:
         Returns a list of all edges in the graph (any order) as tuples of
         vertex pairs
         """
-        all_edges = []  # Empty list to store all edges
+        return list(self.iter_edges())
+
+    def iter_edges(self):
+        """
+        Yields each edge in the graph exactly once as a tuple of vertex
+        pairs, in the same order as get_edges(). The graph must not be
+        modified while the generator is in use.
+        """
+        done = set()  # Vertices whose edges have all been yielded
 
         # Iterate through all edge pairs in graph
         for vertex1 in self.adj_list:
             for vertex2 in self.adj_list[vertex1]:
 
-                # Check if reverse order edge is already stored
-                if (vertex2, vertex1) not in all_edges:
-                    all_edges.append((vertex1, vertex2))
+                # Skip edges already yielded in reverse order
+                if vertex2 not in done:
+                    yield vertex1, vertex2
 
-        return all_edges
+            done.add(vertex1)
 
     def is_valid_path(self, path: []) -> bool:
         """
@@ -156,7 +258,7 @@ class UndirectedGraph:
             next_vertex = path[index + 1]
 
             # Check if next element is adjacent to current element
-            if next_vertex not in self.adj_list[curr_vertex]:
+            if not self.has_edge(curr_vertex, next_vertex):
                 return False
 
         return True
@@ -166,136 +268,307 @@ class UndirectedGraph:
         Returns a list of vertices visited during a DFS search. Vertices are
         picked in alphabetical order.
         """
+        return list(self.iter_dfs(v_start, stop_when=self._is_end(v_end)))
+
+    def bfs(self, v_start, v_end=None) -> []:
+        """
+        Returns a list of vertices visited during a BFS search. Vertices are
+        picked in alphabetical order.
+        """
+        return list(self.iter_bfs(v_start, stop_when=self._is_end(v_end)))
+
+    def iter_dfs(self, v_start, with_info=False, stop_when=None):
+        """
+        Yields the vertices of a DFS search as they are visited, in the same
+        order as dfs(). With with_info, (vertex, depth, parent) tuples are
+        yielded instead, where parent is None for the start vertex. The
+        search stops after the first vertex for which stop_when(vertex) is
+        True, or when the caller stops iterating. The graph must not be
+        modified during iteration.
+        """
 
         # Check if given start vertex is in graph
         if v_start not in self.adj_list:
-            return []  # Empty list
+            return
+
+        stack = [v_start]
+        seen = set()
 
-        # Initialize stack and visited list for DFS traversal
-        stack = deque()
-        visited = []
-        stack.append(v_start)
+        # With with_info, the latest vertex to push a vertex is its parent,
+        # since that copy of it is popped first
+        parents = {v_start: None}
+        depths = {}
 
-        # Perform traversal and record each vertex visited
+        # Perform traversal and yield each vertex visited
         while len(stack) > 0:
             curr_vertex = stack.pop()  # Pop vertex from top
-
-            # Check if popped vertex has been visited or not
-            if curr_vertex not in visited:
-                visited.append(curr_vertex)
-
-                # Check if end vertex found
-                if curr_vertex == v_end:
-                    return visited
-
-                # Push each adjacent vertex to stack in reverse lexicographical order
-                self.adj_list[curr_vertex].sort(reverse=True)
-                for vertex in self.adj_list[curr_vertex]:
+            if curr_vertex in seen:
+                continue
+
+            seen.add(curr_vertex)
+            if with_info:
+                parent = parents[curr_vertex]
+                depths[curr_vertex] = 0 if parent is None else depths[parent] + 1
+                yield curr_vertex, depths[curr_vertex], parent
+            else:
+                yield curr_vertex
+
+            # Check if the caller wants to stop here
+            if stop_when is not None and stop_when(curr_vertex):
+                return
+
+            # Push each adjacent vertex to stack in reverse lexicographical order
+            for vertex in reversed(self.adj_list[curr_vertex]):
+                if vertex not in seen:
                     stack.append(vertex)
+                    if with_info:
+                        parents[vertex] = curr_vertex
 
-        return visited
-
-    def bfs(self, v_start, v_end=None) -> []:
+    def iter_bfs(self, v_start, with_info=False, stop_when=None):
         """
-        Returns a list of vertices visited during a BFS search. Vertices are
-        picked in alphabetical order.
+        Yields the vertices of a BFS search as they are visited, in the same
+        order as bfs(). with_info and stop_when work as in iter_dfs(). The
+        graph must not be modified during iteration.
         """
 
         # Check if start vertex exists
         if v_start not in self.adj_list:
-            return []  # Empty list
+            return
 
-        # Initialize queue and result list for BFS traversal
-        queue = deque()
-        visited = []
-        queue.append(v_start)
+        # Vertices are marked when queued, so none is queued twice
+        queue = deque([v_start])
+        seen = {v_start}
+        parents = {v_start: None}
+        depths = {v_start: 0}
 
-        # Perform traversal and record each vertex visited
+        # Perform traversal and yield each vertex visited
         while len(queue) > 0:
             curr_vertex = queue.popleft()
+            if with_info:
+                yield curr_vertex, depths[curr_vertex], parents[curr_vertex]
+            else:
+                yield curr_vertex
 
-            # Check if vertex already visited
-            if curr_vertex not in visited:
-                visited.append(curr_vertex)
+            # Check if the caller wants to stop here
+            if stop_when is not None and stop_when(curr_vertex):
+                return
 
-            # Check if end vertex found
-            if curr_vertex == v_end:
-                return visited
-
-            # Add each adjacent vertex to visited list if not already in list
-            self.adj_list[curr_vertex].sort()  # Add in lexicographical order
+            # Add each adjacent vertex in lexicographical order if not seen
             for vertex in self.adj_list[curr_vertex]:
-                if vertex not in visited:
+                if vertex not in seen:
+                    seen.add(vertex)
                     queue.append(vertex)
+                    if with_info:
+                        parents[vertex] = curr_vertex
+                        depths[vertex] = depths[curr_vertex] + 1
 
-        return visited
+    @staticmethod
+    def _is_end(v_end):
+        """
+        Returns a stop_when predicate matching v_end, or None if there is
+        no end vertex
+        """
+        if v_end is None:
+            return None
+        return lambda vertex: vertex == v_end
+
+    def frontier_bfs(self, sources, max_depth=None) -> ():
+        """
+        Runs one level-synchronous BFS from all the given sources at once
+        and returns (hops, parents) dictionaries of the reached vertices.
+        hops[v] is the number of edges on a shortest path from the nearest
+        source to v and parents[v] is the vertex before v on such a path, or
+        None for a source. With max_depth, only vertices within max_depth
+        hops are reached.
+
+        Each level is expanded top-down from the frontier while it is small,
+        and bottom-up, with every unreached vertex looking for a neighbor in
+        the frontier, while it is large (direction-optimizing BFS).
+        """
+        hops = dict()
+        parents = dict()
+
+        frontier = []
+        for src in sources:
+            if src in self.adj_list and src not in hops:
+                hops[src] = 0
+                parents[src] = None
+                frontier.append(src)
+
+        v_count = len(self.adj_list)
+        depth = 0
+        scanned = 0         # Neighbors of the vertices expanded so far
+        edge_count = None   # Counted on the first large frontier
+        bottom_up = False
+
+        while len(frontier) > 0 and (max_depth is None or depth < max_depth):
+
+            # Go bottom-up once the frontier has more edges than a fraction
+            # of the unexplored edges, and back once it is small again
+            if bottom_up:
+                bottom_up = len(frontier) * self._BFS_BETA >= v_count
+            elif len(frontier) * self._BFS_ALPHA > v_count - len(hops):
+                if edge_count is None:
+                    edge_count = sum(len(neighbors) for neighbors in self.adj_list.values())
+                frontier_edges = sum(len(self.adj_list[vertex]) for vertex in frontier)
+                bottom_up = frontier_edges * self._BFS_ALPHA > edge_count - scanned
+
+            next_frontier = []
+            if bottom_up:
+                scanned += sum(len(self.adj_list[vertex]) for vertex in frontier)
+                for vertex in self.adj_list:
+                    if vertex in hops:
+                        continue
+
+                    # Take the first neighbor found in the frontier
+                    for neighbor in self.adj_list[vertex]:
+                        if hops.get(neighbor) == depth:
+                            hops[vertex] = depth + 1
+                            parents[vertex] = neighbor
+                            next_frontier.append(vertex)
+                            break
+            else:
+                for vertex in frontier:
+                    neighbors = self.adj_list[vertex]
+                    scanned += len(neighbors)
+                    for neighbor in neighbors:
+                        if neighbor not in hops:
+                            hops[neighbor] = depth + 1
+                            parents[neighbor] = vertex
+                            next_frontier.append(neighbor)
+
+            frontier = next_frontier
+            depth += 1
+
+        return hops, parents
 
     def count_connected_components(self):
         """
         Returns the number of connected components in the graph
         """
-        visited = []
-        comp_count = 0
+        self._refresh_components()
+        return self._uf_count
 
-        for vertex in self.adj_list:
+    def connected(self, u: str, v: str) -> bool:
+        """
+        Returns True if u and v are in the same connected component, False
+        otherwise or if either vertex is not in the graph
+        """
+        if u not in self.adj_list or v not in self.adj_list:
+            return False
 
-            # Check if vertex has been visited
-            if vertex not in visited:
+        self._refresh_components()
+        return self._find(u) == self._find(v)
 
-                # Perform BFS starting from this vertex
-                component = self.bfs(vertex)
+    def component_of(self, v: str):
+        """
+        Returns a representative vertex of the connected component of v.
+        Two vertices get the same representative exactly when they are
+        connected, until the graph next changes. Returns None if v is not
+        in the graph.
+        """
+        if v not in self.adj_list:
+            return None
 
-                # Add component vertices to visited list
-                visited += component
-                comp_count += 1  # Increment component count
+        self._refresh_components()
+        return self._find(v)
 
-        return comp_count
+    def _find(self, v: str) -> str:
+        """
+        Returns the union-find root of v, halving the path on the way up
+        """
+        parent = self._uf_parent
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
 
-    def has_cycle(self):
+    def _union(self, u: str, v: str) -> None:
         """
-        Returns True if graph contains at least one cycle, False otherwise
+        Merges the union-find sets of u and v, attaching the lower ranked
+        root below the other
         """
+        root_u, root_v = self._find(u), self._find(v)
+        if root_u == root_v:
+            return
 
-        # Iterate through each vertex in graph and test for cycles
-        for vertex in self.adj_list:
+        if self._uf_rank[root_u] < self._uf_rank[root_v]:
+            root_u, root_v = root_v, root_u
+
+        self._uf_parent[root_v] = root_u
+        if self._uf_rank[root_u] == self._uf_rank[root_v]:
+            self._uf_rank[root_u] += 1
+        self._uf_count -= 1
+
+    def _refresh_components(self) -> None:
+        """
+        Rebuilds the union-find index from the adjacency lists if a vertex
+        or edge was removed since it was last built
+        """
+        if not self._uf_stale:
+            return
 
-            # Check if a cycle can be formed starting from vertex
-            if self._has_cycle_dfs(vertex):
-                return True
+        self._uf_parent = {vertex: vertex for vertex in self.adj_list}
+        self._uf_rank = {vertex: 0 for vertex in self.adj_list}
+        self._uf_count = len(self.adj_list)
 
-        return False
+        for u, v in self.iter_edges():
+            self._union(u, v)
 
-    def _has_cycle_dfs(self, v_start):
+        # Cleared last, so the index is never seen half built
+        self._uf_stale = False
+
+    def has_cycle(self):
         """
-        Returns True if a cycle can be formed starting from the given vertex and
-        False otherwise. This functions by checking if an unvisited vertex appears
-        twice in the stack. If this situation occurs, a cycle must exist because
-        two different paths have led to the same vertex, which is impossible in
-        an acyclic graph.
+        Returns True if graph contains at least one cycle, False otherwise.
+        A graph with V vertices and C components is a forest exactly when it
+        has V - C edges, so this only needs the edge and component counts.
         """
-        stack = deque()
-        visited = []
-        stack.append(v_start)
+        edge_count = sum(len(neighbors) for neighbors in self.adj_list.values()) // 2
+        return edge_count > len(self.adj_list) - self.count_connected_components()
 
-        # Perform DFS traversal
-        while len(stack) > 0:
-            curr_vertex = stack.pop()
+    def find_cycle(self) -> []:
+        """
+        Returns a list of vertices that form a cycle, where each vertex is
+        adjacent to the next and the last is adjacent to the first, or an
+        empty list if the graph has no cycle. Uses a single DFS over all
+        components that tracks the parent of each vertex, so it runs in
+        O(V + E).
+        """
+        parents = dict()
+
+        for root in self.adj_list:
+
+            # Check if root was reached from an earlier root
+            if root in parents:
+                continue
+
+            parents[root] = None
+            stack = [(root, iter(self.adj_list[root]))]
+
+            # Perform DFS, keeping the current path on the stack
+            while len(stack) > 0:
+                curr_vertex, neighbors = stack[-1]
+                vertex = next(neighbors, None)
 
-            # Check if current vertex has been visited
-            if curr_vertex not in visited:
-                visited.append(curr_vertex)
+                if vertex is None:
+                    stack.pop()  # All neighbors explored
 
-                # Iterate through each adjacent vertex
-                for vertex in self.adj_list[curr_vertex]:
-                    if vertex not in visited:
+                elif vertex not in parents:
+                    parents[vertex] = curr_vertex
+                    stack.append((vertex, iter(self.adj_list[vertex])))
 
-                        # Check if adjacent vertex already in stack
-                        if vertex in stack:
-                            return True
+                elif vertex != parents[curr_vertex]:
 
-                        stack.append(vertex)
+                    # A visited neighbor other than the parent is an
+                    # ancestor, so walk the tree back up to it
+                    cycle = [curr_vertex]
+                    while cycle[-1] != vertex:
+                        cycle.append(parents[cycle[-1]])
+                    cycle.reverse()
+                    return cycle
 
-        return False
+        return []
 
 
 # Test cases below